@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Load generator and capacity benchmark for the IED HTTP status servers.
+
+Simulates N concurrent panel clients against the relay (:8082), breaker
+(:8081) and HMI (:8080) status servers with the request mix the GUI
+really sends. Each client polls a weighted-random request every --think
+seconds (0 = back-to-back, to find saturation) over one keep-alive
+connection per server, or a fresh connection per request with
+--no-keepalive (the accept path and listen backlog). All clients run on
+one asyncio loop.
+
+Reported per endpoint and in total: requests, throughput, latency
+p50/p95/p99/max and outcomes - ok, http (non-2xx), refused (connection
+refused), reset (closed or reset mid-exchange), timeout.
+
+POST /trip, /reset, /close change breaker state, so they are only mixed
+in with --writes; the servers are reset and the breaker closed afterwards.
+
+    python3 bench_http_load.py --clients 50 --duration 20
+    python3 bench_http_load.py --sweep 1,10,50,100,200 --think 0 --duration 10
+    python3 bench_http_load.py --target hmi --no-keepalive --clients 100 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import time
+
+from bench_stats import percentile
+from ied_poller import AsyncHTTPConnection, split_url
+
+TARGETS = {
+    'hmi': os.environ.get('HMI_URL', 'http://localhost:8080'),
+    'breaker': os.environ.get('BREAKER_URL', 'http://localhost:8081'),
+    'relay': os.environ.get('RELAY_URL', 'http://localhost:8082'),
+}
+
+# target -> [(method, path, weight)], read mix of the panels and dashboards
+READ_MIX = {
+    'hmi': [('GET', '/', 60), ('GET', '/status', 10), ('GET', '/diagnostics', 15), ('GET', '/soe', 15)],
+    'breaker': [('GET', '/', 80), ('GET', '/status', 10), ('GET', '/events?since=0', 10)],
+    'relay': [('GET', '/', 90), ('GET', '/status', 10)],
+}
+WRITE_MIX = {
+    'hmi': [('POST', '/trip', 2), ('POST', '/reset', 2)],
+    'breaker': [('POST', '/trip', 2), ('POST', '/close', 2)],
+    'relay': [('POST', '/trip', 2), ('POST', '/reset', 2)],
+}
+RESTORE = [('relay', '/reset'), ('hmi', '/reset'), ('breaker', '/close')]
+
+OUTCOMES = ('ok', 'http', 'refused', 'reset', 'timeout', 'other')
+
+
+def classify(exc):
+    if isinstance(exc, ConnectionRefusedError):
+        return 'refused'
+    if isinstance(exc, asyncio.TimeoutError):
+        return 'timeout'
+    if isinstance(exc, (ConnectionError, asyncio.IncompleteReadError, EOFError)):
+        return 'reset'
+    return 'other'
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+
+    def add(self, outcome, latency=None):
+        self.outcomes[outcome] += 1
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        for key, count in other.outcomes.items():
+            self.outcomes[key] += count
+
+    def report(self, elapsed):
+        total = sum(self.outcomes.values())
+        ms = lambda s: round(s * 1000, 2)
+        return {
+            'requests': total,
+            'rps': round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            'p50_ms': ms(percentile(self.latencies, 50)),
+            'p95_ms': ms(percentile(self.latencies, 95)),
+            'p99_ms': ms(percentile(self.latencies, 99)),
+            'max_ms': ms(max(self.latencies, default=0.0)),
+            **self.outcomes,
+            'refused_rate': round(self.outcomes['refused'] / total, 4) if total else 0.0,
+        }
+
+
+def build_mix(targets, writes):
+    mix = []
+    for name in targets:
+        for method, path, weight in READ_MIX[name] + (WRITE_MIX[name] if writes else []):
+            mix.append((name, method, path, weight))
+    return mix
+
+
+async def client(mix, args, stats, deadline):
+    """One simulated panel: its own connections, polling until the deadline."""
+    conns = {}
+    weights = [entry[3] for entry in mix]
+    # Spread the first requests over one think period like panels opening at different times
+    await asyncio.sleep(random.uniform(0, args.think))
+    try:
+        while time.perf_counter() < deadline:
+            name, method, path, _ = random.choices(mix, weights)[0]
+            conn = conns.get(name)
+            if conn is None or not args.keepalive:
+                host, port, _ = split_url(TARGETS[name])
+                conn = conns[name] = AsyncHTTPConnection(host, port)
+            key = f"{name} {method} {path}"
+            body = b'{}' if method == 'POST' else None
+            start = time.perf_counter()
+            try:
+                status, _ = await conn.request(method, path, args.timeout, body, retry=False)
+            except Exception as e:
+                stats.setdefault(key, Stats()).add(classify(e))
+            else:
+                latency = time.perf_counter() - start
+                stats.setdefault(key, Stats()).add('ok' if 200 <= status < 300 else 'http', latency)
+            finally:
+                if not args.keepalive:
+                    conn.close()
+            if args.think:
+                await asyncio.sleep(args.think * random.uniform(0.9, 1.1))
+            else:
+                await asyncio.sleep(0)
+    finally:
+        for conn in conns.values():
+            conn.close()
+
+
+async def run_level(clients, mix, args):
+    per_client = [{} for _ in range(clients)]
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(mix, args, stats, deadline) for stats in per_client))
+    elapsed = time.perf_counter() - start
+    endpoints = {}
+    total = Stats()
+    for stats in per_client:
+        for key, s in stats.items():
+            endpoints.setdefault(key, Stats()).merge(s)
+            total.merge(s)
+    return {
+        'clients': clients,
+        'elapsed_s': round(elapsed, 2),
+        'total': total.report(elapsed),
+        'endpoints': {key: s.report(elapsed) for key, s in sorted(endpoints.items())},
+    }
+
+
+async def restore(targets, timeout):
+    for name, path in RESTORE:
+        if name not in targets:
+            continue
+        host, port, _ = split_url(TARGETS[name])
+        conn = AsyncHTTPConnection(host, port)
+        try:
+            await conn.request('POST', path, timeout, b'{}')
+        except Exception as e:
+            print(f"restore {name} {path} failed: {e}")
+        finally:
+            conn.close()
+
+
+def raise_fd_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        if target < needed:
+            print(f"warning: fd limit {target} < {needed} connections; expect client-side errors")
+
+
+def format_level(level):
+    t = level['total']
+    lines = [f"{level['clients']} clients, {level['elapsed_s']} s: {t['requests']} requests, {t['rps']} req/s, "
+             f"p50 {t['p50_ms']} p95 {t['p95_ms']} p99 {t['p99_ms']} max {t['max_ms']} ms, "
+             f"refused {t['refused']} ({t['refused_rate'] * 100:.2f}%) reset {t['reset']} "
+             f"timeout {t['timeout']} http {t['http']}"]
+    for key, e in level['endpoints'].items():
+        lines.append(f"  {key:<30}{e['requests']:>8}{e['rps']:>9.1f}/s  p50 {e['p50_ms']:>7} p99 {e['p99_ms']:>8}"
+                     f"  err {e['http'] + e['refused'] + e['reset'] + e['timeout'] + e['other']}")
+    return '\n'.join(lines)
+
+
+async def main_async(args):
+    targets = args.target or list(TARGETS)
+    mix = build_mix(targets, args.writes)
+    levels = []
+    try:
+        for clients in args.sweep:
+            raise_fd_limit(clients * len(targets) + 64)
+            level = await run_level(clients, mix, args)
+            levels.append(level)
+            if not args.json:
+                print(format_level(level))
+    finally:
+        if args.writes:
+            await restore(targets, args.timeout)
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IED HTTP status server load generator")
+    parser.add_argument('--clients', type=int, default=10, help="concurrent simulated panels")
+    parser.add_argument('--sweep', help="comma separated client counts to run in turn, e.g. 1,10,50,100")
+    parser.add_argument('--duration', type=float, default=15.0, help="seconds per level")
+    parser.add_argument('--think', type=float, default=1.0, help="seconds between a client's requests, 0 = closed loop")
+    parser.add_argument('--timeout', type=float, default=2.0)
+    parser.add_argument('--target', action='append', help=f"restrict to {', '.join(TARGETS)} (repeatable)")
+    parser.add_argument('--no-keepalive', dest='keepalive', action='store_false',
+                        help="new connection per request")
+    parser.add_argument('--writes', action='store_true', help="also send POST /trip, /reset, /close")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    for name in args.target or []:
+        if name not in TARGETS:
+            parser.error(f"unknown target {name!r}")
+    args.sweep = [int(n) for n in args.sweep.split(',')] if args.sweep else [args.clients]
+
+    try:
+        levels = asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        return
+    if args.json:
+        print(json.dumps({'keepalive': args.keepalive, 'think_s': args.think, 'writes': args.writes,
+                          'levels': levels}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Scalar vs vectorized power_calc over a batch of samples.
+
+Usage: python3 bench_power_calc.py [--samples 1000000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import power_calc
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="power_calc micro-benchmark")
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(61850)
+    voltage = [rng.uniform(120.0, 140.0) for _ in range(args.samples)]
+    current = [rng.choice((0.0, rng.uniform(0.0, 3000.0))) for _ in range(args.samples)]
+
+    scalar_time, scalar = best_of(args.repeat, lambda: [
+        power_calc.power_values(v, i) for v, i in zip(voltage, current)])
+    print(f"{args.samples} samples, best of {args.repeat}")
+    print(f"scalar loop     {scalar_time * 1000:9.1f} ms  {scalar_time / args.samples * 1e9:7.1f} ns/sample")
+
+    np = power_calc.np
+    if np is None:
+        print("vectorized      skipped (NumPy not installed)")
+        return
+    v = np.array(voltage)
+    i = np.array(current)
+    vector_time, (pf, p, q) = best_of(args.repeat, lambda: power_calc.power_values(v, i))
+    print(f"vectorized      {vector_time * 1000:9.1f} ms  {vector_time / args.samples * 1e9:7.1f} ns/sample"
+          f"  ({scalar_time / vector_time:.0f}x)")
+
+    expected = np.array(scalar).T
+    error = max(float(np.max(np.abs(expected[0] - pf))),
+                float(np.max(np.abs(expected[1] - p))),
+                float(np.max(np.abs(expected[2] - q))))
+    print(f"max abs difference vs scalar: {error:.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Simulator -> protection relay feed rate and freshness benchmark.
+
+server.js pushes measurement frames to the relay over UDP (every
+SIM_FEED_MS and on every change); the relay reports what it received in
+the "simFeed" object of its status JSON (:8082):
+
+    mode        udp, or http while it falls back to polling /api/simulation-data
+    frames      frames received
+    seqGaps     frames lost or reordered in transit
+    latencyMs   sender stamp to receive, exponentially weighted
+    ageMs       ms since the newest frame
+
+This samples those counters over --duration and reports the achieved
+sample rate and loss. With --changes N it also sends N voltage changes
+through /api/command and times how long each takes to show in the
+relay's status; voltage has no protection function, so nothing trips.
+The original voltage is restored afterwards.
+
+    python3 bench_sim_feed.py --duration 10
+    python3 bench_sim_feed.py --changes 50 --json
+"""
+import argparse
+import json
+import os
+import time
+
+import ied_http
+from bench_stats import percentile
+
+WEB_UI_URL = os.environ.get('WEB_UI_URL', 'http://localhost:3000')
+RELAY_URL = os.environ.get('RELAY_URL', 'http://localhost:8082')
+
+
+def relay_status(timeout):
+    response = ied_http.get(RELAY_URL, timeout=timeout)
+    if response.status_code != 200:
+        raise RuntimeError(f"relay: HTTP {response.status_code}")
+    return response.json()
+
+
+def feed_stats(timeout):
+    feed = relay_status(timeout).get('simFeed')
+    if feed is None:
+        raise RuntimeError("relay status has no simFeed; rebuild the relay image")
+    return feed
+
+
+def set_voltage(voltage, timeout):
+    payload = {'type': 'command', 'command': 'updateVoltage', 'data': {'voltage': voltage}}
+    response = ied_http.post(WEB_UI_URL + '/api/command', json=payload, timeout=timeout)
+    if response.status_code != 200:
+        raise RuntimeError(f"/api/command: HTTP {response.status_code}")
+
+
+def measure_rate(duration, interval, timeout):
+    """Samples the relay's feed counters; returns the rate summary."""
+    first = feed_stats(timeout)
+    start = time.monotonic()
+    ages = []
+    latencies = []
+    modes = set()
+    last = first
+    while time.monotonic() - start < duration:
+        time.sleep(interval)
+        last = feed_stats(timeout)
+        modes.add(last['mode'])
+        if last['ageMs'] >= 0:
+            ages.append(last['ageMs'])
+        latencies.append(last['latencyMs'])
+    elapsed = time.monotonic() - start
+    frames = last['frames'] - first['frames']
+    gaps = last['seqGaps'] - first['seqGaps']
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'modes': sorted(modes),
+        'frames': frames,
+        'rate_hz': round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+        'seq_gaps': gaps,
+        'loss': round(gaps / (frames + gaps), 4) if frames + gaps else 0.0,
+        'bad_frames': last['badFrames'] - first['badFrames'],
+        'http_polls': last['httpPolls'] - first['httpPolls'],
+        'latency_ms': round(percentile(latencies, 50), 2),
+        'age_p50_ms': round(percentile(ages, 50), 1),
+        'age_max_ms': max(ages, default=0),
+    }
+
+
+def measure_changes(count, poll, timeout, deadline):
+    """Times voltage changes from /api/command to the relay's status."""
+    original = relay_status(timeout)['voltage']
+    delays = []
+    missed = 0
+    try:
+        for n in range(count):
+            # Distinct values at the status JSON's 0.1 kV resolution
+            target = round(original + 0.1 * (n % 50 + 1), 1)
+            t0 = time.perf_counter()
+            set_voltage(target, timeout)
+            while time.perf_counter() - t0 < deadline:
+                if abs(relay_status(timeout)['voltage'] - target) < 0.05:
+                    delays.append((time.perf_counter() - t0) * 1000.0)
+                    break
+                time.sleep(poll)
+            else:
+                missed += 1
+    finally:
+        set_voltage(original, timeout)
+    return {
+        'n': len(delays),
+        'missed': missed,
+        'p50_ms': round(percentile(delays, 50), 1),
+        'p95_ms': round(percentile(delays, 95), 1),
+        'p99_ms': round(percentile(delays, 99), 1),
+        'max_ms': round(max(delays, default=0.0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulator feed rate benchmark")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to sample the feed counters")
+    parser.add_argument('--interval', type=float, default=0.5, help="counter sampling interval, s")
+    parser.add_argument('--changes', type=int, default=0, help="also time N voltage changes end to end")
+    parser.add_argument('--poll', type=float, default=0.005, help="relay poll interval while timing a change, s")
+    parser.add_argument('--deadline', type=float, default=3.0, help="give up on a change after, s")
+    parser.add_argument('--timeout', type=float, default=1.0, help="per-request timeout, s")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    result = {}
+    try:
+        result['feed'] = measure_rate(args.duration, args.interval, args.timeout)
+        if args.changes:
+            result['changes'] = measure_changes(args.changes, args.poll, args.timeout, args.deadline)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"aborted: {e}")
+        return
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    feed = result.get('feed')
+    if feed:
+        print(f"feed ({'/'.join(feed['modes'])}), {feed['elapsed_s']} s: {feed['frames']} frames, "
+              f"{feed['rate_hz']} Hz, {feed['seq_gaps']} gaps ({feed['loss'] * 100:.2f}% loss), "
+              f"{feed['bad_frames']} bad, {feed['http_polls']} HTTP polls")
+        print(f"  latency {feed['latency_ms']} ms, age p50 {feed['age_p50_ms']} max {feed['age_max_ms']} ms")
+    changes = result.get('changes')
+    if changes:
+        print(f"changes: {changes['n']} timed ({changes['missed']} missed), ms to relay status "
+              f"p50 {changes['p50_ms']} p95 {changes['p95_ms']} p99 {changes['p99_ms']} max {changes['max_ms']}")
+
+
+if __name__ == "__main__":
+    main()
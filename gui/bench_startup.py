@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the GUI panels.
+
+Starts each panel in a fresh interpreter and reports, from process spawn:
+  first paint - the panel window is mapped and exposed
+  first data  - the first 'data' snapshot reaches the panel on the Tk thread
+plus the import time of the panel module. Needs a display; first data
+needs the containers (or the web interface) to be running.
+
+Usage: python3 bench_startup.py [--runs N] [--timeout S] [panel ...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PANELS = {
+    'simulation': ('simulation_control_panel', 'SimulationControlPanel'),
+    'relay': ('protection_relay_panel', 'ProtectionRelayPanel'),
+    'breaker': ('circuit_breaker_panel', 'CircuitBreakerPanel'),
+    'hmi': ('hmi_scada_panel', 'HMIScadaPanel'),
+}
+
+
+def child(module_name, class_name, spawned, timeout):
+    """Runs inside the spawned interpreter; prints one JSON result line."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    result = {'import': None, 'paint': None, 'data': None}
+    since = lambda: round((time.time() - spawned) * 1000, 1)
+
+    import ui_dispatcher
+    register = ui_dispatcher.UIDispatcher.register
+
+    def timed_register(self, key, handler):
+        def wrapped(*payload):
+            if result['data'] is None and payload and payload[0] == 'data':
+                result['data'] = since()
+            return handler(*payload)
+        register(self, key, wrapped)
+    ui_dispatcher.UIDispatcher.register = timed_register
+
+    module = __import__(module_name)
+    result['import'] = since()
+    panel = getattr(module, class_name)()
+
+    def on_expose(_event):
+        if result['paint'] is None:
+            result['paint'] = since()
+    panel.root.bind('<Expose>', on_expose, add='+')
+
+    def check():
+        if result['paint'] is not None and result['data'] is not None:
+            panel.root.destroy()
+        elif time.time() - spawned > timeout:
+            panel.root.destroy()
+        else:
+            panel.root.after(5, check)
+    panel.root.after(5, check)
+    panel.root.mainloop()
+    print(json.dumps(result))
+
+
+def run_once(name, timeout):
+    module_name, class_name = PANELS[name]
+    spawned = time.time()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', module_name, class_name,
+         repr(spawned), str(timeout)],
+        capture_output=True, text=True, timeout=timeout + 10)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f"{name}: no result (exit {proc.returncode}): {proc.stderr.strip()[-200:]}")
+
+
+def fmt(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return '      --'
+    values.sort()
+    return f"{values[len(values) // 2]:8.1f}"
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3], float(sys.argv[4]), float(sys.argv[5]))
+        return
+
+    parser = argparse.ArgumentParser(description="Panel cold-start benchmark")
+    parser.add_argument('panels', nargs='*', help=f"any of {', '.join(PANELS)} (default: all)")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args()
+    for name in args.panels:
+        if name not in PANELS:
+            parser.error(f"unknown panel: {name}")
+
+    print(f"median of {args.runs} runs, ms from process spawn")
+    print(f"{'panel':<12}{'import':>8}{'paint':>8}{'data':>8}")
+    for name in args.panels or list(PANELS):
+        runs = [run_once(name, args.timeout) for _ in range(args.runs)]
+        print(f"{name:<12}" + ''.join(fmt([r[k] for r in runs]) for k in ('import', 'paint', 'data')))
+
+
+if __name__ == "__main__":
+    main()
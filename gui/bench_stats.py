@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""Summary statistics shared by the bench_* scripts and scenario playback.
+
+Kept free of other GUI imports so a benchmark only loads what it measures.
+"""
+
+
+def percentile(values, q):
+    """Nearest-rank q-th percentile of values; 0.0 when there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
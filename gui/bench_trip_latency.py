@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""End-to-end trip latency: fault injection -> relay -> GOOSE -> breaker -> HMI.
+
+Each run injects a fault through the web interface's /api/command (the
+same batch SimulationControlPanel.inject_fault sends), then polls the
+relay (:8082), breaker (:8081) and HMI (:8080) endpoints concurrently
+and timestamps the first observation of every stage:
+
+    relay_trip    relay reports tripCommand (or breakerStatus, if the trip
+                  already auto-reset on breaker feedback)
+    goose_rx      breaker stNum changes; stamped with the breaker's own
+                  lastRxMs when it is set
+    breaker_open  breaker reports breakerOpen; stamped with its lastTxMs
+                  when that is set
+    hmi_display   HMI reports breakerStatus open
+
+Device stamps are the IEDs' Hal_getTimeInMs() wall clock; the containers
+share the host clock, so they are compared with time.time() directly.
+Observed times are bounded by --poll. Between runs the fault is cleared,
+the breaker closed and the relay reset, and the next run starts once all
+three endpoints are back to normal.
+
+    python3 bench_trip_latency.py --runs 20
+    python3 bench_trip_latency.py --runs 50 --fault-current 900 --json
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import ied_http
+from bench_stats import percentile
+
+WEB_UI_URL = os.environ.get('WEB_UI_URL', 'http://localhost:3000')
+HMI_URL = os.environ.get('HMI_URL', 'http://localhost:8080')
+BREAKER_URL = os.environ.get('BREAKER_URL', 'http://localhost:8081')
+RELAY_URL = os.environ.get('RELAY_URL', 'http://localhost:8082')
+
+STAGES = ('relay_trip', 'goose_rx', 'breaker_open', 'hmi_display')
+
+
+def now_ms():
+    return time.time() * 1000.0
+
+
+def get_json(url, timeout):
+    response = ied_http.get(url, timeout=timeout)
+    return response.json() if response.status_code == 200 else None
+
+
+def post_command(command, data, timeout):
+    payload = {'type': 'command', 'command': command, 'data': data}
+    response = ied_http.post(WEB_UI_URL + '/api/command', json=payload, timeout=timeout)
+    if response.status_code != 200:
+        raise RuntimeError(f"/api/command {command}: HTTP {response.status_code}")
+
+
+def inject(fault_current, timeout):
+    post_command('batch', {'commands': [
+        {'command': 'toggleFault', 'data': {'active': True}},
+        {'command': 'updateFaultCurrent', 'data': {'faultCurrent': fault_current}},
+    ]}, timeout)
+
+
+def restore(timeout):
+    post_command('batch', {'commands': [
+        {'command': 'toggleFault', 'data': {'active': False}},
+        {'command': 'updateFaultCurrent', 'data': {'faultCurrent': 0}},
+        {'command': 'updateCurrent', 'data': {'current': 450}},
+    ]}, timeout)
+    for url in (RELAY_URL + '/reset', BREAKER_URL + '/close'):
+        try:
+            ied_http.post(url, timeout=timeout)
+        except Exception:
+            pass
+
+
+def is_normal(relay, breaker, hmi):
+    return (relay is not None and not relay.get('tripCommand') and not relay.get('breakerStatus')
+            and breaker is not None and not breaker.get('breakerOpen')
+            and hmi is not None and not hmi.get('breakerStatus'))
+
+
+def wait_normal(poll, timeout, settle):
+    deadline = time.monotonic() + settle
+    while time.monotonic() < deadline:
+        try:
+            if is_normal(get_json(RELAY_URL, timeout), get_json(BREAKER_URL, timeout),
+                         get_json(HMI_URL, timeout)):
+                return True
+        except Exception:
+            pass
+        time.sleep(poll * 10)
+    return False
+
+
+class StageWatcher:
+    """Polls one endpoint until check(data) returns a stamp for each of its stages."""
+
+    def __init__(self, url, checks, results, poll, timeout):
+        self.url = url
+        self.checks = checks        # stage -> check(data, baseline) -> stamp ms or None
+        self.results = results
+        self.poll = poll
+        self.timeout = timeout
+        self.baseline = None
+        self.errors = 0
+
+    def run(self, stop):
+        remaining = dict(self.checks)
+        while remaining and not stop.is_set():
+            try:
+                data = get_json(self.url, self.timeout)
+            except Exception:
+                data = None
+                self.errors += 1
+            seen = now_ms()
+            if data is not None:
+                if self.baseline is None:
+                    self.baseline = data
+                for stage, check in list(remaining.items()):
+                    stamp = check(data, self.baseline, seen)
+                    if stamp is not None:
+                        self.results[stage] = stamp
+                        del remaining[stage]
+            time.sleep(self.poll)
+
+
+def device_stamp(value, seen):
+    # Use the IED's own stamp when it is set and not later than our observation
+    return value if value and value <= seen else seen
+
+
+def relay_trip(data, baseline, seen):
+    return seen if data.get('tripCommand') or data.get('breakerStatus') else None
+
+
+def goose_rx(data, baseline, seen):
+    if data.get('stNum') != baseline.get('stNum') or data.get('tripReceived'):
+        return device_stamp(data.get('lastRxMs'), seen)
+    return None
+
+
+def breaker_open(data, baseline, seen):
+    return device_stamp(data.get('lastTxMs'), seen) if data.get('breakerOpen') else None
+
+
+def hmi_display(data, baseline, seen):
+    return seen if data.get('breakerStatus') else None
+
+
+def run_once(args):
+    results = {}
+    stop = threading.Event()
+    watchers = [
+        StageWatcher(RELAY_URL, {'relay_trip': relay_trip}, results, args.poll, args.timeout),
+        StageWatcher(BREAKER_URL, {'goose_rx': goose_rx, 'breaker_open': breaker_open},
+                     results, args.poll, args.timeout),
+        StageWatcher(HMI_URL, {'hmi_display': hmi_display}, results, args.poll, args.timeout),
+    ]
+    # Take baselines before the fault goes in
+    for watcher in watchers:
+        watcher.baseline = get_json(watcher.url, args.timeout)
+    threads = [threading.Thread(target=w.run, args=(stop,), daemon=True) for w in watchers]
+    for thread in threads:
+        thread.start()
+    t0 = now_ms()
+    inject(args.fault_current, args.timeout)
+    deadline = time.monotonic() + args.deadline
+    while len(results) < len(STAGES) and time.monotonic() < deadline:
+        time.sleep(args.poll)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {stage: (results[stage] - t0 if stage in results else None) for stage in STAGES}
+
+
+def summarize(runs):
+    summary = {}
+    for stage in STAGES:
+        values = [run[stage] for run in runs if run[stage] is not None]
+        summary[stage] = {
+            'n': len(values),
+            'missed': len(runs) - len(values),
+            'p50': round(percentile(values, 50), 1),
+            'p95': round(percentile(values, 95), 1),
+            'p99': round(percentile(values, 99), 1),
+            'max': round(max(values, default=0.0), 1),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end trip latency benchmark")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--fault-current', type=float, default=2500.0,
+                        help="A; >= 800 trips 50G instantaneously, 300-800 via 51G (0.5 s)")
+    parser.add_argument('--poll', type=float, default=0.005, help="endpoint poll interval, s")
+    parser.add_argument('--timeout', type=float, default=1.0, help="per-request timeout, s")
+    parser.add_argument('--deadline', type=float, default=5.0, help="give up on a run after, s")
+    parser.add_argument('--settle', type=float, default=10.0, help="max wait for normal state, s")
+    parser.add_argument('--json', action='store_true', help="print per-run results and summary as JSON")
+    args = parser.parse_args()
+
+    runs = []
+    try:
+        for n in range(args.runs):
+            restore(args.timeout)
+            if not wait_normal(args.poll, args.timeout, args.settle):
+                print(f"run {n + 1}: system did not return to normal within {args.settle} s, skipping")
+                continue
+            run = run_once(args)
+            runs.append(run)
+            if not args.json:
+                print(f"run {n + 1:3d}: " + "  ".join(
+                    f"{stage}={'--' if run[stage] is None else f'{run[stage]:.1f}'}" for stage in STAGES))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"aborted: {e}")
+    finally:
+        try:
+            restore(args.timeout)
+        except Exception as e:
+            print(f"restore failed: {e}")
+
+    summary = summarize(runs)
+    if args.json:
+        print(json.dumps({'runs': runs, 'summary': summary}, indent=2))
+        return
+    print(f"\n{len(runs)} runs, ms after injection (p50 / p95 / p99 / max)")
+    for stage in STAGES:
+        s = summary[stage]
+        print(f"  {stage:<13}{s['p50']:>8.1f}{s['p95']:>8.1f}{s['p99']:>8.1f}{s['max']:>8.1f}"
+              f"  ({s['missed']} missed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Fixed-capacity event log behind a Tk Text or Listbox widget.
+
+Lines are kept in a ring (like the SOE buffer in hmi-scada.c) and written
+to the widget once per UI frame in a single insert; the widget is trimmed
+to the same capacity, so a GOOSE storm or days of uptime cost the same
+memory and insert time as the first minute.
+"""
+import threading
+import tkinter as tk
+from collections import deque
+
+LOG_MAX = 500
+SOE_MAX = 64    # same depth as the HMI's sequence-of-events ring
+
+
+class BoundedLog:
+    def __init__(self, widget, ui, capacity=LOG_MAX):
+        self.widget = widget
+        self.ui = ui
+        self.capacity = capacity
+        self.lines = deque(maxlen=capacity)
+        self._pending = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self.dropped = 0
+
+    def append(self, line):
+        """Queue a line from any thread; it is drawn at the next frame."""
+        with self._lock:
+            if len(self._pending) == self.capacity:
+                self.dropped += 1
+            self.lines.append(line)
+            self._pending.append(line)
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self.ui.call_soon(self.flush)
+
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self._pending.clear()
+        self.widget.delete(0 if isinstance(self.widget, tk.Listbox) else 1.0, tk.END)
+
+    def replace(self, text):
+        """Show a block of text (a test or diagnostics report) in place of the log."""
+        self.clear()
+        self.ui.forget_text(self.widget)
+        for line in text.rstrip('\n').split('\n'):
+            self.append(line)
+
+    def flush(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        if not batch:
+            return
+        if isinstance(self.widget, tk.Listbox):
+            self.widget.insert(tk.END, *batch)
+            excess = self.widget.size() - self.capacity
+            if excess > 0:
+                self.widget.delete(0, excess - 1)
+        else:
+            self.widget.insert(tk.END, ''.join(line + '\n' for line in batch))
+            # Text always ends with one empty line after the last newline
+            excess = int(self.widget.index('end-1c').split('.')[0]) - 1 - self.capacity
+            if excess > 0:
+                self.widget.delete(1.0, f'{excess + 1}.0')
+        self.widget.see(tk.END)
@@ -1,21 +1,32 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import ttk
-import requests
-import threading
+import ied_http
 import time
-import queue
+from ui_dispatcher import UIDispatcher
+from bounded_log import BoundedLog
+from command_executor import CommandExecutor
+from goose_analytics import GooseAnalytics
+from goose_events import BREAKER_URL, GooseEventFeed
 
 class CircuitBreakerPanel:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Circuit Breaker IED - CB_LINE_01_001")
-        self.root.geometry("350x500")
+        self.root.geometry("350x560")
         self.root.configure(bg='#2c2c2c')
-        self.data_queue = queue.Queue()
         
         self.setup_ui()
-        self.start_monitoring()
+        self.ui = UIDispatcher(self.root)
+        self.log = BoundedLog(self.log_text, self.ui)
+        # Sampled from status snapshots and exact from the event feed; never mixed
+        self.goose = GooseAnalytics()
+        self.goose_events = GooseAnalytics()
+        self.commands = CommandExecutor(self.ui, self.log_message)
+        self.subscriptions = []
+        self.goose_feed = None
+        self.root.bind('<Destroy>', self.on_destroy, add='+')
+        self.root.after_idle(self.start_monitoring)
         
     def setup_ui(self):
         # Header
@@ -59,6 +70,14 @@ class CircuitBreakerPanel:
                                   fg='#ccc', bg='#2c2c2c', font=('Courier', 9))
         self.sqnum_label.pack(pady=1)
         
+        self.goose_rate_label = tk.Label(goose_frame, text="Rate: -- msg/s  Jitter: -- ms", 
+                                       fg='#ccc', bg='#2c2c2c', font=('Courier', 9))
+        self.goose_rate_label.pack(pady=1)
+        
+        self.goose_gap_label = tk.Label(goose_frame, text="Gaps: 0  StNum chg: 0  TTL viol: 0", 
+                                      fg='#ccc', bg='#2c2c2c', font=('Courier', 9))
+        self.goose_gap_label.pack(pady=1)
+        
         # Control Frame
         control_frame = tk.LabelFrame(self.root, text="Manual Control", 
                                     fg='#00ff00', bg='#2c2c2c', font=('Courier', 10))
@@ -115,28 +134,27 @@ class CircuitBreakerPanel:
         # Supervision tracking
         self._last_counter = None
         self._last_change_ts = 0.0
+        self._goose_ok = False
         
     def manual_trip(self):
         # Send direct command to breaker container
-        try:
-            response = requests.post('http://localhost:8081/trip', timeout=1)
-            if response.status_code == 200:
-                self.log_message("MANUAL TRIP COMMAND ISSUED")
-            else:
-                self.log_message(f"TRIP FAILED: HTTP {response.status_code}")
-        except Exception as e:
-            self.log_message(f"TRIP FAILED: {str(e)[:30]}")
+        self.commands.run("TRIP", lambda: ied_http.post(BREAKER_URL + '/trip', timeout=1),
+                          self.trip_button, self.on_manual_result("TRIP", "MANUAL TRIP COMMAND ISSUED"))
         
     def manual_close(self):
         # Send direct command to breaker container  
-        try:
-            response = requests.post('http://localhost:8081/close', timeout=1)
-            if response.status_code == 200:
-                self.log_message("MANUAL CLOSE COMMAND ISSUED")
+        self.commands.run("CLOSE", lambda: ied_http.post(BREAKER_URL + '/close', timeout=1),
+                          self.close_button, self.on_manual_result("CLOSE", "MANUAL CLOSE COMMAND ISSUED"))
+        
+    def on_manual_result(self, name, success):
+        def done(response, error):
+            if error is not None:
+                self.log_message(f"{name} FAILED: {str(error)[:30]}")
+            elif response.status_code == 200:
+                self.log_message(success)
             else:
-                self.log_message(f"CLOSE FAILED: HTTP {response.status_code}")
-        except Exception as e:
-            self.log_message(f"CLOSE FAILED: {str(e)[:30]}")
+                self.log_message(f"{name} FAILED: HTTP {response.status_code}")
+        return done
         
     def send_command(self, command, data):
         # Remove simulator communication - breaker only responds to GOOSE
@@ -144,68 +162,74 @@ class CircuitBreakerPanel:
             
     def log_message(self, message):
         timestamp = time.strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
+        self.log.append(f"[{timestamp}] {message}")
     
     def debug_test(self):
-        try:
-            response = requests.get('http://localhost:8081', timeout=2)
-            if response.status_code == 200:
-                data = response.json()
-                self.log_text.delete(1.0, tk.END)
-                self.log_text.insert(tk.END, f"DEBUG: Circuit Breaker Communication Test\n\nHTTP Status: {response.status_code}\nResponse: {data}\n\nTest: SUCCESS\n")
+        self.commands.run("DEBUG", lambda: ied_http.get(BREAKER_URL, timeout=2),
+                          self.debug_button, self.show_debug_result)
+        
+    def show_debug_result(self, response, error):
+        if error is not None:
+            self.log.replace(f"DEBUG: Communication Test\n\nError: {str(error)}\nTest: FAILED\n")
+        elif response.status_code == 200:
+            data = response.json()
+            self.log.replace(f"DEBUG: Circuit Breaker Communication Test\n\nHTTP Status: {response.status_code}\nResponse: {data}\n\nTest: SUCCESS\n")
+        else:
+            self.log.replace(f"DEBUG: Communication Test\n\nHTTP Status: {response.status_code}\nTest: FAILED\n")
+        
+    def process_message(self, msg_type, data):
+        if msg_type == 'data':
+            self.update_display_direct(data)
+            self.ui.configure(self.status_label, text="STATUS: NORMAL", fg='#00ff00')
+        elif msg_type == 'error':
+            if data == 'NO CONNECTION':
+                self.ui.configure(self.status_label, text="STATUS: NO CONNECTION", fg='#ff0000')
+            elif data == 'TIMEOUT':
+                self.ui.configure(self.status_label, text="STATUS: TIMEOUT", fg='#ff0000')
+            elif data == 'PARSING ERROR':
+                self.ui.configure(self.status_label, text="STATUS: PARSING ERROR", fg='#ffff00')
             else:
-                self.log_text.delete(1.0, tk.END)
-                self.log_text.insert(tk.END, f"DEBUG: Communication Test\n\nHTTP Status: {response.status_code}\nTest: FAILED\n")
-        except Exception as e:
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, f"DEBUG: Communication Test\n\nError: {str(e)}\nTest: FAILED\n")
-        
-    def process_queue(self):
-        try:
-            while True:
-                msg_type, data = self.data_queue.get_nowait()
-                if msg_type == 'data':
-                    self.update_display_direct(data)
-                    self.status_label.config(text="STATUS: NORMAL", fg='#00ff00')
-                elif msg_type == 'error':
-                    if data == 'NO CONNECTION':
-                        self.status_label.config(text="STATUS: NO CONNECTION", fg='#ff0000')
-                    elif data == 'TIMEOUT':
-                        self.status_label.config(text="STATUS: TIMEOUT", fg='#ff0000')
-                    elif data == 'PARSING ERROR':
-                        self.status_label.config(text="STATUS: PARSING ERROR", fg='#ffff00')
-                    else:
-                        self.status_label.config(text=f"STATUS: {data}", fg='#ff8800')
-        except queue.Empty:
-            pass
-        self.root.after(100, self.process_queue)
+                self.ui.configure(self.status_label, text=f"STATUS: {data}", fg='#ff8800')
         
     def start_monitoring(self):
-        def monitor():
-            while True:
-                try:
-                    # Get actual breaker container status
-                    response = requests.get('http://localhost:8081', timeout=2)
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            self.data_queue.put(('data', data))
-                        except ValueError:
-                            self.data_queue.put(('error', 'PARSING ERROR'))
-                    else:
-                        self.data_queue.put(('error', f'HTTP {response.status_code}'))
-                except requests.exceptions.ConnectionError:
-                    self.data_queue.put(('error', 'NO CONNECTION'))
-                except requests.exceptions.Timeout:
-                    self.data_queue.put(('error', 'TIMEOUT'))
-                except Exception as e:
-                    self.data_queue.put(('error', str(e)[:15]))
-                time.sleep(1)
-                
-        thread = threading.Thread(target=monitor, daemon=True)
-        thread.start()
-        self.root.after(100, self.process_queue)
+        from ied_poller import get_poller
+        if not self.root.winfo_exists():
+            return  # closed before it was idle
+        # Breaker status is fetched by the shared poller and applied on the Tk thread
+        self.ui.register('breaker', self.process_message)
+        self.subscriptions.append(get_poller().subscribe('breaker', lambda kind, payload: self.ui.submit('breaker', kind, payload)))
+        # Every GOOSE message from the breaker's event ring, in order (submit() would keep only the last batch)
+        self._last_event_st = None
+        self.goose_feed = GooseEventFeed(lambda events, dropped: self.ui.call_soon(self.on_goose_events, events, dropped))
+        self.goose_feed.start()
+
+    def close(self):
+        """Stop polling and the GOOSE event feed for this window."""
+        from ied_poller import get_poller
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for token in subscriptions:
+            get_poller().unsubscribe(token)
+        if self.goose_feed is not None:
+            self.goose_feed.stop()
+
+    def on_destroy(self, event):
+        # <Destroy> on a toplevel also fires for each child widget
+        if event.widget is self.root:
+            self.close()
+        
+    def on_goose_events(self, events, dropped):
+        if dropped:
+            self.log_message(f"GOOSE FEED: {dropped} events overwritten before read")
+        for event in events:
+            if event['dir'] == 'rx' and event['stNum'] != self._last_event_st:
+                if self._last_event_st is not None:
+                    stamp = time.strftime('%H:%M:%S', time.localtime(event['ms'] / 1000))
+                    self.log_message(f"GOOSE RX: StNum={event['stNum']} SqNum={event['sqNum']} "
+                                     f"Trip={'YES' if event['value'] else 'NO'} @ {stamp}.{event['ms'] % 1000:03d}")
+                self._last_event_st = event['stNum']
+            elif event['dir'] == 'tx' and event['sqNum'] == 0:
+                self.log_message(f"GOOSE TX: StNum={event['stNum']} {'OPEN' if event['value'] else 'CLOSED'} burst")
+        self.show_goose_stats(self.goose_events.ingest(events))
         
     def update_display(self, data):
         # This method kept for compatibility but not used
@@ -215,21 +239,21 @@ class CircuitBreakerPanel:
         # Update breaker position from direct container communication
         position = data.get('position', 'CLOSED')
         if position == 'OPEN':
-            self.position_label.config(text="POSITION: OPEN", fg='#ff0000')
-            self.status_label.config(text="STATUS: OPEN", fg='#ff8800')
+            self.ui.configure(self.position_label, text="POSITION: OPEN", fg='#ff0000')
+            self.ui.configure(self.status_label, text="STATUS: OPEN", fg='#ff8800')
         else:
-            self.position_label.config(text="POSITION: CLOSED", fg='#00ff00')
-            self.status_label.config(text="STATUS: NORMAL", fg='#00ff00')
+            self.ui.configure(self.position_label, text="POSITION: CLOSED", fg='#00ff00')
+            self.ui.configure(self.status_label, text="STATUS: NORMAL", fg='#00ff00')
             
         # Update trip received from direct container
         trip_received = data.get('tripReceived', False)
         if trip_received:
-            self.trip_received_label.config(text="TRIP RECEIVED: YES", fg='#ff0000')
+            self.ui.configure(self.trip_received_label, text="TRIP RECEIVED: YES", fg='#ff0000')
             if not hasattr(self, 'last_trip_state_direct') or not self.last_trip_state_direct:
                 self.log_message("⚡ GOOSE TRIP SIGNAL RECEIVED")
-                self.last_operation_label.config(text=f"Last Op: {time.strftime('%H:%M:%S')}")
+                self.ui.configure(self.last_operation_label, text=f"Last Op: {time.strftime('%H:%M:%S')}")
         else:
-            self.trip_received_label.config(text="TRIP RECEIVED: NO", fg='#ccc')
+            self.ui.configure(self.trip_received_label, text="TRIP RECEIVED: NO", fg='#ccc')
             
         # Update GOOSE message details
         stnum = data.get('gooseStNum', data.get('stNum', 0))
@@ -237,24 +261,43 @@ class CircuitBreakerPanel:
         msg_count = data.get('gooseMsgCount', data.get('messageCount', 0))
         last_time = data.get('lastGooseTime', data.get('lastTime', '--:--:--'))
 
-        self.stnum_label.config(text=f"State Number: {stnum}")
-        self.sqnum_label.config(text=f"Sequence Number: {sqnum}")
+        self.ui.configure(self.stnum_label, text=f"State Number: {stnum}")
+        self.ui.configure(self.sqnum_label, text=f"Sequence Number: {sqnum}")
         
-        # Log GOOSE message activity
-        if hasattr(self, 'last_msg_count') and msg_count > self.last_msg_count:
+        # With the event feed running, every message is logged and analysed from there;
+        # otherwise fall back to sampling the status snapshot
+        feed_active = self.goose_feed.active
+        if not feed_active and hasattr(self, 'last_msg_count') and msg_count > self.last_msg_count:
             self.log_message(f"GOOSE MSG: StNum={stnum} SqNum={sqnum} Time={last_time}")
         
         # Update RX supervision (3s window)
         if self._last_counter is None or msg_count != self._last_counter:
             self._last_counter = msg_count
             self._last_change_ts = time.time()
-        goose_ok = (time.time() - self._last_change_ts) < 3.0
-        self.goose_ok_label.config(text=("GOOSE RX: OK" if goose_ok else "GOOSE RX: TIMEOUT"),
-                                   fg=('#00ff00' if goose_ok else '#ff0000'))
+        self._goose_ok = (time.time() - self._last_change_ts) < 3.0
+        
+        # Streaming rate/jitter/gap analytics flag a degrading link early. The snapshot
+        # analytics see every snapshot so they are current whenever the feed drops
+        stats = self.goose.update(data)
+        self.show_goose_stats(self.goose_events.snapshot() if feed_active else stats)
 
         self.last_msg_count = msg_count
         self.last_trip_state_direct = trip_received
         
+    def show_goose_stats(self, stats):
+        self.ui.configure(self.goose_rate_label,
+                          text=f"Rate: {stats['rate']:.1f} msg/s  Jitter: {stats['jitter']:.0f} ms")
+        problems = stats['sq_gaps'] or stats['ttl_violations']
+        self.ui.configure(self.goose_gap_label,
+                          text=f"Gaps: {stats['sq_gaps']}  StNum chg: {stats['st_changes']}  TTL viol: {stats['ttl_violations']}",
+                          fg=('#ffff00' if problems else '#ccc'))
+        if not self._goose_ok:
+            self.ui.configure(self.goose_ok_label, text="GOOSE RX: TIMEOUT", fg='#ff0000')
+        elif stats['health'] == 'DEGRADED':
+            self.ui.configure(self.goose_ok_label, text="GOOSE RX: DEGRADED", fg='#ffff00')
+        else:
+            self.ui.configure(self.goose_ok_label, text="GOOSE RX: OK", fg='#00ff00')
+        
     def run(self):
         self.root.mainloop()
 
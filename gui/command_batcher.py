@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Asynchronous, coalescing sender for simulator commands.
+
+Commands are keyed by name: a newer value replaces a pending one (latest
+wins) and is counted as coalesced. A background thread sends each command
+at most once per MIN_INTERVAL, plus a trailing send DEBOUNCE after the
+last change, so dragging a slider streams a capped rate of updates and
+always ends on the final value without ever blocking the Tk thread.
+Commands that become due together go out as one
+{'command': 'batch', 'data': {'commands': [...]}} request, which
+server.js applies in one step.
+"""
+import threading
+import time
+
+MIN_INTERVAL = 0.1   # per command, i.e. at most 10 updates/s while dragging
+DEBOUNCE = 0.05
+
+
+def batch(commands):
+    """(command, data) for a list of (command, data) pairs."""
+    if len(commands) == 1:
+        return commands[0]
+    return 'batch', {'commands': [{'command': c, 'data': d} for c, d in commands]}
+
+
+class CommandSender:
+    def __init__(self, send, on_result=None, min_interval=MIN_INTERVAL, debounce=DEBOUNCE):
+        self.send = send            # send(command, data) -> bool, called off the Tk thread
+        self.on_result = on_result  # on_result(ok, stats), called off the Tk thread
+        self.min_interval = min_interval
+        self.debounce = debounce
+        self.stats = {'submitted': 0, 'requests': 0, 'coalesced': 0, 'dropped': 0}
+        self._pending = {}      # command -> [data, first pending time, last update time]
+        self._last_sent = {}
+        self._flush = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='command-sender', daemon=True)
+        self._thread.start()
+
+    def submit(self, command, data):
+        """Queue one command; returns immediately."""
+        now = time.monotonic()
+        with self._cond:
+            self.stats['submitted'] += 1
+            entry = self._pending.get(command)
+            if entry is None:
+                self._pending[command] = [data, now, now]
+            else:
+                self.stats['coalesced'] += 1
+                entry[0] = data
+                entry[2] = now
+            self._cond.notify()
+
+    def submit_many(self, commands):
+        """Queue several commands and send everything pending as one batch now."""
+        for command, data in commands:
+            self.submit(command, data)
+        with self._cond:
+            self._flush = True
+            self._cond.notify()
+
+    def _ready_at(self, command, entry):
+        data, first, last = entry
+        # Trailing send after the debounce, but no later than one interval into a drag
+        ready = min(last + self.debounce, first + self.min_interval)
+        return max(ready, self._last_sent.get(command, 0.0) + self.min_interval)
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._flush:
+                    due = list(self._pending)
+                    self._flush = False
+                else:
+                    times = {c: self._ready_at(c, e) for c, e in self._pending.items()}
+                    due = [c for c, t in times.items() if t <= now]
+                    if not due:
+                        self._cond.wait(min(times.values()) - now if times else None)
+                        continue
+                if due:
+                    for command in due:
+                        self._last_sent[command] = now
+                    return [(c, self._pending.pop(c)[0]) for c in due]
+
+    def _run(self):
+        while True:
+            commands = self._next_batch()
+            try:
+                ok = self.send(*batch(commands))
+            except Exception:
+                ok = False
+            with self._cond:
+                self.stats['requests'] += 1
+                if not ok:
+                    self.stats['dropped'] += len(commands)
+                stats = dict(self.stats)
+            if self.on_result:
+                self.on_result(ok, stats)
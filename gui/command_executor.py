@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Off-thread execution of panel button actions.
+
+Button handlers hand a blocking ied_http call to CommandExecutor.run()
+and return at once, so a slow or dead IED never freezes the window. While
+the call is in flight the button is disabled and labelled "… <TEXT>";
+repeat clicks are ignored until it completes. The round-trip time of
+every command is written to the panel log, and the result callback runs
+on the Tk thread.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+
+
+class CommandExecutor:
+    def __init__(self, ui, log=None, max_workers=MAX_WORKERS):
+        self.ui = ui
+        self.log = log          # log(message), called on the Tk thread
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix='ied-command')
+        self._in_flight = {}    # button -> original text
+        self._lock = threading.Lock()
+
+    def run(self, name, func, button=None, on_done=None):
+        """Run func() off the Tk thread; call from the Tk thread.
+
+        on_done(result, error) is called on the Tk thread afterwards, with
+        error set to the exception func raised (result is then None).
+        Returns False if the button's previous command is still running.
+        """
+        if button is not None:
+            with self._lock:
+                if button in self._in_flight:
+                    return False
+                self._in_flight[button] = button.cget('text')
+            self.ui.configure(button, state='disabled', text=f"… {self._in_flight[button]}")
+        self._pool.submit(self._call, name, func, button, on_done)
+        return True
+
+    def busy(self, button):
+        with self._lock:
+            return button in self._in_flight
+
+    def _call(self, name, func, button, on_done):
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.ui.call_soon(self._finish, name, button, on_done, result, error, elapsed_ms)
+
+    def _finish(self, name, button, on_done, result, error, elapsed_ms):
+        if button is not None:
+            with self._lock:
+                text = self._in_flight.pop(button, None)
+            if text is not None and button.winfo_exists():
+                self.ui.configure(button, state='normal', text=text)
+        if self.log:
+            if error is not None:
+                self.log(f"{name} ERROR after {elapsed_ms:.1f} ms: {str(error)[:40]}")
+            elif hasattr(result, 'status_code'):
+                self.log(f"{name} HTTP {result.status_code} in {elapsed_ms:.1f} ms")
+            else:
+                self.log(f"{name} done in {elapsed_ms:.1f} ms")
+        if on_done:
+            on_done(result, error)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Fleet overview: one operator screen for many relay/breaker bays.
+
+Bays come from a JSON file, either listed:
+    {"bays": [{"name": "BAY 01", "relay": "http://10.0.1.11:8082",
+               "breaker": "http://10.0.1.12:8081", "hmi": "http://10.0.1.10:8080"}]}
+or as a template expanded for n = 1..count:
+    {"count": 120, "template": {"name": "BAY {n:03d}",
+                                "relay": "http://bay{n:03d}-relay:8082",
+                                "breaker": "http://bay{n:03d}-breaker:8081"}}
+Without --config the local docker-compose bay is shown.
+
+Every relay and breaker endpoint is polled by one IEDPoller: one asyncio
+thread, a keep-alive connection per endpoint, adaptive intervals and at
+most --concurrency requests in flight. Snapshots reach Tk through the
+UIDispatcher, latest per endpoint per frame. The grid is a canvas with a
+pool of rows sized to the viewport; scrolling rebinds pooled rows to
+bays, and a snapshot only touches Tk when its bay is on screen and one
+of its cells changed. Double-click a bay with an "hmi" URL to open its
+HMI/SCADA panel.
+
+    python3 fleet_hmi_panel.py --config fleet_bays.example.json --concurrency 32
+"""
+import argparse
+import json
+import os
+import tkinter as tk
+
+from ui_dispatcher import UIDispatcher
+
+RELAY_URL = os.environ.get('RELAY_URL', 'http://localhost:8082')
+BREAKER_URL = os.environ.get('BREAKER_URL', 'http://localhost:8081')
+HMI_URL = os.environ.get('HMI_URL', 'http://localhost:8080')
+
+POLL_INTERVAL = 2.0
+POLL_TIMEOUT = 2.0
+CONCURRENCY = 32
+
+ROW_HEIGHT = 22
+BG = '#263238'
+ROW_BG = ('#1e272c', '#232e33')
+SEVERITY_BG = {1: '#3e3a1e', 2: '#4a1f1f'}
+GREEN, YELLOW, ORANGE, RED, GREY = '#4caf50', '#ffeb3b', '#ff9800', '#f44336', '#78909c'
+
+COLUMNS = (
+    ("BAY", 120),
+    ("VOLTAGE", 90),
+    ("CURRENT", 90),
+    ("FREQ", 90),
+    ("PROTECTION", 120),
+    ("BREAKER", 90),
+    ("GOOSE", 100),
+    ("COMMS", 130),
+)
+
+
+class Bay:
+    __slots__ = ('index', 'name', 'urls', 'relay', 'breaker', 'errors')
+
+    def __init__(self, index, name, urls):
+        self.index = index
+        self.name = name
+        self.urls = urls
+        self.relay = None
+        self.breaker = None
+        self.errors = {}
+
+
+def load_bays(path=None):
+    if path is None:
+        return [Bay(0, "BAY 01", {'relay': RELAY_URL, 'breaker': BREAKER_URL, 'hmi': HMI_URL})]
+    with open(path) as f:
+        config = json.load(f)
+    if 'template' in config:
+        entries = [{key: value.format(n=n) for key, value in config['template'].items()}
+                   for n in range(1, config['count'] + 1)]
+    else:
+        entries = config['bays']
+    bays = []
+    for i, entry in enumerate(entries):
+        urls = {kind: entry[kind].rstrip('/') for kind in ('relay', 'breaker', 'hmi') if entry.get(kind)}
+        if 'relay' not in urls and 'breaker' not in urls:
+            raise ValueError(f"bay {entry.get('name', i + 1)}: needs a relay or breaker URL")
+        bays.append(Bay(i, entry.get('name', f"BAY {i + 1:03d}"), urls))
+    return bays
+
+
+def severity(bay):
+    """2 = trip or offline, 1 = pickup, open breaker or GOOSE lost, 0 = normal."""
+    relay, breaker = bay.relay or {}, bay.breaker or {}
+    if bay.errors or relay.get('tripCommand'):
+        return 2
+    if (relay.get('faultDetected') or relay.get('overcurrentPickup') or breaker.get('breakerOpen')
+            or relay.get('breakerStatus') or (bay.relay and not relay.get('rxOk', True))):
+        return 1
+    return 0
+
+
+def bay_cells(bay):
+    """(row background, [(text, colour) per column]) for one bay."""
+    relay, breaker = bay.relay, bay.breaker
+    cells = [(bay.name, '#e1f5fe')]
+    if relay:
+        cells.append((f"{relay.get('voltage', 0):.1f} kV", '#ffeb3b'))
+        current = relay.get('current', 0)
+        cells.append((f"{current:.0f} A", RED if current >= 2500 else YELLOW if current >= 1000 else GREEN))
+        frequency = relay.get('frequency', 0)
+        cells.append((f"{frequency:.3f} Hz", RED if frequency < 48.5 else YELLOW if frequency < 49.0 else '#90caf9'))
+        if relay.get('tripCommand'):
+            cells.append(("TRIP", RED))
+        elif relay.get('faultDetected') or relay.get('overcurrentPickup'):
+            cells.append(("PICKUP", YELLOW))
+        else:
+            cells.append(("NORMAL", GREEN))
+    else:
+        cells.extend([("--", GREY)] * 4)
+
+    if breaker:
+        is_open = breaker.get('breakerOpen', breaker.get('position') == 'OPEN')
+    elif relay:
+        is_open = relay.get('breakerStatus', False)
+    else:
+        is_open = None
+    cells.append(("--", GREY) if is_open is None else ("OPEN", ORANGE) if is_open else ("CLOSED", GREEN))
+
+    links = [data for data in (relay, breaker) if data]
+    if not links:
+        cells.append(("--", GREY))
+    elif all(d.get('rxOk', True) and d.get('txOk', True) for d in links):
+        cells.append(("OK", GREEN))
+    else:
+        cells.append(("DEGRADED" if any(d.get('rxOk') for d in links) else "LOST", RED))
+
+    if bay.errors:
+        kind, error = next(iter(bay.errors.items()))
+        cells.append((f"{kind.upper()}: {error}", RED))
+    elif links:
+        cells.append(("ONLINE", GREEN))
+    else:
+        cells.append(("WAITING", GREY))
+
+    level = severity(bay) if links or bay.errors else 0
+    return SEVERITY_BG.get(level, ROW_BG[bay.index % 2]), cells
+
+
+class BayGrid(tk.Frame):
+    """Canvas table that only holds items for the rows on screen."""
+
+    def __init__(self, parent, cells, on_open=None):
+        super().__init__(parent, bg=BG)
+        self.cells = cells          # cells(index) -> (background, [(text, colour), ...])
+        self.on_open = on_open
+        self.order = []             # bay indices in display order
+        self.position = {}          # bay index -> position in order
+        self.top = 0
+        self.slots = []             # [rect, [text ids], bound bay index or None, painted content]
+
+        header = tk.Canvas(self, bg='#37474f', height=ROW_HEIGHT, highlightthickness=0)
+        header.pack(fill='x')
+        x = 0
+        for title, width in COLUMNS:
+            header.create_text(x + 6, ROW_HEIGHT // 2, text=title, anchor='w', fill='white',
+                               font=('Arial', 9, 'bold'))
+            x += width
+        body = tk.Frame(self, bg=BG)
+        body.pack(fill='both', expand=True)
+        self.canvas = tk.Canvas(body, bg=BG, highlightthickness=0, width=x)
+        self.scrollbar = tk.Scrollbar(body, command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        self.canvas.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda event: self.scroll(-1))
+        self.canvas.bind('<Button-5>', lambda event: self.scroll(1))
+        self.canvas.bind('<Double-Button-1>', self._on_double_click)
+
+    def set_order(self, order):
+        self.order = list(order)
+        self.position = {index: pos for pos, index in enumerate(self.order)}
+        self.top = max(0, min(self.top, len(self.order) - self.visible_rows() + 1))
+        self.redraw()
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // ROW_HEIGHT + 1)
+
+    def scroll(self, rows):
+        self._set_top(self.top + rows)
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self._set_top(int(float(args[1]) * len(self.order)))
+        elif args[0] == 'scroll':
+            step = self.visible_rows() - 1 if args[2] == 'pages' else 1
+            self._set_top(self.top + int(args[1]) * step)
+
+    def _set_top(self, top):
+        top = max(0, min(top, len(self.order) - self.visible_rows() + 1))
+        if top != self.top:
+            self.top = top
+            self.redraw()
+
+    def _ensure_slots(self, count):
+        while len(self.slots) < count:
+            y = len(self.slots) * ROW_HEIGHT
+            rect = self.canvas.create_rectangle(0, y, 2000, y + ROW_HEIGHT, width=0)
+            texts = []
+            x = 0
+            for _, width in COLUMNS:
+                texts.append(self.canvas.create_text(x + 6, y + ROW_HEIGHT // 2, anchor='w',
+                                                     font=('Consolas', 9)))
+                x += width
+            self.slots.append([rect, texts, None, None])
+
+    def redraw(self):
+        """Rebind every on-screen slot to the bay now at its position."""
+        count = self.visible_rows()
+        self._ensure_slots(count)
+        for n, slot in enumerate(self.slots):
+            pos = self.top + n
+            index = self.order[pos] if n < count and pos < len(self.order) else None
+            slot[2] = index
+            if index is None:
+                self._paint(slot, (None, []))
+            else:
+                self._paint(slot, self.cells(index))
+        total = max(1, len(self.order))
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + count) / total))
+
+    def refresh(self, index):
+        """Repaint one bay if it is on screen."""
+        pos = self.position.get(index)
+        if pos is None:
+            return
+        n = pos - self.top
+        if 0 <= n < len(self.slots) and self.slots[n][2] == index:
+            self._paint(self.slots[n], self.cells(index))
+
+    def _paint(self, slot, content):
+        if content == slot[3]:
+            return
+        rect, texts, _, last = slot
+        background, cells = content
+        last_background, last_cells = last if last is not None else (None, None)
+        if last_cells is None or bool(last_cells) != bool(cells):
+            # First paint, or the slot is being shown/hidden: every item changes
+            state = 'normal' if cells else 'hidden'
+            self.canvas.itemconfigure(rect, state=state)
+            for item in texts:
+                self.canvas.itemconfigure(item, state=state)
+            last_background, last_cells = None, []
+        if cells and background != last_background:
+            self.canvas.itemconfigure(rect, fill=background)
+        for n, cell in enumerate(cells):
+            if n >= len(last_cells) or last_cells[n] != cell:
+                self.canvas.itemconfigure(texts[n], text=cell[0], fill=cell[1])
+        slot[3] = content
+
+    def _on_double_click(self, event):
+        n = int(self.canvas.canvasy(event.y)) // ROW_HEIGHT
+        if 0 <= n < len(self.slots) and self.slots[n][2] is not None and self.on_open:
+            self.on_open(self.slots[n][2])
+
+
+class FleetHMIPanel:
+    def __init__(self, bays, master=None, concurrency=CONCURRENCY, interval=POLL_INTERVAL):
+        self.bays = bays
+        self.concurrency = concurrency
+        self.interval = interval
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
+        self.root.title(f"SUBSTATION SCADA - FLEET OVERVIEW ({len(bays)} BAYS)")
+        self.root.geometry("950x700")
+        self.root.configure(bg=BG)
+
+        self.alarms_only = tk.BooleanVar(master=self.root, value=False)
+        self.setup_ui()
+        self.ui = UIDispatcher(self.root)
+        self._summary_pending = False
+        self._order_key = None
+        self.bay_panels = {}        # bay index -> open HMIScadaPanel
+        self.update_summary()
+        self.root.after_idle(self.start_monitoring)
+
+    def setup_ui(self):
+        header = tk.Frame(self.root, bg='#0d47a1', relief='raised', bd=2)
+        header.pack(fill='x')
+        tk.Label(header, text="⚡ FLEET OVERVIEW", fg='white', bg='#0d47a1',
+                 font=('Arial', 14, 'bold')).pack(side='left', padx=15, pady=8)
+        tk.Checkbutton(header, text="Alarms only", variable=self.alarms_only, command=self.update_summary,
+                       fg='white', bg='#0d47a1', selectcolor='#1565c0',
+                       activebackground='#0d47a1').pack(side='right', padx=15)
+        self.summary_label = tk.Label(header, text="", fg='#e1f5fe', bg='#0d47a1', font=('Arial', 10, 'bold'))
+        self.summary_label.pack(side='right', padx=15)
+
+        self.grid = BayGrid(self.root, lambda index: bay_cells(self.bays[index]), self.open_bay)
+        self.grid.pack(fill='both', expand=True, padx=5, pady=5)
+
+        self.status_label = tk.Label(self.root, text="", fg='#b0bec5', bg=BG, font=('Arial', 9), anchor='w')
+        self.status_label.pack(fill='x', padx=10, pady=(0, 5))
+
+    def start_monitoring(self):
+        from ied_poller import IEDPoller
+        endpoints = {}
+        for bay in self.bays:
+            for kind in ('relay', 'breaker'):
+                if kind in bay.urls:
+                    endpoints[f'{bay.index}:{kind}'] = (bay.urls[kind], self.interval, POLL_TIMEOUT)
+        # One poller thread for the whole fleet, with bounded requests in flight
+        self.poller = IEDPoller(endpoints, max_concurrency=self.concurrency)
+        for name in endpoints:
+            index, kind = name.split(':')
+            bay = self.bays[int(index)]
+            self.ui.register(name, lambda k, payload, bay=bay, kind=kind: self.on_snapshot(bay, kind, k, payload))
+            self.poller.subscribe(name, lambda k, payload, name=name: self.ui.submit(name, k, payload))
+        self.ui.configure(self.status_label, text=f"Polling {len(endpoints)} endpoints, "
+                                                  f"{self.concurrency} in flight, every {self.interval:g} s")
+
+    def on_snapshot(self, bay, kind, msg_type, payload):
+        if msg_type == 'data':
+            setattr(bay, kind, payload)
+            bay.errors.pop(kind, None)
+        else:
+            bay.errors[kind] = payload
+        self.grid.refresh(bay.index)
+        if not self._summary_pending:
+            # Once per frame, after every snapshot of the frame is applied
+            self._summary_pending = True
+            self.ui.call_soon(self.update_summary)
+
+    def update_summary(self):
+        self._summary_pending = False
+        levels = [severity(bay) if (bay.relay or bay.breaker or bay.errors) else 0 for bay in self.bays]
+        offline = sum(1 for bay in self.bays if bay.errors)
+        tripped = sum(1 for bay in self.bays if bay.relay and bay.relay.get('tripCommand'))
+        alarms = sum(1 for level in levels if level)
+        self.ui.configure(self.summary_label, text=f"{len(self.bays)} bays | {tripped} tripped | "
+                                                   f"{alarms} in alarm | {offline} offline")
+        if self.alarms_only.get():
+            order = [bay.index for bay, level in zip(self.bays, levels) if level]
+        else:
+            order = [bay.index for bay in self.bays]
+        key = (self.alarms_only.get(), tuple(order) if self.alarms_only.get() else len(order))
+        if key != self._order_key:
+            self._order_key = key
+            self.grid.set_order(order)
+
+    def open_bay(self, index):
+        bay = self.bays[index]
+        if 'hmi' not in bay.urls:
+            return
+        panel = self.bay_panels.get(index)
+        if panel is not None and panel.root.winfo_exists():
+            panel.root.deiconify()
+            panel.root.lift()
+            return
+        from hmi_scada_panel import HMIScadaPanel
+        panel = HMIScadaPanel(master=self.root, base_url=bay.urls['hmi'])
+        panel.root.title(f"SUBSTATION SCADA - {bay.name}")
+        self.bay_panels[index] = panel
+
+    def run(self):
+        self.root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-bay HMI overview")
+    parser.add_argument('--config', help="bay configuration JSON (default: the local bay)")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help="max requests in flight")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="base poll interval, s")
+    args = parser.parse_args()
+    try:
+        bays = load_bays(args.config)
+    except (OSError, KeyError, ValueError) as e:
+        parser.error(f"bad bay configuration: {e}")
+    FleetHMIPanel(bays, concurrency=args.concurrency, interval=args.interval).run()
+
+
+if __name__ == "__main__":
+    main()
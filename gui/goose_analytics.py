@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Streaming GOOSE subscription analytics from breaker status snapshots.
+
+The breaker's status JSON carries the last received stNum/sqNum, the
+total messageCount and lastRxMs (receive time of the newest message,
+Hal_getTimeInMs). From consecutive snapshots GooseAnalytics derives, in
+O(1) time and memory per snapshot:
+
+    rate        messages/s, exponentially weighted
+    interval    mean inter-arrival time (ms), exponentially weighted
+    jitter      RFC 3550 style smoothed |interval deviation| (ms)
+    sq_gaps     messages implied by sqNum but never counted as received
+    st_changes  stNum transitions (state changes published by the relay)
+    ttl_violations
+                times the newest message got older than the TTL before
+                the next one arrived
+    age         ms since the newest message
+
+ingest() takes the exact per-message events from the breaker's
+/events?since=N feed instead (see goose_events.py) and computes the same
+statistics without sampling; feed one GooseAnalytics from either
+snapshots or events, not both.
+
+health() is 'OK', 'DEGRADED' (missed heartbeats, recent sqNum gaps or a
+TTL violation) or 'TIMEOUT' (nothing within TIMEOUT_MS, the panel's old
+3 s supervision window), so a degrading subscription shows before
+supervision flips.
+"""
+import time
+
+TTL_MS = 5000           # GoosePublisher_setTimeAllowedToLive in protection-relay.c
+HEARTBEAT_MS = 1000     # relay heartbeat period
+TIMEOUT_MS = 3000
+ALPHA = 0.2             # EWMA weight of the newest sample
+JITTER_GAIN = 1 / 16.0  # RFC 3550
+RECENT_S = 30.0         # gaps/violations this recent mark the link DEGRADED
+
+FIELDS = ('rate', 'interval', 'jitter', 'sq_gaps', 'st_changes', 'ttl_violations', 'age')
+
+
+class GooseAnalytics:
+    def __init__(self, ttl_ms=TTL_MS, heartbeat_ms=HEARTBEAT_MS, timeout_ms=TIMEOUT_MS):
+        self.ttl_ms = ttl_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.timeout_ms = timeout_ms
+        self.reset()
+
+    def reset(self):
+        self.rate = 0.0
+        self.interval = 0.0
+        self.jitter = 0.0
+        self.sq_gaps = 0
+        self.st_changes = 0
+        self.ttl_violations = 0
+        self.age = None
+        self.messages = 0
+        self._last = None           # (t, stNum, sqNum, messageCount, lastRxMs)
+        self._last_event = None     # (ms, stNum, sqNum, ttl) of the newest ingested rx event
+        self._last_ingest = None
+        self._in_violation = False
+        self._last_problem = None
+
+    def update(self, data, t=None):
+        """Feed one breaker status snapshot; returns snapshot()."""
+        t = time.time() if t is None else t
+        st = int(data.get('stNum', 0) or 0)
+        sq = int(data.get('sqNum', 0) or 0)
+        count = int(data.get('messageCount', 0) or 0)
+        rx_ms = int(data.get('lastRxMs', 0) or 0)
+        self.age = (t * 1000.0 - rx_ms) if rx_ms else None
+
+        if self._last is not None:
+            last_t, last_st, last_sq, last_count, last_rx = self._last
+            received = count - last_count
+            if received < 0:
+                # Breaker restarted: its counters start over
+                self.reset()
+            else:
+                dt = t - last_t
+                if dt > 0:
+                    self.rate += ALPHA * (received / dt - self.rate)
+                if received > 0:
+                    self.messages += received
+                    if last_rx and rx_ms > last_rx:
+                        self._sample_interval((rx_ms - last_rx) / received)
+                        if rx_ms - last_rx > self.ttl_ms and received == 1 and not self._in_violation:
+                            # The TTL ran out between two polls without us seeing the message age
+                            self._violation(t)
+                    if st != last_st:
+                        self.st_changes += st - last_st if st > last_st else 1
+                        # sqNum restarts at 0 on every state change
+                        expected = sq + 1
+                    else:
+                        expected = sq - last_sq
+                    missed = expected - received
+                    if missed > 0:
+                        self.sq_gaps += missed
+                        self._last_problem = t
+
+        self._check_age(t)
+        self._last = (t, st, sq, count, rx_ms)
+        return self.snapshot(t)
+
+    def ingest(self, events, t=None):
+        """Feed a batch of /events entries (oldest first); returns snapshot()."""
+        t = time.time() if t is None else t
+        received = 0
+        for event in events:
+            if event.get('dir') != 'rx':
+                continue
+            received += 1
+            ms, st, sq = event['ms'], event['stNum'], event['sqNum']
+            if self._last_event is not None:
+                last_ms, last_st, last_sq, last_ttl = self._last_event
+                if ms > last_ms:
+                    self._sample_interval(ms - last_ms)
+                if ms - last_ms > last_ttl and not self._in_violation:
+                    self._violation(t)
+                if st != last_st:
+                    self.st_changes += st - last_st if st > last_st else 1
+                    missed = sq     # sqNum restarts at 0 on every state change
+                else:
+                    missed = sq - last_sq - 1
+                if missed > 0:
+                    self.sq_gaps += missed
+                    self._last_problem = t
+            self._last_event = (ms, st, sq, event.get('ttl') or self.ttl_ms)
+        self.messages += received
+        if self._last_ingest is not None and t > self._last_ingest:
+            self.rate += ALPHA * (received / (t - self._last_ingest) - self.rate)
+        self._last_ingest = t
+        if self._last_event is not None:
+            self.age = t * 1000.0 - self._last_event[0]
+        self._check_age(t)
+        return self.snapshot(t)
+
+    def _sample_interval(self, sample):
+        deviation = abs(sample - self.interval) if self.interval else 0.0
+        self.interval = sample if not self.interval else self.interval + ALPHA * (sample - self.interval)
+        self.jitter += JITTER_GAIN * (deviation - self.jitter)
+
+    def _check_age(self, t):
+        # One violation per episode of the newest message outliving its TTL
+        if self.age is not None and self.age > self.ttl_ms:
+            if not self._in_violation:
+                self._violation(t)
+            self._in_violation = True
+        else:
+            self._in_violation = False
+
+    def _violation(self, t):
+        self.ttl_violations += 1
+        self._last_problem = t
+
+    def health(self, t=None):
+        t = time.time() if t is None else t
+        if self.age is None or self.age >= self.timeout_ms:
+            return 'TIMEOUT'
+        if self.age > 2 * self.heartbeat_ms:
+            return 'DEGRADED'
+        if self._last_problem is not None and t - self._last_problem < RECENT_S:
+            return 'DEGRADED'
+        return 'OK'
+
+    def snapshot(self, t=None):
+        return {
+            'rate': round(self.rate, 3),
+            'interval': round(self.interval, 1),
+            'jitter': round(self.jitter, 1),
+            'sq_gaps': self.sq_gaps,
+            'st_changes': self.st_changes,
+            'ttl_violations': self.ttl_violations,
+            'age': round(self.age, 1) if self.age is not None else None,
+            'health': self.health(t),
+        }
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Consumer for the breaker IED's GOOSE event feed (GET /events?since=N).
+
+The breaker keeps a ring of every GOOSE message it received from the
+relay ("rx") and published itself ("tx": 4-message bursts on a state
+change, heartbeats otherwise), each stamped with Hal_getTimeInMs(). A
+GooseEventFeed follows the ring's cursor from a background thread,
+pages through "more" responses, and hands each poll's events to
+on_events(events, dropped) in order - including bursts that a 1 Hz
+status poll never sees. dropped counts events the ring overwrote
+before they were fetched.
+
+    python3 goose_events.py            # print the live feed
+"""
+import os
+import threading
+import time
+
+import ied_http
+
+BREAKER_URL = os.environ.get('BREAKER_URL', 'http://localhost:8081')
+
+INTERVAL = 0.25         # the ring holds 1024 events, minutes at the normal rate
+UNSUPPORTED_RETRY = 30.0
+STALE_S = 3.0
+
+
+class GooseEventFeed:
+    def __init__(self, on_events, url=BREAKER_URL, interval=INTERVAL, timeout=1.0):
+        self.on_events = on_events      # on_events(events, dropped), called off the Tk thread
+        self.url = url + '/events'
+        self.interval = interval
+        self.timeout = timeout
+        self.cursor = 0
+        self.supported = None           # False when the breaker has no /events route
+        self.last_ok = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        return self.last_ok is not None and time.monotonic() - self.last_ok < STALE_S
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='goose-events', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def poll(self):
+        """Fetch everything after the cursor; returns (events, dropped)."""
+        events = []
+        dropped = 0
+        while True:
+            response = ied_http.get(f"{self.url}?since={self.cursor}", timeout=self.timeout)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            page = response.json()
+            if 'events' not in page:
+                # Older breaker images answer every GET with the status JSON
+                self.supported = False
+                return [], 0
+            self.supported = True
+            events.extend(page['events'])
+            dropped += page.get('dropped', 0)
+            self.cursor = page['next']
+            if not page.get('more'):
+                return events, dropped
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                events, dropped = self.poll()
+            except Exception:
+                self._stop.wait(self.interval * 4)
+                continue
+            if self.supported is False:
+                self._stop.wait(UNSUPPORTED_RETRY)
+                continue
+            self.last_ok = time.monotonic()
+            self.on_events(events, dropped)
+            self._stop.wait(self.interval)
+
+
+def main():
+    def show(events, dropped):
+        if dropped:
+            print(f"... {dropped} events dropped")
+        for e in events:
+            stamp = time.strftime('%H:%M:%S', time.localtime(e['ms'] / 1000)) + f".{e['ms'] % 1000:03d}"
+            print(f"{e['seq']:>8} {stamp} {e['dir']} stNum={e['stNum']} sqNum={e['sqNum']} "
+                  f"ttl={e['ttl']} value={e['value']}")
+
+    feed = GooseEventFeed(show).start()
+    try:
+        while True:
+            time.sleep(1)
+            if feed.supported is False:
+                print(f"{feed.url}: not supported by this breaker build")
+                return
+    except KeyboardInterrupt:
+        feed.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,38 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import ttk
-import requests
-import threading
+import ied_http
+import os
+import sys
 import time
+from ui_dispatcher import UIDispatcher
+from bounded_log import BoundedLog, SOE_MAX
+from view_model import ViewModel
+from trend_chart import TrendChart
+from power_calc import power_values
+from command_executor import CommandExecutor
+
+HMI_URL = os.environ.get('HMI_URL', 'http://localhost:8080')
 
 class HMIScadaPanel:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None, base_url=HMI_URL):
+        self.base_url = base_url.rstrip('/')
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("SUBSTATION SCADA - BAY 01 LINE PROTECTION")
-        self.root.geometry("800x900")
+        self.root.geometry("800x1050")
         self.root.configure(bg='#1e1e1e')  # Dark SCADA background
         self.root.resizable(True, True)
         
         self.setup_ui()
-        self.start_monitoring()
+        self.ui = UIDispatcher(self.root)
+        self.log = BoundedLog(self.log_text, self.ui)
+        self.alarms = BoundedLog(self.alarm_listbox, self.ui, SOE_MAX)
+        self.view = ViewModel()
+        self.commands = CommandExecutor(self.ui, self.log_message)
+        self.subscriptions = []
+        self.root.bind('<Destroy>', self.on_destroy, add='+')
+        # Draw the window first; the poller starts once Tk is idle
+        self.root.after_idle(self.start_monitoring)
         
     def setup_ui(self):
         # SCADA Header with Status Bar
@@ -89,49 +107,49 @@ class HMIScadaPanel:
         # Voltage with SCADA colors
         tk.Label(meas_grid, text="⚡ Voltage L1:", fg='#ffeb3b', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=0, column=0, sticky='w', padx=5, pady=3)
-        self.voltage_label = tk.Label(meas_grid, text="132.0 kV", fg='#4caf50', bg='#1a1a1a', 
+        self.voltage_label = tk.Label(meas_grid, text="-- kV", fg='#4caf50', bg='#1a1a1a', 
                                     font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.voltage_label.grid(row=0, column=1, sticky='w', padx=15, pady=3)
         
         # Current with SCADA colors
         tk.Label(meas_grid, text="🔌 Current L1:", fg='#ffeb3b', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=1, column=0, sticky='w', padx=5, pady=3)
-        self.current_label = tk.Label(meas_grid, text="450 A", fg='#4caf50', bg='#1a1a1a', 
+        self.current_label = tk.Label(meas_grid, text="-- A", fg='#4caf50', bg='#1a1a1a', 
                                     font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.current_label.grid(row=1, column=1, sticky='w', padx=15, pady=3)
         
         # Frequency with SCADA colors
         tk.Label(meas_grid, text="📡 Frequency:", fg='#ffeb3b', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=2, column=0, sticky='w', padx=5, pady=3)
-        self.frequency_label = tk.Label(meas_grid, text="50.00 Hz", fg='#4caf50', bg='#1a1a1a', 
+        self.frequency_label = tk.Label(meas_grid, text="-- Hz", fg='#4caf50', bg='#1a1a1a', 
                                       font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.frequency_label.grid(row=2, column=1, sticky='w', padx=15, pady=3)
         
         # Fault Current with SCADA colors
         tk.Label(meas_grid, text="⚠️ Fault Current:", fg='#ff5722', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=3, column=0, sticky='w', padx=5, pady=3)
-        self.fault_current_label = tk.Label(meas_grid, text="0 A", fg='#4caf50', bg='#1a1a1a', 
+        self.fault_current_label = tk.Label(meas_grid, text="-- A", fg='#4caf50', bg='#1a1a1a', 
                                           font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.fault_current_label.grid(row=3, column=1, sticky='w', padx=15, pady=3)
         
         # Active Power with SCADA colors
         tk.Label(meas_grid, text="⚡ Active Power:", fg='#2196f3', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=4, column=0, sticky='w', padx=5, pady=3)
-        self.power_label = tk.Label(meas_grid, text="59.4 MW", fg='#4caf50', bg='#1a1a1a', 
+        self.power_label = tk.Label(meas_grid, text="-- MW", fg='#4caf50', bg='#1a1a1a', 
                                   font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.power_label.grid(row=4, column=1, sticky='w', padx=15, pady=3)
         
         # Reactive Power with SCADA colors
         tk.Label(meas_grid, text="🔄 Reactive Power:", fg='#9c27b0', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=5, column=0, sticky='w', padx=5, pady=3)
-        self.reactive_power_label = tk.Label(meas_grid, text="18.5 MVAr", fg='#4caf50', bg='#1a1a1a', 
+        self.reactive_power_label = tk.Label(meas_grid, text="-- MVAr", fg='#4caf50', bg='#1a1a1a', 
                                            font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.reactive_power_label.grid(row=5, column=1, sticky='w', padx=15, pady=3)
         
         # Power Factor with SCADA colors
         tk.Label(meas_grid, text="📈 Power Factor:", fg='#ff9800', bg='#263238', 
                 font=('Arial', 11, 'bold')).grid(row=6, column=0, sticky='w', padx=5, pady=3)
-        self.power_factor_label = tk.Label(meas_grid, text="0.95", fg='#4caf50', bg='#1a1a1a', 
+        self.power_factor_label = tk.Label(meas_grid, text="--", fg='#4caf50', bg='#1a1a1a', 
                                          font=('Arial', 14, 'bold'), relief='sunken', bd=1, width=12)
         self.power_factor_label.grid(row=6, column=1, sticky='w', padx=15, pady=3)
         
@@ -159,33 +177,39 @@ class HMIScadaPanel:
                  font=('Arial', 10, 'bold'), command=self.read_values, 
                  relief='raised', bd=2, width=15).grid(row=0, column=0, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🚨 SEND TRIP", bg='#d32f2f', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.send_trip, 
-                 relief='raised', bd=2, width=15).grid(row=0, column=1, padx=3, pady=3)
+        self.trip_button = tk.Button(cmd_grid, text="🚨 SEND TRIP", bg='#d32f2f', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.send_trip, 
+                                    relief='raised', bd=2, width=15)
+        self.trip_button.grid(row=0, column=1, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🔒 CLOSE BREAKER", bg='#388e3c', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.close_breaker, 
-                 relief='raised', bd=2, width=15).grid(row=1, column=0, padx=3, pady=3)
+        self.close_button = tk.Button(cmd_grid, text="🔒 CLOSE BREAKER", bg='#388e3c', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.close_breaker, 
+                                    relief='raised', bd=2, width=15)
+        self.close_button.grid(row=1, column=0, padx=3, pady=3)
         
         tk.Button(cmd_grid, text="✅ ACK ALARMS", bg='#f57c00', fg='white', 
                  font=('Arial', 10, 'bold'), command=self.ack_alarms, 
                  relief='raised', bd=2, width=15).grid(row=1, column=1, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🔄 RESET PROTECTION", bg='#1976d2', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.reset_relay, 
-                 relief='raised', bd=2, width=15).grid(row=2, column=1, padx=3, pady=3)
+        self.reset_button = tk.Button(cmd_grid, text="🔄 RESET PROTECTION", bg='#1976d2', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.reset_relay, 
+                                    relief='raised', bd=2, width=15)
+        self.reset_button.grid(row=2, column=1, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🔓 OPEN BREAKER", bg='#e64a19', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.open_breaker, 
-                 relief='raised', bd=2, width=15).grid(row=2, column=0, padx=3, pady=3)
+        self.open_button = tk.Button(cmd_grid, text="🔓 OPEN BREAKER", bg='#e64a19', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.open_breaker, 
+                                    relief='raised', bd=2, width=15)
+        self.open_button.grid(row=2, column=0, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🔧 DIAGNOSTICS", bg='#7b1fa2', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.show_diagnostics, 
-                 relief='raised', bd=2, width=15).grid(row=3, column=0, padx=3, pady=3)
+        self.diag_button = tk.Button(cmd_grid, text="🔧 DIAGNOSTICS", bg='#7b1fa2', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.show_diagnostics, 
+                                    relief='raised', bd=2, width=15)
+        self.diag_button.grid(row=3, column=0, padx=3, pady=3)
         
-        tk.Button(cmd_grid, text="🧪 TEST TRIP", bg='#ffa000', fg='white', 
-                 font=('Arial', 10, 'bold'), command=self.test_trip, 
-                 relief='raised', bd=2, width=15).grid(row=3, column=1, padx=3, pady=3)
+        self.test_button = tk.Button(cmd_grid, text="🧪 TEST TRIP", bg='#ffa000', fg='white', 
+                                    font=('Arial', 10, 'bold'), command=self.test_trip, 
+                                    relief='raised', bd=2, width=15)
+        self.test_button.grid(row=3, column=1, padx=3, pady=3)
         
         # Communication Log Panel
         log_frame = tk.LabelFrame(right_panel, text="📋 COMMUNICATION LOG", 
@@ -237,6 +261,21 @@ class HMIScadaPanel:
                                         relief='sunken', bd=1, width=15)
         self.goose_count_label.grid(row=1, column=1, sticky='w', padx=15, pady=3)
         
+        # Trend Panel
+        trend_frame = tk.LabelFrame(left_panel, text="📉 TRENDS", 
+                                  fg='#81c784', bg='#263238', font=('Arial', 11, 'bold'),
+                                  relief='groove', bd=2)
+        trend_frame.pack(fill='x', pady=5)
+        
+        self.trends = TrendChart(trend_frame, [
+            ("Voltage", "{:.1f} kV", '#ffeb3b', 100.0, 150.0),
+            ("Current", "{:.0f} A", '#4caf50', 0.0, 3000.0),
+            ("Frequency", "{:.3f} Hz", '#90caf9', 48.0, 52.0),
+            ("Active P", "{:.1f} MW", '#2196f3', 0.0, 600.0),
+            ("PF", "{:.3f}", '#ff9800', 0.8, 1.0),
+        ])
+        self.trends.pack(fill='x', padx=10, pady=5)
+        
         # SCADA Status Bar
         status_bar = tk.Frame(self.root, bg='#0d47a1', height=30, relief='sunken', bd=1)
         status_bar.pack(fill='x', side='bottom')
@@ -256,85 +295,80 @@ class HMIScadaPanel:
         
     def send_trip(self):
         # Send MMS control command to protection relay
-        try:
-            response = requests.post('http://localhost:8080/trip', timeout=2)
-            if response.status_code == 200:
-                self.log_message("MMS CONTROL: GenericIO/GGIO1.SPCSO1.Oper.ctlVal = TRUE")
-                self.log_message("MMS TRIP: Command sent via IEC 61850 MMS")
-            else:
-                self.log_message("MMS CONTROL FAILED: Trip command")
-        except:
-            self.log_message("MMS CONNECTION ERROR: HMI/SCADA server unavailable")
+        self.mms_command("TRIP", '/trip', self.trip_button,
+                         ["MMS CONTROL: GenericIO/GGIO1.SPCSO1.Oper.ctlVal = TRUE",
+                          "MMS TRIP: Command sent via IEC 61850 MMS"],
+                         "MMS CONTROL FAILED: Trip command")
     
     def close_breaker(self):
         # Send MMS close command via HMI server
-        try:
-            response = requests.post('http://localhost:8080/close', timeout=2)
-            if response.status_code == 200:
-                self.log_message("MMS CONTROL: GenericIO/GGIO1.SPCSO2.Oper.ctlVal = FALSE")
-                self.log_message("MMS BREAKER: Close command via IEC 61850 MMS")
-            else:
-                self.log_message("MMS CONTROL FAILED: Close command")
-        except:
-            self.log_message("MMS CONNECTION ERROR: HMI/SCADA server unavailable")
+        self.mms_command("CLOSE", '/close', self.close_button,
+                         ["MMS CONTROL: GenericIO/GGIO1.SPCSO2.Oper.ctlVal = FALSE",
+                          "MMS BREAKER: Close command via IEC 61850 MMS"],
+                         "MMS CONTROL FAILED: Close command")
         
     def reset_relay(self):
         # Send MMS reset command via HMI server
-        try:
-            response = requests.post('http://localhost:8080/reset', timeout=2)
-            if response.status_code == 200:
-                self.log_message("MMS CONTROL: Protection reset via IEC 61850 MMS")
-                self.log_message("MMS RESET: All fault conditions cleared")
-            else:
-                self.log_message("MMS CONTROL FAILED: Reset command")
-        except:
-            self.log_message("MMS CONNECTION ERROR: HMI/SCADA server unavailable")
+        self.mms_command("RESET", '/reset', self.reset_button,
+                         ["MMS CONTROL: Protection reset via IEC 61850 MMS",
+                          "MMS RESET: All fault conditions cleared"],
+                         "MMS CONTROL FAILED: Reset command")
     
     def open_breaker(self):
         # Send MMS open command via HMI server
-        try:
-            response = requests.post('http://localhost:8080/open', timeout=2)
-            if response.status_code == 200:
-                self.log_message("MMS CONTROL: GenericIO/GGIO1.SPCSO2.Oper.ctlVal = TRUE")
-                self.log_message("MMS BREAKER: Open command via IEC 61850 MMS")
+        self.mms_command("OPEN", '/open', self.open_button,
+                         ["MMS CONTROL: GenericIO/GGIO1.SPCSO2.Oper.ctlVal = TRUE",
+                          "MMS BREAKER: Open command via IEC 61850 MMS"],
+                         "MMS CONTROL FAILED: Open command")
+        
+    def mms_command(self, name, path, button, success, failure):
+        # POST to the HMI server off the Tk thread; the button shows in-flight state
+        def done(response, error):
+            if error is not None:
+                self.log_message("MMS CONNECTION ERROR: HMI/SCADA server unavailable")
+            elif response.status_code == 200:
+                for message in success:
+                    self.log_message(message)
             else:
-                self.log_message("MMS CONTROL FAILED: Open command")
-        except:
-            self.log_message("MMS CONNECTION ERROR: HMI/SCADA server unavailable")
+                self.log_message(failure)
+        self.commands.run(name, lambda: ied_http.post(self.base_url + path, timeout=2),
+                          button, done)
         
     def ack_alarms(self):
-        self.alarm_listbox.delete(0, tk.END)
+        self.alarms.clear()
         self.log_message("All alarms acknowledged")
         
     def log_message(self, message):
         timestamp = time.strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
+        self.log.append(f"[{timestamp}] {message}")
     
     def test_trip(self):
-        try:
-            # Test MMS connection via HMI server
-            response = requests.get('http://localhost:8080', timeout=2)
-            if response.status_code == 200:
-                self.log_text.delete(1.0, tk.END)
-                self.log_text.insert(tk.END, f"MMS TEST: HMI/SCADA MMS Client\n\nHTTP Status: {response.status_code}\nMMS Server: protection_relay_ied:102\nTest: SUCCESS\n\nMMS control ready.\n")
-            else:
-                self.log_text.delete(1.0, tk.END)
-                self.log_text.insert(tk.END, f"MMS TEST: Connection Failed\n\nHTTP Status: {response.status_code}\nTest: FAILED\n")
-        except Exception as e:
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, f"MMS TEST: Connection Failed\n\nError: {str(e)}\nMMS Server: protection_relay_ied:102\nTest: FAILED\n")
+        # Test MMS connection via HMI server
+        self.commands.run("TEST", lambda: ied_http.get(self.base_url, timeout=2),
+                          self.test_button, self.show_test_result)
+        
+    def show_test_result(self, response, error):
+        if error is not None:
+            self.log.replace(f"MMS TEST: Connection Failed\n\nError: {str(error)}\nMMS Server: protection_relay_ied:102\nTest: FAILED\n")
+        elif response.status_code == 200:
+            self.log.replace(f"MMS TEST: HMI/SCADA MMS Client\n\nHTTP Status: {response.status_code}\nMMS Server: protection_relay_ied:102\nTest: SUCCESS\n\nMMS control ready.\n")
+        else:
+            self.log.replace(f"MMS TEST: Connection Failed\n\nHTTP Status: {response.status_code}\nTest: FAILED\n")
     
     def show_diagnostics(self):
-        # Display comprehensive communication diagnostics
+        self.commands.run("DIAGNOSTICS", self.collect_diagnostics, self.diag_button,
+                          self.show_diagnostics_result)
+        
+    def collect_diagnostics(self):
+        # Runs off the Tk thread: display comprehensive communication diagnostics
         diag_text = "=== COMMUNICATION DIAGNOSTICS ===\n\n"
         
         # Test MMS Connection
         try:
-            response = requests.get('http://localhost:8080', timeout=2)
+            response = ied_http.get(self.base_url, timeout=2)
             if response.status_code == 200:
                 diag_text += "MMS Connection: ✅ ACTIVE\n"
-                diag_text += "HMI Server: localhost:8080 - OK\n"
+                diag_text += f"HMI Server: {self.base_url.split('://')[-1]} - OK\n"
                 diag_text += "Protection Relay: protection_relay_ied:102 - OK\n"
             else:
                 diag_text += "MMS Connection: ❌ FAILED\n"
@@ -343,141 +377,166 @@ class HMIScadaPanel:
             
         # Test MMS Communication to all devices
         try:
-            response = requests.get('http://localhost:8080/diagnostics', timeout=2)
+            response = ied_http.get(self.base_url + '/diagnostics', timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 diag_text += f"\nMMS Diagnostics: ✅ ACTIVE\n"
                 diag_text += f"Protection Relay MMS: {data.get('protectionRelay', 'Unknown')}\n"
                 diag_text += f"Circuit Breaker MMS: {data.get('circuitBreaker', 'Unknown')}\n"
                 diag_text += f"GOOSE Messages: {data.get('gooseCount', 0)}\n"
+                if 'hops' in data:
+                    diag_text += self.format_hops(data)
             else:
                 diag_text += "\nMMS Diagnostics: ❌ FAILED\n"
         except:
             diag_text += "\nMMS Diagnostics: ❌ OFFLINE\n"
             
-
-            
         diag_text += "\n=== END DIAGNOSTICS ===\n"
-        
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.insert(tk.END, diag_text)
+        return diag_text
+        
+    @staticmethod
+    def format_hops(data):
+        # Per-hop MMS timing measured inside the HMI server
+        text = "\nMMS Timing (HMI server):\n"
+        text += f"  Relay probe:   {data.get('relayProbeMs', 0):7.1f} ms\n"
+        text += f"  Breaker probe: {data.get('breakerProbeMs', 0):7.1f} ms"
+        text += f"  ({data.get('breakerConnects', 0)} connects)\n"
+        labels = {'relayRead': "Relay batch read", 'breakerRead': "Breaker read", 'cycle': "Poll cycle"}
+        for key, label in labels.items():
+            hop = data['hops'].get(key)
+            if not hop:
+                continue
+            text += (f"  {label + ':':<18}last {hop['lastMs']:6.1f}  avg {hop['avgMs']:6.1f}  "
+                     f"max {hop['maxMs']:6.1f} ms  ({hop['errors']}/{hop['count']} failed)\n")
+        return text
+
+    def show_diagnostics_result(self, diag_text, error):
+        self.log.replace(diag_text or f"=== COMMUNICATION DIAGNOSTICS ===\n\nError: {error}\n")
         
     def start_monitoring(self):
-        def monitor():
-            while True:
-                try:
-                    response = requests.get('http://localhost:8080', timeout=2)
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.update_display(data)
-                        self.conn_status_label.config(text="🟢 ONLINE", fg='#4caf50')
-                        self.status_text.config(text="🟢 SCADA SYSTEM ACTIVE")
-                        self.system_status.config(text="● SYSTEM NORMAL", fg='#4caf50')
-                except:
-                    self.conn_status_label.config(text="🔴 OFFLINE", fg='#f44336')
-                    self.status_text.config(text="🔴 MMS CONNECTION LOST")
-                    self.system_status.config(text="● SYSTEM FAULT", fg='#f44336')
-                    
-                # Get GOOSE status via MMS from HMI server
-                try:
-                    if 'response' in locals() and response.status_code == 200:
-                        goose_data = data.get('gooseData', {})
-                        msg_count = goose_data.get('messageCount', 0)
-                        
-                        # Update GOOSE status
-                        if msg_count > 0:
-                            self.goose_status_label.config(text=f"🟢 ACTIVE ({msg_count})", fg='#4caf50')
-                        else:
-                            self.goose_status_label.config(text="🟡 NO DATA", fg='#ff9800')
-                            
-                        # Update GOOSE count display
-                        self.goose_count_label.config(text=str(msg_count))
-                    else:
-                        self.goose_status_label.config(text="🔴 OFFLINE", fg='#f44336')
-                        self.goose_count_label.config(text="--")
-                except:
-                    self.goose_status_label.config(text="🔴 ERROR", fg='#f44336')
-                    self.goose_count_label.config(text="--")
-                    
-                # Update time
-                self.time_label.config(text=time.strftime("%Y-%m-%d %H:%M:%S"))
-                time.sleep(2)
-                
-        thread = threading.Thread(target=monitor, daemon=True)
-        thread.start()
+        from ied_poller import get_poller
+        from ied_push import ensure_push
+        if not self.root.winfo_exists():
+            return  # closed before it was idle
+        # Snapshots are applied on the Tk thread, coalesced to one per frame
+        self.ui.register('hmi', self.on_hmi_data)
+        poller = get_poller()
+        if self.base_url == HMI_URL.rstrip('/'):
+            self.subscriptions.append(poller.subscribe('hmi', lambda kind, data: self.ui.submit('hmi', kind, data)))
+            # Refresh on change from the web-interface push feed; polling resumes if it drops
+            ensure_push()
+        else:
+            # Another bay's HMI server: polled only, the push feed covers the local one
+            name = f'hmi@{self.base_url}'
+            poller.add_endpoint(name, self.base_url, 2.0, 2.0)
+            self.subscriptions.append(poller.subscribe(name, lambda kind, data: self.ui.submit('hmi', kind, data)))
+
+    def close(self):
+        """Stop polling for this window; the shared poller stops the endpoint when unused."""
+        from ied_poller import get_poller
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for token in subscriptions:
+            get_poller().unsubscribe(token)
+
+    def on_destroy(self, event):
+        # <Destroy> on a toplevel also fires for each child widget
+        if event.widget is self.root:
+            self.close()
+        
+    def on_hmi_data(self, kind, data):
+        if kind == 'data':
+            self.update_display(data)
+            self.update_trends(data)
+            self.ui.configure(self.conn_status_label, text="🟢 ONLINE", fg='#4caf50')
+            self.ui.configure(self.status_text, text="🟢 SCADA SYSTEM ACTIVE")
+            self.ui.configure(self.system_status, text="● SYSTEM NORMAL", fg='#4caf50')
+            
+            # GOOSE status via MMS from HMI server
+            goose_data = data.get('gooseData', {})
+            msg_count = goose_data.get('messageCount', 0)
+            if msg_count > 0:
+                self.ui.configure(self.goose_status_label, text=f"🟢 ACTIVE ({msg_count})", fg='#4caf50')
+            else:
+                self.ui.configure(self.goose_status_label, text="🟡 NO DATA", fg='#ff9800')
+            self.ui.configure(self.goose_count_label, text=str(msg_count))
+        else:
+            self.ui.configure(self.conn_status_label, text="🔴 OFFLINE", fg='#f44336')
+            self.ui.configure(self.status_text, text="🔴 MMS CONNECTION LOST")
+            self.ui.configure(self.system_status, text="● SYSTEM FAULT", fg='#f44336')
+            self.ui.configure(self.goose_status_label, text="🔴 OFFLINE", fg='#f44336')
+            self.ui.configure(self.goose_count_label, text="--")
+            self.trends.gap()
+            
+        # Update time
+        self.ui.configure(self.time_label, text=time.strftime("%Y-%m-%d %H:%M:%S"))
+        
+    def update_trends(self, data):
+        # Sampled every tick, even when update_display skips an unchanged snapshot
+        voltage = data.get('voltage', 0)
+        current = data.get('current', 0)
+        power_factor, power, _ = self.view.derive('power', power_values, voltage, current)
+        self.trends.add((voltage, current, data.get('frequency', 0), power, power_factor))
         
     def update_display(self, data):
+        if not self.view.changed(data):
+            return
+            
         # Update measurements
         voltage = data.get('voltage', 0)
         current = data.get('current', 0)
         frequency = data.get('frequency', 0)
         fault_current = data.get('faultCurrent', 0)
         
-        self.voltage_label.config(text=f"{voltage:.1f} kV")
-        self.current_label.config(text=f"{current:.0f} A")
-        self.frequency_label.config(text=f"{frequency:.3f} Hz")
-        self.fault_current_label.config(text=f"{fault_current:.0f} A")
-        
-        # Calculate power factor based on load conditions
-        if current > 0:
-            # Dynamic power factor: higher current = lower PF
-            base_pf = 0.95
-            pf_variation = min(0.1, (current - 400) / 2000)  # Varies with load
-            power_factor = max(0.85, base_pf - pf_variation)
-        else:
-            power_factor = 1.0
-            
-        # Calculate active power
-        power = voltage * current * 1.732 * power_factor / 1000  # 3-phase power in MW
-        self.power_label.config(text=f"{power:.1f} MW")
+        self.ui.configure(self.voltage_label, text=self.view.format('voltage', voltage, "{:.1f} kV"))
+        self.ui.configure(self.current_label, text=self.view.format('current', current, "{:.0f} A"))
+        self.ui.configure(self.frequency_label, text=self.view.format('frequency', frequency, "{:.3f} Hz"))
+        self.ui.configure(self.fault_current_label, text=self.view.format('faultCurrent', fault_current, "{:.0f} A"))
         
-        # Calculate reactive power (Q = P * tan(arccos(PF)))
-        if power_factor < 1.0:
-            reactive_power = power * (((1 - power_factor**2)**0.5) / power_factor)
-        else:
-            reactive_power = 0.0
-        self.reactive_power_label.config(text=f"{reactive_power:.1f} MVAr")
+        # Power values only change with voltage/current
+        power_factor, power, reactive_power = self.view.derive('power', power_values, voltage, current)
+        self.ui.configure(self.power_label, text=self.view.format('power', power, "{:.1f} MW"))
+        self.ui.configure(self.reactive_power_label, text=self.view.format('reactivePower', reactive_power, "{:.1f} MVAr"))
         
         # Update power factor display with SCADA color coding
-        self.power_factor_label.config(text=f"{power_factor:.3f}")
+        self.ui.configure(self.power_factor_label, text=self.view.format('powerFactor', power_factor, "{:.3f}"))
         if power_factor >= 0.95:
-            self.power_factor_label.config(fg='#4caf50', bg='#e8f5e8')  # Good
+            self.ui.configure(self.power_factor_label, fg='#4caf50', bg='#e8f5e8')  # Good
         elif power_factor >= 0.90:
-            self.power_factor_label.config(fg='#ff9800', bg='#fff3e0')  # Warning
+            self.ui.configure(self.power_factor_label, fg='#ff9800', bg='#fff3e0')  # Warning
         else:
-            self.power_factor_label.config(fg='#f44336', bg='#ffebee')  # Poor
+            self.ui.configure(self.power_factor_label, fg='#f44336', bg='#ffebee')  # Poor
         
         # Update trip reason display
         last_alarm = data.get('lastAlarm', 'Normal Operation')
         trip_command = data.get('tripCommand', False)
         
         if trip_command:
-            self.trip_reason_label.config(text=f"🚨 {last_alarm.upper()}", fg='#f44336', bg='#ffebee')
-            self.system_status.config(text="● PROTECTION TRIP", fg='#f44336')
+            self.ui.configure(self.trip_reason_label, text=f"🚨 {last_alarm.upper()}", fg='#f44336', bg='#ffebee')
+            self.ui.configure(self.system_status, text="● PROTECTION TRIP", fg='#f44336')
         else:
-            self.trip_reason_label.config(text=f"⚡ {last_alarm.upper()}", fg='#4caf50', bg='#e8f5e8')
+            self.ui.configure(self.trip_reason_label, text=f"⚡ {last_alarm.upper()}", fg='#4caf50', bg='#e8f5e8')
             if not hasattr(self, '_system_fault'):
-                self.system_status.config(text="● SYSTEM NORMAL", fg='#4caf50')
+                self.ui.configure(self.system_status, text="● SYSTEM NORMAL", fg='#4caf50')
         
         # Update breaker status display
         breaker_status = data.get('breakerStatus', False)
         if breaker_status:
-            self.breaker_position_label.config(text="🔓 OPEN", fg='#f44336', bg='#ffebee')
+            self.ui.configure(self.breaker_position_label, text="🔓 OPEN", fg='#f44336', bg='#ffebee')
         else:
-            self.breaker_position_label.config(text="🔒 CLOSED", fg='#4caf50', bg='#e8f5e8')
+            self.ui.configure(self.breaker_position_label, text="🔒 CLOSED", fg='#4caf50', bg='#e8f5e8')
         
         # Check for alarms
         fault_detected = data.get('faultDetected', False)
         
         if fault_detected and not hasattr(self, 'fault_alarm_added'):
-            self.alarm_listbox.insert(tk.END, f"{time.strftime('%H:%M:%S')} - FAULT DETECTED")
+            self.alarms.append(f"{time.strftime('%H:%M:%S')} - FAULT DETECTED")
             self.fault_alarm_added = True
             self.log_message("ALARM: Fault detected in protection zone")
         elif not fault_detected:
             self.fault_alarm_added = False
             
         if trip_command and not hasattr(self, 'trip_alarm_added'):
-            self.alarm_listbox.insert(tk.END, f"{time.strftime('%H:%M:%S')} - TRIP COMMAND ISSUED")
+            self.alarms.append(f"{time.strftime('%H:%M:%S')} - TRIP COMMAND ISSUED")
             self.trip_alarm_added = True
             self.log_message("EVENT: Trip command issued by protection relay")
         elif not trip_command:
@@ -485,28 +544,28 @@ class HMIScadaPanel:
             
         # SCADA color coding for measurements
         if fault_detected:
-            self.current_label.config(fg='#f44336', bg='#ffebee')
+            self.ui.configure(self.current_label, fg='#f44336', bg='#ffebee')
         elif current > 1000:
-            self.current_label.config(fg='#ff9800', bg='#fff3e0')
+            self.ui.configure(self.current_label, fg='#ff9800', bg='#fff3e0')
         else:
-            self.current_label.config(fg='#4caf50', bg='#e8f5e8')
+            self.ui.configure(self.current_label, fg='#4caf50', bg='#e8f5e8')
             
         # SCADA color coding for fault current
         if fault_current > 300:
-            self.fault_current_label.config(fg='#f44336', bg='#ffebee')
+            self.ui.configure(self.fault_current_label, fg='#f44336', bg='#ffebee')
         elif fault_current > 100:
-            self.fault_current_label.config(fg='#ff9800', bg='#fff3e0')
+            self.ui.configure(self.fault_current_label, fg='#ff9800', bg='#fff3e0')
         else:
-            self.fault_current_label.config(fg='#4caf50', bg='#e8f5e8')
+            self.ui.configure(self.fault_current_label, fg='#4caf50', bg='#e8f5e8')
             
         if frequency < 49.8 or frequency > 50.2:
-            self.frequency_label.config(fg='#ff9800', bg='#fff3e0')
+            self.ui.configure(self.frequency_label, fg='#ff9800', bg='#fff3e0')
         else:
-            self.frequency_label.config(fg='#4caf50', bg='#e8f5e8')
+            self.ui.configure(self.frequency_label, fg='#4caf50', bg='#e8f5e8')
             
     def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
-    app = HMIScadaPanel()
+    app = HMIScadaPanel(base_url=sys.argv[1] if len(sys.argv) > 1 else HMI_URL)
     app.run()
\ No newline at end of file
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Pooled keep-alive HTTP client shared by the GUI panels.
+
+Button actions and debug reads reuse one connection per host instead of
+opening a fresh one per call. The default backend is stdlib http.client,
+so importing this module does not pull in requests/urllib3 before the
+first window is drawn; set IED_HTTP_BACKEND=requests to use a
+requests.Session per host instead (imported on first use).
+"""
+import http.client
+import json as _json
+import os
+import select
+import socket
+import threading
+from urllib.parse import urlsplit
+
+POOL_SIZE = 4
+# Safe to send twice if a reused connection fails after the request went out
+IDEMPOTENT = ('GET', 'HEAD', 'OPTIONS')
+BACKEND = os.environ.get('IED_HTTP_BACKEND', 'stdlib')  # stdlib or requests
+
+_sessions = {}
+_idle = {}
+_lock = threading.Lock()
+
+
+class Response:
+    """The subset of requests.Response the panels use."""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return _json.loads(self.content)
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}", parts
+
+
+def session_for(url):
+    import requests
+    from requests.adapters import HTTPAdapter
+    key, _ = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount(key, adapter)
+            _sessions[key] = session
+        return session
+
+
+def _checkout(key, parts, timeout):
+    with _lock:
+        pool = _idle.get(key)
+        conn = pool.pop() if pool else None
+    if conn is not None and conn.sock is not None and select.select([conn.sock], [], [], 0)[0]:
+        # Readable while idle means the server closed it (or sent junk); don't reuse
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _checkin(key, conn):
+    with _lock:
+        pool = _idle.setdefault(key, [])
+        if len(pool) < POOL_SIZE:
+            pool.append(conn)
+            return
+    conn.close()
+
+
+def _send(conn, method, path, body, headers):
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def request(method, url, timeout=None, json=None, data=None, headers=None):
+    if BACKEND == 'requests':
+        return session_for(url).request(method, url, timeout=timeout, json=json,
+                                        data=data, headers=headers)
+    key, parts = _host_key(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    headers = dict(headers or {})
+    body = data
+    if json is not None:
+        body = _json.dumps(json).encode()
+        headers.setdefault('Content-Type', 'application/json')
+    elif method == 'POST' and body is None:
+        body = b''
+
+    conn = _checkout(key, parts, timeout)
+    reused = conn.sock is not None
+    sent = False
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        sent = True
+        response = conn.getresponse()
+        content = response.read()
+    except (ConnectionError, OSError) as e:
+        conn.close()
+        if not reused or isinstance(e, socket.timeout):
+            raise
+        if sent and method not in IDEMPOTENT:
+            # The IED may have acted on it (trip, close, reset) before dropping the connection
+            raise
+        # The server closed an idle keep-alive connection; retry once fresh
+        try:
+            response, content = _send(conn, method, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+    except Exception:
+        conn.close()
+        raise
+    if response.will_close:
+        conn.close()
+    else:
+        _checkin(key, conn)
+    return Response(response.status, content, dict(response.getheaders()))
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def close_all():
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        conns = [c for pool in _idle.values() for c in pool]
+        _idle.clear()
+    for session in sessions:
+        session.close()
+    for conn in conns:
+        conn.close()
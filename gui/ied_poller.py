@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Shared asyncio poller for the IED HTTP endpoints used by the GUI panels.
+
+All endpoints are polled concurrently from a single event-loop thread.
+Panels subscribe to an endpoint by name instead of running their own
+monitor threads; callbacks receive ('data', dict) or ('error', str) using
+the same status strings CircuitBreakerPanel already shows.
+
+Each endpoint is scheduled adaptively: FAST_INTERVAL while a trip or fault
+flag is set, its base interval normally, SLOW_FACTOR times that once the
+state fields have not changed for STABLE_POLLS polls, and exponential backoff
+with jitter while it is unreachable. max_concurrency bounds the requests
+in flight at once, so a poller covering hundreds of bays (see
+fleet_hmi_panel.py) still runs on one thread without bursting every
+endpoint at the same instant.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+from urllib.parse import urlsplit
+
+WEB_UI_URL = os.environ.get('WEB_UI_URL', 'http://localhost:3000')
+
+# name -> (url, interval seconds, timeout seconds)
+DEFAULT_ENDPOINTS = {
+    'hmi': (os.environ.get('HMI_URL', 'http://localhost:8080'), 2.0, 2.0),
+    'breaker': (os.environ.get('BREAKER_URL', 'http://localhost:8081'), 1.0, 2.0),
+    'relay': (os.environ.get('RELAY_URL', 'http://localhost:8082'), 1.0, 2.0),
+    'simulator': (WEB_UI_URL + '/api/simulation-data', 1.0, 2.0),
+}
+
+MAX_BACKOFF = 30.0
+FAST_INTERVAL = 0.2
+SLOW_FACTOR = 3.0
+STABLE_POLLS = 5
+JITTER = 0.2
+
+# Snapshot flags that mean a fault or trip is in progress
+ACTIVE_FLAGS = ('tripCommand', 'faultDetected', 'tripReceived', 'overcurrentPickup')
+# Fields compared to decide a snapshot is stable (counters and timestamps ignored)
+STATE_FIELDS = ACTIVE_FLAGS + ('breakerStatus', 'breakerOpen', 'position', 'rxOk', 'txOk',
+                               'voltage', 'current', 'frequency', 'faultCurrent')
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+
+
+class AsyncHTTPConnection:
+    """Keep-alive HTTP/1.1 client connection to one host.
+
+    The connection is reused while the server answers with a
+    Content-Length and does not ask to close; otherwise it is reopened on
+    the next request.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method, path, timeout, body=None, retry=True):
+        reused = self._writer is not None
+        try:
+            return await asyncio.wait_for(self._exchange(method, path, body), timeout)
+        except (OSError, asyncio.IncompleteReadError):
+            self.close()
+            if not (reused and retry):
+                raise
+        except BaseException:
+            self.close()
+            raise
+        # A reused connection may have been closed by the server while idle
+        try:
+            return await asyncio.wait_for(self._exchange(method, path, body), timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _exchange(self, method, path, body):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        head = f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n'
+        if body is not None:
+            head += f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+        self._writer.write(head.encode() + b'\r\n' + (body or b''))
+        await self._writer.drain()
+        header = await self._reader.readuntil(b'\r\n\r\n')
+        lines = header.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        length = None
+        keep_alive = lines[0].startswith('HTTP/1.1')
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value.strip())
+            elif name == 'connection':
+                keep_alive = value.strip().lower() != 'close'
+        if length is None:
+            payload = await self._reader.read()
+            keep_alive = False
+        else:
+            payload = await self._reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def split_url(url):
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    return parts.hostname or 'localhost', parts.port or 80, path
+
+
+async def http_request(url, timeout, method='GET', body=None):
+    """One-shot request; returns (status, body bytes)."""
+    host, port, path = split_url(url)
+    conn = AsyncHTTPConnection(host, port)
+    try:
+        return await conn.request(method, path, timeout, body)
+    finally:
+        conn.close()
+
+
+def is_active(data):
+    return isinstance(data, dict) and any(data.get(flag) for flag in ACTIVE_FLAGS)
+
+
+def state_of(data):
+    if not isinstance(data, dict):
+        return data
+    return tuple(data.get(field) for field in STATE_FIELDS)
+
+
+def classify_error(exc):
+    if isinstance(exc, HTTPStatusError):
+        return str(exc)
+    if isinstance(exc, asyncio.TimeoutError):
+        return 'TIMEOUT'
+    if isinstance(exc, ValueError):
+        return 'PARSING ERROR'
+    if isinstance(exc, (OSError, asyncio.IncompleteReadError)):
+        return 'NO CONNECTION'
+    return str(exc)[:15]
+
+
+class _Endpoint:
+    def __init__(self, name, url, interval, timeout):
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.subscribers = []
+        self.task = None
+        self.failures = 0
+        self.stable = 0
+        self.last_state = None
+        self.pushed = False
+        host, port, self.path = split_url(url)
+        self.conn = AsyncHTTPConnection(host, port)
+
+
+class IEDPoller:
+    def __init__(self, endpoints=None, max_concurrency=None):
+        self.loop = asyncio.new_event_loop()
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        # Semaphore is created in _poll_once, on self.loop: before Python 3.10 it
+        # binds to the current thread's default loop when constructed
+        self._max_concurrency = max_concurrency
+        self._slots = None
+        for name, (url, interval, timeout) in (endpoints or DEFAULT_ENDPOINTS).items():
+            self._endpoints[name] = _Endpoint(name, url, interval, timeout)
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name='ied-poller', daemon=True)
+        self._thread.start()
+
+    def add_endpoint(self, name, url, interval=1.0, timeout=2.0):
+        """Register an endpoint; an existing one with the same name is kept."""
+        with self._lock:
+            if name not in self._endpoints:
+                self._endpoints[name] = _Endpoint(name, url, interval, timeout)
+
+    def subscribe(self, name, callback):
+        with self._lock:
+            endpoint = self._endpoints[name]
+            endpoint.subscribers.append(callback)
+            start = endpoint.task is None
+            if start:
+                endpoint.task = 'starting'
+        if start:
+            self.loop.call_soon_threadsafe(self._start, endpoint)
+        return name, callback
+
+    def unsubscribe(self, token):
+        name, callback = token
+        with self._lock:
+            endpoint = self._endpoints[name]
+            if callback in endpoint.subscribers:
+                endpoint.subscribers.remove(callback)
+            stop = not endpoint.subscribers and endpoint.task is not None
+        if stop:
+            self.loop.call_soon_threadsafe(self._stop, endpoint)
+
+    def set_pushed(self, name, pushed):
+        """Pause polling of an endpoint while a push feed delivers it."""
+        with self._lock:
+            self._endpoints[name].pushed = pushed
+
+    def publish(self, name, kind, payload):
+        self._publish(self._endpoints[name], kind, payload)
+
+    def _start(self, endpoint):
+        endpoint.task = self.loop.create_task(self._run(endpoint))
+
+    def _stop(self, endpoint):
+        with self._lock:
+            if endpoint.subscribers:
+                return
+            task, endpoint.task = endpoint.task, None
+        if task is not None and task != 'starting':
+            task.cancel()
+
+    def _publish(self, endpoint, kind, payload):
+        with self._lock:
+            subscribers = list(endpoint.subscribers)
+        for callback in subscribers:
+            try:
+                callback(kind, payload)
+            except Exception as e:
+                print(f"Poller: {endpoint.name} subscriber failed: {e}")
+
+    async def _poll_once(self, endpoint):
+        if self._slots is None and self._max_concurrency:
+            self._slots = asyncio.Semaphore(self._max_concurrency)
+        if self._slots is not None:
+            async with self._slots:
+                status, body = await endpoint.conn.request('GET', endpoint.path, endpoint.timeout)
+        else:
+            status, body = await endpoint.conn.request('GET', endpoint.path, endpoint.timeout)
+        if status != 200:
+            raise HTTPStatusError(status)
+        return json.loads(body)
+
+    async def _run(self, endpoint):
+        try:
+            await self._poll_loop(endpoint)
+        finally:
+            endpoint.conn.close()
+
+    def _next_delay(self, endpoint, data=None, failed=False):
+        if failed:
+            delay = min(endpoint.interval * (2 ** (endpoint.failures - 1)), MAX_BACKOFF)
+            # Spread retries so panels do not hit a restarting IED in lockstep
+            return delay * random.uniform(1 - JITTER, 1 + JITTER)
+        if is_active(data):
+            endpoint.stable = 0
+            return min(FAST_INTERVAL, endpoint.interval)
+        state = state_of(data)
+        endpoint.stable = endpoint.stable + 1 if state == endpoint.last_state else 0
+        endpoint.last_state = state
+        if endpoint.stable >= STABLE_POLLS:
+            return endpoint.interval * SLOW_FACTOR
+        return endpoint.interval
+
+    async def _poll_loop(self, endpoint):
+        while True:
+            if endpoint.pushed:
+                endpoint.conn.close()
+                await asyncio.sleep(endpoint.interval)
+                continue
+            try:
+                data = await self._poll_once(endpoint)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                endpoint.failures += 1
+                endpoint.last_state = None
+                self._publish(endpoint, 'error', classify_error(e))
+                delay = self._next_delay(endpoint, failed=True)
+            else:
+                endpoint.failures = 0
+                self._publish(endpoint, 'data', data)
+                delay = self._next_delay(endpoint, data)
+            await asyncio.sleep(delay)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """Process-wide poller shared by every panel."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = IEDPoller()
+        return _poller
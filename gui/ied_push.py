@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Push subscription to the web-interface feed (WebSocket or SSE).
+
+Runs on the shared poller's event loop. Messages are delivered to the
+poller subscribers of the matching endpoint, and polling of that endpoint
+is paused while the feed is connected, so panels refresh on change
+instead of every 1-2 s.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+from ied_poller import WEB_UI_URL, get_poller, split_url
+
+# Feed message type -> poller endpoint name
+MESSAGE_ENDPOINTS = {
+    'simulationData': 'simulator',
+    'hmiData': 'hmi',
+}
+
+PUSH_TRANSPORT = os.environ.get('IED_PUSH', 'ws')  # ws, sse or off
+IDLE_TIMEOUT = 10.0   # server sends iedUpdate every 2 s
+MAX_RECONNECT = 30.0
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class WebSocketClient:
+    """Just enough RFC 6455 for a text-message feed."""
+
+    def __init__(self, url):
+        self.host, self.port, self.path = split_url(url)
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, timeout=5.0):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write((
+            f'GET {self.path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n\r\n').encode())
+        await self.writer.drain()
+        header = await asyncio.wait_for(self.reader.readuntil(b'\r\n\r\n'), timeout)
+        lines = header.decode('latin-1').split('\r\n')
+        if ' 101 ' not in lines[0] + ' ':
+            raise ConnectionError(f'WebSocket upgrade refused: {lines[0]}')
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        accept = ''
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'sec-websocket-accept':
+                accept = value.strip()
+        if accept != expected:
+            raise ConnectionError('WebSocket handshake failed')
+
+    async def send(self, opcode, payload=b''):
+        mask = os.urandom(4)
+        head = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            head += bytes([0x80 | len(payload)])
+        elif len(payload) < 65536:
+            head += bytes([0x80 | 126]) + struct.pack('!H', len(payload))
+        else:
+            head += bytes([0x80 | 127]) + struct.pack('!Q', len(payload))
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.writer.write(head + mask + masked)
+        await self.writer.drain()
+
+    async def _frame(self):
+        b0, b1 = await self.reader.readexactly(2)
+        length = b1 & 0x7f
+        if length == 126:
+            length = struct.unpack('!H', await self.reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await self.reader.readexactly(8))[0]
+        mask = await self.reader.readexactly(4) if b1 & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return bool(b0 & 0x80), b0 & 0x0f, payload
+
+    async def messages(self):
+        fragments = []
+        while True:
+            fin, opcode, payload = await asyncio.wait_for(self._frame(), IDLE_TIMEOUT)
+            if opcode == 0x8:
+                return
+            if opcode == 0x9:
+                await self.send(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                fragments.append(payload)
+                if fin:
+                    yield b''.join(fragments).decode('utf-8')
+                    fragments = []
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class SSEClient:
+    def __init__(self, url):
+        self.host, self.port, self.path = split_url(url)
+        self.reader = None
+        self.writer = None
+        self.chunked = False
+
+    async def connect(self, timeout=5.0):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout)
+        self.writer.write((
+            f'GET {self.path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Accept: text/event-stream\r\n\r\n').encode())
+        await self.writer.drain()
+        header = await asyncio.wait_for(self.reader.readuntil(b'\r\n\r\n'), timeout)
+        lines = header.decode('latin-1').split('\r\n')
+        if ' 200 ' not in lines[0] + ' ':
+            raise ConnectionError(f'SSE request refused: {lines[0]}')
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'transfer-encoding' and 'chunked' in value.lower():
+                self.chunked = True
+
+    async def _chunks(self):
+        while True:
+            if not self.chunked:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                yield data
+                continue
+            size = int((await self.reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                return
+            data = await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+            yield data
+
+    async def messages(self):
+        buffer = b''
+        chunks = self._chunks()
+        while True:
+            try:
+                data = await asyncio.wait_for(chunks.__anext__(), IDLE_TIMEOUT)
+            except StopAsyncIteration:
+                # Server closed the stream; re-raising here would surface as RuntimeError
+                return
+            buffer += data.replace(b'\r\n', b'\n')
+            while b'\n\n' in buffer:
+                event, buffer = buffer.split(b'\n\n', 1)
+                lines = [line[5:].strip() for line in event.split(b'\n') if line.startswith(b'data:')]
+                if lines:
+                    yield b'\n'.join(lines).decode('utf-8')
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class PushClient:
+    def __init__(self, poller, transport=PUSH_TRANSPORT, base_url=WEB_UI_URL):
+        self.poller = poller
+        self.transport = transport
+        ws_base = base_url.replace('http://', 'ws://', 1)
+        self.url = base_url + '/api/events' if transport == 'sse' else ws_base + '/'
+        self.connected = False
+        self._pushed = set()
+
+    def start(self):
+        asyncio.run_coroutine_threadsafe(self._run(), self.poller.loop)
+
+    def _dispatch(self, text):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        name = MESSAGE_ENDPOINTS.get(message.get('type'))
+        if name is None:
+            return
+        if name not in self._pushed:
+            self._pushed.add(name)
+            self.poller.set_pushed(name, True)
+        if message.get('error'):
+            self.poller.publish(name, 'error', message['error'])
+        elif message.get('data') is not None:
+            self.poller.publish(name, 'data', message['data'])
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            client = SSEClient(self.url) if self.transport == 'sse' else WebSocketClient(self.url)
+            try:
+                await client.connect()
+                self.connected = True
+                delay = 1.0
+                async for text in client.messages():
+                    self._dispatch(text)
+            except (OSError, ConnectionError, ValueError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError):
+                pass
+            finally:
+                client.close()
+                self.connected = False
+                # Fall back to polling until the feed is back
+                for name in self._pushed:
+                    self.poller.set_pushed(name, False)
+                self._pushed.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT)
+
+
+_push = None
+
+
+def ensure_push():
+    """Start the process-wide push feed once; no-op when IED_PUSH=off."""
+    global _push
+    if _push is None and PUSH_TRANSPORT != 'off':
+        _push = PushClient(get_poller())
+        _push.start()
+    return _push
@@ -1,29 +1,72 @@
 #!/usr/bin/env python3
+"""Launch the IED panels.
+
+By default all panels run in this process as Toplevel windows of one
+hidden Tk root, sharing one poller and one HTTP connection pool. Pass
+--separate to start each panel in its own interpreter as before.
+"""
 import subprocess
 import sys
 import os
+import tkinter as tk
+
+PANELS = [
+    ("simulation_control_panel.py", "simulation_control_panel", "SimulationControlPanel"),
+    ("protection_relay_panel.py", "protection_relay_panel", "ProtectionRelayPanel"),
+    ("circuit_breaker_panel.py", "circuit_breaker_panel", "CircuitBreakerPanel"),
+    ("hmi_scada_panel.py", "hmi_scada_panel", "HMIScadaPanel"),
+]
 
 def launch_panel(script_name):
     """Launch a panel script in a new process"""
     script_path = os.path.join(os.path.dirname(__file__), script_name)
     subprocess.Popen([sys.executable, script_path])
 
-def main():
+def launch_separate():
     print("Launching IED Panels...")
-    
-    # Launch all three panels
-    launch_panel("protection_relay_panel.py")
-    launch_panel("circuit_breaker_panel.py") 
-    launch_panel("hmi_scada_panel.py")
-    
+
+    for script_name, _, _ in PANELS:
+        launch_panel(script_name)
+
     print("All panels launched!")
     print("Close this window to keep panels running.")
-    
+
     # Keep the launcher running
     try:
         input("Press Enter to exit...")
     except KeyboardInterrupt:
         pass
 
+def launch_shared():
+    """Host every panel as a Toplevel of one hidden root."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    root = tk.Tk()
+    root.withdraw()
+
+    panels = []
+
+    def close(panel):
+        # Release the panel's poller subscriptions and feeds before its window goes
+        panel.close()
+        panel.root.destroy()
+        panels.remove(panel)
+        if not panels:
+            root.destroy()
+
+    for _, module_name, class_name in PANELS:
+        module = __import__(module_name)
+        panel = getattr(module, class_name)(master=root)
+        panels.append(panel)
+        panel.root.protocol("WM_DELETE_WINDOW", lambda p=panel: close(p))
+
+    print(f"{len(panels)} panels running in one process")
+    root.mainloop()
+
+def main():
+    if "--separate" in sys.argv[1:]:
+        launch_separate()
+    else:
+        launch_shared()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
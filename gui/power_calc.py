@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Three-phase power, power factor and reactive power from V and I.
+
+The same model the HMI panel shows: PF falls from 0.95 as load rises
+above 400 A (floor 0.85), P = sqrt(3) * V * I * PF in MW with V in kV and
+I in A, and Q = P * tan(arccos(PF)). Every function takes scalars or
+NumPy arrays (e.g. columns from telemetry_recorder.load()); lists and
+array.array are converted to NumPy arrays when NumPy is installed and
+computed element-wise otherwise.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SQRT3 = 1.732
+BASE_PF = 0.95
+MIN_PF = 0.85
+PF_KNEE_A = 400.0
+PF_SLOPE_A = 2000.0
+
+
+def _is_scalar(value):
+    return isinstance(value, (int, float)) or (np is not None and np.ndim(value) == 0)
+
+
+def _scalar_power_factor(current):
+    if current > 0:
+        # Dynamic power factor: higher current = lower PF
+        pf_variation = min(0.1, (current - PF_KNEE_A) / PF_SLOPE_A)
+        return max(MIN_PF, BASE_PF - pf_variation)
+    return 1.0
+
+
+def _scalar_power_values(voltage, current):
+    power_factor = _scalar_power_factor(current)
+    power = voltage * current * SQRT3 * power_factor / 1000
+    if power_factor < 1.0:
+        reactive_power = power * (((1 - power_factor**2)**0.5) / power_factor)
+    else:
+        reactive_power = 0.0
+    return power_factor, power, reactive_power
+
+
+def power_factor(current):
+    if _is_scalar(current):
+        return _scalar_power_factor(current)
+    if np is None:
+        return [_scalar_power_factor(i) for i in current]
+    current = np.asarray(current, dtype=float)
+    variation = np.minimum(0.1, (current - PF_KNEE_A) / PF_SLOPE_A)
+    return np.where(current > 0, np.maximum(MIN_PF, BASE_PF - variation), 1.0)
+
+
+def power_values(voltage, current):
+    """(power factor, active power MW, reactive power MVAr)."""
+    if _is_scalar(voltage) and _is_scalar(current):
+        return _scalar_power_values(voltage, current)
+    if np is None:
+        rows = [_scalar_power_values(v, i) for v, i in zip(voltage, current)]
+        return tuple(list(column) for column in zip(*rows)) if rows else ([], [], [])
+    voltage = np.asarray(voltage, dtype=float)
+    current = np.asarray(current, dtype=float)
+    pf = power_factor(current)
+    power = voltage * current * SQRT3 * pf / 1000
+    lagging = pf < 1.0
+    safe_pf = np.where(lagging, pf, 1.0)
+    reactive = np.where(lagging, power * np.sqrt(np.maximum(0.0, 1 - safe_pf**2)) / safe_pf, 0.0)
+    return pf, power, reactive
@@ -1,22 +1,36 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import ttk
-import requests
+import ied_http
 import json
-import threading
+import os
 import time
+from ui_dispatcher import UIDispatcher
+from view_model import ViewModel
+from bounded_log import BoundedLog
+from command_executor import CommandExecutor
+
+# Same endpoints ied_poller polls, so commands go to the IED on display
+RELAY_URL = os.environ.get('RELAY_URL', 'http://localhost:8082').rstrip('/')
+HMI_URL = os.environ.get('HMI_URL', 'http://localhost:8080').rstrip('/')
 
 class ProtectionRelayPanel:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Protection Relay IED - PROT_REL_001")
-        self.root.geometry("400x600")
+        self.root.geometry("400x720")
         self.root.configure(bg='#2c2c2c')
         
         # No control variables - read-only display
         
         self.setup_ui()
-        self.start_monitoring()
+        self.ui = UIDispatcher(self.root)
+        self.view = ViewModel()
+        self.log = BoundedLog(self.log_text, self.ui)
+        self.commands = CommandExecutor(self.ui, self.log_message)
+        self.subscriptions = []
+        self.root.bind('<Destroy>', self.on_destroy, add='+')
+        self.root.after_idle(self.start_monitoring)
         
     def setup_ui(self):
         # Header
@@ -67,28 +81,28 @@ class ProtectionRelayPanel:
         # Voltage
         tk.Label(meas_grid, text="Voltage L1:", fg='#ccc', bg='#2c2c2c', 
                 font=('Courier', 9)).grid(row=0, column=0, sticky='w', padx=5)
-        self.voltage_label = tk.Label(meas_grid, text="132.0 kV", fg='#00ff00', bg='#2c2c2c', 
+        self.voltage_label = tk.Label(meas_grid, text="-- kV", fg='#00ff00', bg='#2c2c2c', 
                                     font=('Courier', 10, 'bold'))
         self.voltage_label.grid(row=0, column=1, sticky='w', padx=10)
         
         # Current
         tk.Label(meas_grid, text="Current L1:", fg='#ccc', bg='#2c2c2c', 
                 font=('Courier', 9)).grid(row=1, column=0, sticky='w', padx=5)
-        self.current_label = tk.Label(meas_grid, text="450 A", fg='#00ff00', bg='#2c2c2c', 
+        self.current_label = tk.Label(meas_grid, text="-- A", fg='#00ff00', bg='#2c2c2c', 
                                     font=('Courier', 10, 'bold'))
         self.current_label.grid(row=1, column=1, sticky='w', padx=10)
         
         # Frequency
         tk.Label(meas_grid, text="Frequency:", fg='#ccc', bg='#2c2c2c', 
                 font=('Courier', 9)).grid(row=2, column=0, sticky='w', padx=5)
-        self.frequency_label = tk.Label(meas_grid, text="50.00 Hz", fg='#00ff00', bg='#2c2c2c', 
+        self.frequency_label = tk.Label(meas_grid, text="-- Hz", fg='#00ff00', bg='#2c2c2c', 
                                       font=('Courier', 10, 'bold'))
         self.frequency_label.grid(row=2, column=1, sticky='w', padx=10)
         
         # Fault Current
         tk.Label(meas_grid, text="Fault Current:", fg='#ccc', bg='#2c2c2c', 
                 font=('Courier', 9)).grid(row=3, column=0, sticky='w', padx=5)
-        self.fault_current_label = tk.Label(meas_grid, text="0 A", fg='#00ff00', bg='#2c2c2c', 
+        self.fault_current_label = tk.Label(meas_grid, text="-- A", fg='#00ff00', bg='#2c2c2c', 
                                           font=('Courier', 10, 'bold'))
         self.fault_current_label.grid(row=3, column=1, sticky='w', padx=10)
         
@@ -139,17 +153,21 @@ class ProtectionRelayPanel:
         control_frame = tk.Frame(self.root, bg='#2c2c2c')
         control_frame.pack(fill='x', padx=10, pady=10)
         
-        tk.Button(control_frame, text="MANUAL TRIP", bg='#ff0000', fg='white',
-                 font=('Courier', 10, 'bold'), command=self.send_trip).pack(side='left', padx=5)
+        self.trip_button = tk.Button(control_frame, text="MANUAL TRIP", bg='#ff0000', fg='white',
+                                     font=('Courier', 10, 'bold'), command=self.send_trip)
+        self.trip_button.pack(side='left', padx=5)
         
-        tk.Button(control_frame, text="RESET TRIP", bg='#0066cc', fg='white',
-                 font=('Courier', 10, 'bold'), command=self.reset_trip).pack(side='left', padx=5)
+        self.reset_trip_button = tk.Button(control_frame, text="RESET TRIP", bg='#0066cc', fg='white',
+                                           font=('Courier', 10, 'bold'), command=self.reset_trip)
+        self.reset_trip_button.pack(side='left', padx=5)
         
-        tk.Button(control_frame, text="RESET ALARMS", bg='#404040', fg='#00ff00',
-                 font=('Courier', 10), command=self.reset_relay).pack(side='left', padx=5)
+        self.reset_alarms_button = tk.Button(control_frame, text="RESET ALARMS", bg='#404040', fg='#00ff00',
+                                             font=('Courier', 10), command=self.reset_relay)
+        self.reset_alarms_button.pack(side='left', padx=5)
         
-        tk.Button(control_frame, text="DEBUG", bg='#ffaa00', fg='white',
-                 font=('Courier', 10, 'bold'), command=self.debug_test).pack(side='left', padx=5)
+        self.debug_button = tk.Button(control_frame, text="DEBUG", bg='#ffaa00', fg='white',
+                                      font=('Courier', 10, 'bold'), command=self.debug_test)
+        self.debug_button.pack(side='left', padx=5)
         
         # Live Data Display
         data_frame = tk.LabelFrame(self.root, text="Live IEC 61850 Data", 
@@ -160,100 +178,120 @@ class ProtectionRelayPanel:
                                font=('Courier', 9), height=8)
         self.data_text.pack(fill='both', expand=True, padx=5, pady=5)
         
+        # Command Log
+        log_frame = tk.LabelFrame(self.root, text="Command Log", 
+                                fg='#00ff00', bg='#2c2c2c', font=('Courier', 10))
+        log_frame.pack(fill='x', padx=10, pady=5)
+        
+        self.log_text = tk.Text(log_frame, bg='#1a1a1a', fg='#00ff00', 
+                              font=('Courier', 8), height=5)
+        self.log_text.pack(fill='both', expand=True, padx=5, pady=5)
+        
     def send_trip(self):
         """Sends a direct HTTP POST request to the Protection Relay to trip."""
-        try:
-            requests.post('http://localhost:8082/trip', timeout=2)
-            print("GUI: Manual Trip command sent to Protection Relay.")
-        except Exception as e:
-            print(f"GUI: Failed to send trip command: {e}")
+        self.relay_command("TRIP", '/trip', self.trip_button, "MANUAL TRIP: Command sent to relay",
+                           "TRIP FAILED")
 
     def reset_trip(self):
-        try:
-            r = requests.post('http://localhost:8082/reset', timeout=2)
-            if r.status_code == 200:
-                self.log_text.insert(1.0, "RESET: Trip reset command sent to relay\n")
-            else:
-                self.log_text.insert(1.0, f"RESET FAILED: HTTP {r.status_code}\n")
-        except Exception as e:
-            self.log_text.insert(1.0, f"RESET ERROR: {str(e)}\n")
+        self.relay_command("RESET", '/reset', self.reset_trip_button, "RESET: Trip reset command sent to relay",
+                           "RESET FAILED")
 
     def reset_relay(self):
         # Alias to same /reset for now
-        try:
-            r = requests.post('http://localhost:8082/reset', timeout=2)
-            if r.status_code == 200:
-                self.log_text.insert(1.0, "ALARM RESET: Command sent to relay\n")
+        self.relay_command("ALARM RESET", '/reset', self.reset_alarms_button, "ALARM RESET: Command sent to relay",
+                           "ALARM RESET FAILED")
+
+    def relay_command(self, name, path, button, success, failure):
+        # POST to the relay off the Tk thread; the button shows in-flight state
+        def done(response, error):
+            if error is not None:
+                self.log_message(f"{failure}: {str(error)[:40]}")
+            elif response.status_code == 200:
+                self.log_message(success)
             else:
-                self.log_text.insert(1.0, f"ALARM RESET FAILED: HTTP {r.status_code}\n")
-        except Exception as e:
-            self.log_text.insert(1.0, f"ALARM RESET ERROR: {str(e)}\n")
+                self.log_message(f"{failure}: HTTP {response.status_code}")
+        self.commands.run(name, lambda: ied_http.post(RELAY_URL + path, timeout=2),
+                          button, done)
+
+    def log_message(self, message):
+        timestamp = time.strftime("%H:%M:%S")
+        self.log.append(f"[{timestamp}] {message}")
     
     def debug_test(self):
-        try:
-            response = requests.get('http://localhost:8082', timeout=2)
-            if response.status_code == 200:
-                data = response.json()
-                self.data_text.delete(1.0, tk.END)
-                self.data_text.insert(1.0, f"DEBUG: Protection Relay Communication Test\n\nHTTP Status: {response.status_code}\nResponse: {json.dumps(data, indent=2)}\n\nTest: SUCCESS")
-            else:
-                self.data_text.delete(1.0, tk.END)
-                self.data_text.insert(1.0, f"DEBUG: Communication Test\n\nHTTP Status: {response.status_code}\nTest: FAILED")
-        except Exception as e:
-            self.data_text.delete(1.0, tk.END)
-            self.data_text.insert(1.0, f"DEBUG: Communication Test\n\nError: {str(e)}\nTest: FAILED")
-            
+        self.commands.run("DEBUG", lambda: ied_http.get(RELAY_URL, timeout=2),
+                          self.debug_button, self.show_debug_result)
+
+    def show_debug_result(self, response, error):
+        # The next snapshot must redraw over the debug text
+        self.view.reset()
+        if error is not None:
+            text = f"DEBUG: Communication Test\n\nError: {str(error)}\nTest: FAILED"
+        elif response.status_code == 200:
+            text = f"DEBUG: Protection Relay Communication Test\n\nHTTP Status: {response.status_code}\nResponse: {json.dumps(response.json(), indent=2)}\n\nTest: SUCCESS"
+        else:
+            text = f"DEBUG: Communication Test\n\nHTTP Status: {response.status_code}\nTest: FAILED"
+        self.ui.replace_text(self.data_text, text)
+
     def start_monitoring(self):
-        def monitor():
-            while True:
-                try:
-                    response = requests.get('http://localhost:8082', timeout=2)
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.update_display(data)
-                        self.status_label.config(text="● RELAY ONLINE", fg='#00ff00')
-                except:
-                    self.status_label.config(text="● OFFLINE", fg='#ff0000')
-                # Update TX (breaker sees relay GOOSE) from HMI diagnostics
-                try:
-                    s = requests.get('http://localhost:8082', timeout=2)
-                    if s.status_code == 200:
-                        st = s.json()
-                        # TX/RX purely from local relay endpoint (front-panel behavior)
-                        tx_ok = bool(st.get('txOk', False))
-                        rx_ok = bool(st.get('rxOk', False))
-                        self.goose_tx_led.config(text=("OK" if tx_ok else "TIMEOUT"),
-                                                 fg=('#00ff00' if tx_ok else '#ff0000'))
-                        self.goose_rx_led.config(text=("OK" if rx_ok else "TIMEOUT"),
-                                                 fg=('#00ff00' if rx_ok else '#ff0000'))
-                except:
-                    self.goose_tx_led.config(text="TIMEOUT", fg='#ff0000')
-                    self.goose_rx_led.config(text="TIMEOUT", fg='#ff0000')
+        from ied_poller import get_poller
+        if not self.root.winfo_exists():
+            return  # closed before it was idle
+        self.ui.register('relay', self.on_relay_snapshot)
+        self.subscriptions.append(get_poller().subscribe('relay', lambda kind, data: self.ui.submit('relay', kind, data)))
 
-                time.sleep(1)
-                
-        thread = threading.Thread(target=monitor, daemon=True)
-        thread.start()
+    def close(self):
+        """Stop polling for this window; the shared poller stops the endpoint when unused."""
+        from ied_poller import get_poller
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for token in subscriptions:
+            get_poller().unsubscribe(token)
+
+    def on_destroy(self, event):
+        # <Destroy> on a toplevel also fires for each child widget
+        if event.widget is self.root:
+            self.close()
+        
+    def on_relay_snapshot(self, kind, data):
+        # One GET per tick feeds both the measurement view and the GOOSE LEDs
+        if kind == 'data':
+            self.update_display(data)
+            self.update_goose_leds(data)
+            self.ui.configure(self.status_label, text="● RELAY ONLINE", fg='#00ff00')
+        else:
+            self.update_goose_leds(None)
+            self.ui.configure(self.status_label, text="● OFFLINE", fg='#ff0000')
+            
+    def update_goose_leds(self, data):
+        # TX/RX purely from local relay endpoint (front-panel behavior)
+        tx_ok = bool(data and data.get('txOk', False))
+        rx_ok = bool(data and data.get('rxOk', False))
+        self.ui.configure(self.goose_tx_led, text=("OK" if tx_ok else "TIMEOUT"),
+                          fg=('#00ff00' if tx_ok else '#ff0000'))
+        self.ui.configure(self.goose_rx_led, text=("OK" if rx_ok else "TIMEOUT"),
+                          fg=('#00ff00' if rx_ok else '#ff0000'))
         
     def update_display(self, data):
+        if not self.view.changed(data):
+            return
+            
         # Update measurement displays
         voltage = data.get('voltage', 0)
         current = data.get('current', 0)
         frequency = data.get('frequency', 0)
         fault_current = data.get('faultCurrent', 0)
         
-        self.voltage_label.config(text=f"{voltage:.1f} kV")
-        self.current_label.config(text=f"{current:.0f} A")
-        self.frequency_label.config(text=f"{frequency:.3f} Hz")
-        self.fault_current_label.config(text=f"{fault_current:.0f} A")
+        self.ui.configure(self.voltage_label, text=self.view.format('voltage', voltage, "{:.1f} kV"))
+        self.ui.configure(self.current_label, text=self.view.format('current', current, "{:.0f} A"))
+        self.ui.configure(self.frequency_label, text=self.view.format('frequency', frequency, "{:.3f} Hz"))
+        self.ui.configure(self.fault_current_label, text=self.view.format('faultCurrent', fault_current, "{:.0f} A"))
         
         # Color fault current based on level
         if fault_current >= 800:
-            self.fault_current_label.config(fg='#ff0000')
+            self.ui.configure(self.fault_current_label, fg='#ff0000')
         elif fault_current >= 300:
-            self.fault_current_label.config(fg='#ffff00')
+            self.ui.configure(self.fault_current_label, fg='#ffff00')
         else:
-            self.fault_current_label.config(fg='#00ff00')
+            self.ui.configure(self.fault_current_label, fg='#00ff00')
         
         # Update protection element status
         overcurrent = current > 1000
@@ -263,45 +301,45 @@ class ProtectionRelayPanel:
         
         # Overcurrent Protection (50/51)
         if current >= 2500:
-            self.oc_status_label.config(text="50-INST TRIP", fg='#ff0000')
-            self.current_label.config(fg='#ff0000')
+            self.ui.configure(self.oc_status_label, text="50-INST TRIP", fg='#ff0000')
+            self.ui.configure(self.current_label, fg='#ff0000')
         elif current >= 1000:
-            self.oc_status_label.config(text="51-PICKUP", fg='#ffff00')
-            self.current_label.config(fg='#ffff00')
+            self.ui.configure(self.oc_status_label, text="51-PICKUP", fg='#ffff00')
+            self.ui.configure(self.current_label, fg='#ffff00')
         else:
-            self.oc_status_label.config(text="NORMAL", fg='#00ff00')
-            self.current_label.config(fg='#00ff00')
+            self.ui.configure(self.oc_status_label, text="NORMAL", fg='#00ff00')
+            self.ui.configure(self.current_label, fg='#00ff00')
             
         # Ground Fault Protection (50G/51G)
         if fault_current >= 800:
-            self.gf_status_label.config(text="50G-INST TRIP", fg='#ff0000')
+            self.ui.configure(self.gf_status_label, text="50G-INST TRIP", fg='#ff0000')
         elif fault_current >= 300:
-            self.gf_status_label.config(text="51G-PICKUP", fg='#ffff00')
+            self.ui.configure(self.gf_status_label, text="51G-PICKUP", fg='#ffff00')
         else:
-            self.gf_status_label.config(text="NORMAL", fg='#00ff00')
+            self.ui.configure(self.gf_status_label, text="NORMAL", fg='#00ff00')
             
         # Frequency Protection (81U)
         if frequency < 48.5:
-            self.freq_status_label.config(text="81U-TRIP", fg='#ff0000')
-            self.frequency_label.config(fg='#ff0000')
+            self.ui.configure(self.freq_status_label, text="81U-TRIP", fg='#ff0000')
+            self.ui.configure(self.frequency_label, fg='#ff0000')
         elif frequency < 49.0:
-            self.freq_status_label.config(text="81U-ALARM", fg='#ffff00')
-            self.frequency_label.config(fg='#ffff00')
+            self.ui.configure(self.freq_status_label, text="81U-ALARM", fg='#ffff00')
+            self.ui.configure(self.frequency_label, fg='#ffff00')
         else:
-            self.freq_status_label.config(text="NORMAL", fg='#00ff00')
-            self.frequency_label.config(fg='#00ff00')
+            self.ui.configure(self.freq_status_label, text="NORMAL", fg='#00ff00')
+            self.ui.configure(self.frequency_label, fg='#00ff00')
             
         # Trip command
         if trip_command:
-            self.trip_status_label.config(text="ACTIVE", fg='#ff0000')
+            self.ui.configure(self.trip_status_label, text="ACTIVE", fg='#ff0000')
         else:
-            self.trip_status_label.config(text="NO", fg='#00ff00')
+            self.ui.configure(self.trip_status_label, text="NO", fg='#00ff00')
             
         # Breaker position
         if breaker_open:
-            self.breaker_status_label.config(text="OPEN", fg='#ff8800')
+            self.ui.configure(self.breaker_status_label, text="OPEN", fg='#ff8800')
         else:
-            self.breaker_status_label.config(text="CLOSED", fg='#00ff00')
+            self.ui.configure(self.breaker_status_label, text="CLOSED", fg='#00ff00')
             
         # Determine trip reason based on conditions
         trip_reason = "Normal"
@@ -337,19 +375,19 @@ MMS Server: Port 102
 GOOSE Publisher: Active
 Dataset: Events (8 values)
 """
-        self.data_text.delete(1.0, tk.END)
-        self.data_text.insert(1.0, display_text)
+        self.ui.replace_text(self.data_text, display_text)
 
     def reset_latch(self):
         # Hit HMI reset to clear latches and demonstrate reset path
-        try:
-            r = requests.post('http://localhost:8080/reset', timeout=2)
-            if r.status_code == 200:
-                self.status_label.config(text="● RESET SENT", fg='#00ff00')
+        def done(response, error):
+            if error is not None:
+                self.ui.configure(self.status_label, text="● RESET ERROR", fg='#ff0000')
+            elif response.status_code == 200:
+                self.ui.configure(self.status_label, text="● RESET SENT", fg='#00ff00')
             else:
-                self.status_label.config(text="● RESET FAILED", fg='#ff0000')
-        except Exception:
-            self.status_label.config(text="● RESET ERROR", fg='#ff0000')
+                self.ui.configure(self.status_label, text="● RESET FAILED", fg='#ff0000')
+        self.commands.run("LATCH RESET", lambda: ied_http.post(HMI_URL + '/reset', timeout=2),
+                          self.reset_btn, done)
         
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Time-stepped scenario playback to the web interface's /api/command.
+
+A scenario is a declarative profile: per-field tracks made of steps,
+ramps and oscillations, played at a fixed tick rate (10-1000 Hz) on
+absolute monotonic deadlines. Ticks never drift: each deadline is
+start + k / rate, and if a tick overruns the ticks it missed are skipped
+(and counted) instead of being sent in a burst. Only fields whose value
+changed since the previous tick are sent, as one batch command when
+several change together. run() returns a report of achieved vs requested
+timing.
+
+    python3 scenario_engine.py list
+    python3 scenario_engine.py play overcurrent_ramp --rate 200
+    python3 scenario_engine.py play --file my_profile.json --dry-run
+
+Profile format (also accepted as JSON):
+    {'rate': 100, 'duration': 8.0,
+     'initial': {'current': 450.0},
+     'tracks': {'current': [{'at': 1.0, 'ramp': 1500.0, 'over': 2.0},
+                            {'at': 6.0, 'step': 450.0}],
+                'frequency': [{'at': 0.0, 'oscillate': 0.5, 'period': 2.0, 'center': 50.0}]}}
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+
+from bench_stats import percentile
+from command_batcher import batch
+
+WEB_UI_URL = os.environ.get('WEB_UI_URL', 'http://localhost:3000')
+
+MIN_RATE = 10
+MAX_RATE = 1000
+SPIN_S = 0.0005     # busy-wait the last half millisecond before a deadline
+
+# field -> (command, data key), as sent by SimulationControlPanel
+FIELD_COMMANDS = {
+    'voltage': ('updateVoltage', 'voltage'),
+    'current': ('updateCurrent', 'current'),
+    'frequency': ('updateFrequency', 'frequency'),
+    'faultCurrent': ('updateFaultCurrent', 'faultCurrent'),
+    'fault': ('toggleFault', 'active'),
+    'breaker': ('toggleBreaker', 'open'),
+}
+
+NORMAL = {'voltage': 132.0, 'current': 450.0, 'frequency': 50.0, 'faultCurrent': 0.0, 'fault': False}
+
+SCENARIOS = {
+    'overcurrent_ramp': {
+        'description': "51 pickup: ramp load 450 A -> 1500 A over 2 s, hold, restore",
+        'rate': 100, 'duration': 8.0, 'initial': NORMAL,
+        'tracks': {'current': [{'at': 1.0, 'ramp': 1500.0, 'over': 2.0},
+                               {'at': 6.0, 'step': 450.0}]},
+    },
+    'instantaneous_oc': {
+        'description': "50 element: step load to 3000 A for 2 s",
+        'rate': 100, 'duration': 4.0, 'initial': NORMAL,
+        'tracks': {'current': [{'at': 1.0, 'step': 3000.0}, {'at': 3.0, 'step': 450.0}]},
+    },
+    'ground_fault_step': {
+        'description': "51G pickup: 500 A residual current for 3 s",
+        'rate': 100, 'duration': 6.0, 'initial': NORMAL,
+        'tracks': {'faultCurrent': [{'at': 1.0, 'step': 500.0}, {'at': 4.0, 'step': 0.0}],
+                   'fault': [{'at': 1.0, 'step': True}, {'at': 4.0, 'step': False}]},
+    },
+    'underfrequency_ramp': {
+        'description': "81U: ramp frequency 50 Hz -> 48.3 Hz over 5 s, restore",
+        'rate': 50, 'duration': 9.0, 'initial': NORMAL,
+        'tracks': {'frequency': [{'at': 1.0, 'ramp': 48.3, 'over': 5.0},
+                                 {'at': 8.0, 'step': 50.0}]},
+    },
+    'frequency_swing': {
+        'description': "+/-0.4 Hz power swing at 0.5 Hz for 10 s",
+        'rate': 100, 'duration': 11.0, 'initial': NORMAL,
+        'tracks': {'frequency': [{'at': 0.0, 'oscillate': 0.4, 'period': 2.0, 'center': 50.0},
+                                 {'at': 10.0, 'step': 50.0}]},
+    },
+}
+
+
+class Track:
+    """Value of one field over time; segments are evaluated in order."""
+
+    def __init__(self, initial, segments):
+        self.segments = sorted(segments, key=lambda s: s['at'])
+        self._index = -1
+        self._start_value = initial
+        self._value = initial
+
+    def value(self, t):
+        # Scenario time only moves forward, so keep a cursor into the segments
+        while self._index + 1 < len(self.segments) and self.segments[self._index + 1]['at'] <= t:
+            self._start_value = self._value
+            self._index += 1
+        if self._index < 0:
+            return self._value
+        seg = self.segments[self._index]
+        dt = t - seg['at']
+        if 'step' in seg:
+            self._value = seg['step']
+        elif 'ramp' in seg:
+            frac = min(1.0, dt / seg['over']) if seg['over'] > 0 else 1.0
+            self._value = self._start_value + (seg['ramp'] - self._start_value) * frac
+        elif 'oscillate' in seg:
+            center = seg.get('center', self._start_value)
+            self._value = center + seg['oscillate'] * math.sin(2 * math.pi * dt / seg['period'])
+        else:
+            raise ValueError(f"unknown segment {seg}")
+        return self._value
+
+
+class ScenarioEngine:
+    def __init__(self, url=WEB_UI_URL + '/api/command', send=None, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+        self.send = send or self.post_command
+        self._stop = threading.Event()
+
+    def post_command(self, command, data):
+        import ied_http
+        payload = {'type': 'command', 'command': command, 'data': data}
+        response = ied_http.post(self.url, json=payload, timeout=self.timeout)
+        return response.status_code == 200
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, profile, rate=None, on_values=None):
+        rate = rate or profile.get('rate', 100)
+        if not MIN_RATE <= rate <= MAX_RATE:
+            raise ValueError(f"tick rate must be {MIN_RATE}-{MAX_RATE} Hz, got {rate}")
+        initial = dict(profile.get('initial', {}))
+        tracks = {}
+        for field, segments in profile.get('tracks', {}).items():
+            if field not in FIELD_COMMANDS:
+                raise ValueError(f"unknown field {field!r}")
+            tracks[field] = Track(initial.get(field, NORMAL.get(field, 0.0)), segments)
+        fields = set(tracks) | {f for f in initial if f in FIELD_COMMANDS}
+
+        period = 1.0 / rate
+        total_ticks = int(round(profile['duration'] * rate)) + 1
+        last_sent = {}
+        lateness = []
+        send_times = []
+        commands = errors = missed = 0
+        self._stop.clear()
+
+        start = time.perf_counter()
+        k = 0
+        while k < total_ticks and not self._stop.is_set():
+            deadline = start + k * period
+            remaining = deadline - time.perf_counter()
+            if remaining > SPIN_S:
+                time.sleep(remaining - SPIN_S)
+            while time.perf_counter() < deadline:
+                pass
+            now = time.perf_counter()
+            late = now - deadline
+            if late >= period:
+                # Overran: jump to the current tick rather than replaying the backlog
+                skipped = min(int(late / period), total_ticks - 1 - k)
+                missed += skipped
+                k += skipped
+                late = now - (start + k * period)
+            lateness.append(late)
+
+            t = k * period
+            values = {f: (tracks[f].value(t) if f in tracks else initial[f]) for f in fields}
+            changed = [f for f in sorted(fields) if f not in last_sent or last_sent[f] != values[f]]
+            if changed:
+                sent_at = time.perf_counter()
+                try:
+                    ok = self.send(*batch([(FIELD_COMMANDS[f][0], {FIELD_COMMANDS[f][1]: values[f]})
+                                           for f in changed]))
+                except Exception:
+                    ok = False
+                send_times.append(time.perf_counter() - sent_at)
+                commands += 1
+                if ok:
+                    last_sent.update((f, values[f]) for f in changed)
+                else:
+                    errors += 1
+            if on_values:
+                on_values(t, values)
+            k += 1
+
+        elapsed = time.perf_counter() - start
+        executed = len(lateness)
+        ms = lambda s: round(s * 1000, 3)
+        return {
+            'requested_rate_hz': rate,
+            'achieved_rate_hz': round((executed - 1) / elapsed, 2) if executed > 1 and elapsed > 0 else 0.0,
+            'requested_duration_s': profile['duration'],
+            'actual_duration_s': round(elapsed, 4),
+            'ticks_planned': total_ticks,
+            'ticks_executed': executed,
+            'ticks_missed': missed,
+            'stopped': self._stop.is_set(),
+            'requests_sent': commands,
+            'request_errors': errors,
+            'lateness_ms': {'p50': ms(percentile(lateness, 50)), 'p95': ms(percentile(lateness, 95)),
+                            'p99': ms(percentile(lateness, 99)), 'max': ms(max(lateness, default=0.0))},
+            'send_ms': {'p50': ms(percentile(send_times, 50)), 'p99': ms(percentile(send_times, 99)),
+                        'max': ms(max(send_times, default=0.0))},
+        }
+
+
+def format_report(name, report):
+    late = report['lateness_ms']
+    send = report['send_ms']
+    return (f"{name}: {report['ticks_executed']}/{report['ticks_planned']} ticks "
+            f"({report['ticks_missed']} missed) at {report['achieved_rate_hz']}/{report['requested_rate_hz']} Hz, "
+            f"{report['actual_duration_s']}/{report['requested_duration_s']} s\n"
+            f"  tick lateness ms p50={late['p50']} p95={late['p95']} p99={late['p99']} max={late['max']}\n"
+            f"  {report['requests_sent']} requests ({report['request_errors']} errors), "
+            f"send ms p50={send['p50']} p99={send['p99']} max={send['max']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play timed simulation scenarios")
+    sub = parser.add_subparsers(dest='action', required=True)
+    sub.add_parser('list')
+    play = sub.add_parser('play')
+    play.add_argument('name', nargs='?', help="built-in scenario name")
+    play.add_argument('--file', help="JSON profile instead of a built-in scenario")
+    play.add_argument('--rate', type=float, help=f"tick rate {MIN_RATE}-{MAX_RATE} Hz (default: profile's)")
+    play.add_argument('--url', default=WEB_UI_URL + '/api/command')
+    play.add_argument('--dry-run', action='store_true', help="schedule only, send nothing")
+    play.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.action == 'list':
+        for name, profile in SCENARIOS.items():
+            print(f"{name:<22}{profile['duration']:>5.1f} s  {profile['description']}")
+        return
+
+    if args.file:
+        with open(args.file) as f:
+            profile = json.load(f)
+        name = args.file
+    elif args.name in SCENARIOS:
+        profile = SCENARIOS[args.name]
+        name = args.name
+    else:
+        parser.error(f"unknown scenario {args.name!r}; see 'list'")
+
+    engine = ScenarioEngine(args.url, send=(lambda command, data: True) if args.dry_run else None)
+    try:
+        report = engine.run(profile, rate=args.rate)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2) if args.json else format_report(name, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,38 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import ttk
-import requests
+import ied_http
 import json
 import threading
 import time
+from ui_dispatcher import UIDispatcher
+from scenario_engine import SCENARIOS, WEB_UI_URL, ScenarioEngine, format_report
+from command_batcher import CommandSender
 
 class SimulationControlPanel:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Simulation Control Panel")
-        self.root.geometry("450x650")
+        self.root.geometry("450x720")
         self.root.configure(bg='#1a1a1a')
         
         # Variables
-        self.voltage = tk.DoubleVar(value=132.0)
-        self.current = tk.DoubleVar(value=450.0)
-        self.frequency = tk.DoubleVar(value=50.0)
-        self.fault_current = tk.DoubleVar(value=0.0)
-        self.fault_active = tk.BooleanVar(value=False)
+        self.voltage = tk.DoubleVar(self.root, value=132.0)
+        self.current = tk.DoubleVar(self.root, value=450.0)
+        self.frequency = tk.DoubleVar(self.root, value=50.0)
+        self.fault_current = tk.DoubleVar(self.root, value=0.0)
+        self.fault_active = tk.BooleanVar(self.root, value=False)
         
         self.setup_ui()
-        self.start_monitoring()
+        self.ui = UIDispatcher(self.root)
+        self.ui.register('scenario', lambda text: self.ui.configure(self.scenario_status, text=text))
+        self.scenario_engine = None
+        self.ui.register('commands', self.on_command_result)
+        self.commands = CommandSender(self.send_command,
+                                      on_result=lambda ok, stats: self.ui.submit('commands', ok, stats))
+        self.subscriptions = []
+        self.root.bind('<Destroy>', self.on_destroy, add='+')
+        self.root.after_idle(self.start_monitoring)
         
     def setup_ui(self):
         # Header
@@ -157,6 +168,24 @@ class SimulationControlPanel:
         tk.Button(scenario_grid, text="Frequency Deviation", bg='#3f51b5', fg='white',
                  font=('Arial', 10), width=15, command=self.scenario_freq_dev).grid(row=1, column=1, padx=5, pady=2)
         
+        # Timed scenarios played by the scenario engine
+        timed_frame = tk.Frame(scenario_frame, bg='#1a1a1a')
+        timed_frame.pack(fill='x', padx=10)
+        
+        self.timed_scenario = tk.StringVar(self.root, value=next(iter(SCENARIOS)))
+        scenario_menu = tk.OptionMenu(timed_frame, self.timed_scenario, *SCENARIOS)
+        scenario_menu.config(bg='#333', fg='white', highlightthickness=0, width=18)
+        scenario_menu.pack(side='left')
+        
+        tk.Button(timed_frame, text="PLAY", bg='#9c27b0', fg='white', font=('Arial', 9, 'bold'),
+                 command=self.play_scenario).pack(side='left', padx=5)
+        tk.Button(timed_frame, text="STOP", bg='#607d8b', fg='white', font=('Arial', 9, 'bold'),
+                 command=self.stop_scenario).pack(side='left')
+        
+        self.scenario_status = tk.Label(scenario_frame, text="", fg='#b0bec5', bg='#1a1a1a',
+                                      font=('Courier', 8), justify='left', anchor='w')
+        self.scenario_status.pack(fill='x', padx=10, pady=(2, 8))
+        
         # Live Data Display
         data_frame = tk.LabelFrame(self.root, text="Live IED Response", 
                                  fg='#4caf50', bg='#1a1a1a', font=('Arial', 12, 'bold'))
@@ -176,27 +205,33 @@ class SimulationControlPanel:
         tk.Button(control_frame, text="EMERGENCY STOP", bg='#d32f2f', fg='white',
                  font=('Arial', 10, 'bold'), command=self.emergency_stop).pack(side='right', padx=5)
         
+        self.command_stats = tk.Label(control_frame, text="", fg='#78909c', bg='#1a1a1a',
+                                    font=('Courier', 8))
+        self.command_stats.pack(side='left', expand=True)
+        
     def update_voltage(self, value):
-        self.send_command('updateVoltage', {'voltage': float(value)})
+        self.commands.submit('updateVoltage', {'voltage': float(value)})
         
     def update_current(self, value):
-        self.send_command('updateCurrent', {'current': float(value)})
+        self.commands.submit('updateCurrent', {'current': float(value)})
         
     def update_frequency(self, value):
-        self.send_command('updateFrequency', {'frequency': float(value)})
+        self.commands.submit('updateFrequency', {'frequency': float(value)})
         
     def update_fault_current(self, value):
-        self.send_command('updateFaultCurrent', {'faultCurrent': float(value)})
+        self.commands.submit('updateFaultCurrent', {'faultCurrent': float(value)})
         
     def toggle_fault(self):
-        self.send_command('toggleFault', {'active': self.fault_active.get()})
+        self.commands.submit('toggleFault', {'active': self.fault_active.get()})
         
     def inject_fault(self):
         self.fault_current.set(2500)
         self.current.set(2500)
         self.fault_active.set(True)
-        self.send_command('toggleFault', {'active': True})
-        self.send_command('updateFaultCurrent', {'faultCurrent': 2500})
+        self.commands.submit_many([
+            ('toggleFault', {'active': True}),
+            ('updateFaultCurrent', {'faultCurrent': 2500}),
+        ])
         
     def scenario_normal(self):
         self.voltage.set(132.0)
@@ -221,12 +256,42 @@ class SimulationControlPanel:
         self.frequency.set(48.0)
         self.apply_all_settings()
         
+    def play_scenario(self):
+        if self.scenario_engine is not None:
+            return
+        name = self.timed_scenario.get()
+        self.scenario_engine = ScenarioEngine()
+        self.ui.configure(self.scenario_status, text=f"PLAYING {name}...")
+        
+        def progress(t, values):
+            self.ui.submit('scenario', f"PLAYING {name}  t={t:5.2f}s  " +
+                           " ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                                    for k, v in sorted(values.items())))
+        
+        def play():
+            try:
+                text = format_report(name, self.scenario_engine.run(SCENARIOS[name], on_values=progress))
+            except Exception as e:
+                text = f"{name}: FAILED {e}"
+            self.scenario_engine = None
+            # Queued after the last progress update, so the report stays visible
+            self.ui.call_soon(lambda: self.ui.configure(self.scenario_status, text=text))
+        
+        threading.Thread(target=play, name='scenario', daemon=True).start()
+        
+    def stop_scenario(self):
+        if self.scenario_engine is not None:
+            self.scenario_engine.stop()
+            
     def apply_all_settings(self):
-        self.send_command('updateVoltage', {'voltage': self.voltage.get()})
-        self.send_command('updateCurrent', {'current': self.current.get()})
-        self.send_command('updateFrequency', {'frequency': self.frequency.get()})
-        self.send_command('updateFaultCurrent', {'faultCurrent': self.fault_current.get()})
-        self.send_command('toggleFault', {'active': self.fault_active.get()})
+        # One batch request, so the relay never samples a half-applied scenario
+        self.commands.submit_many([
+            ('updateVoltage', {'voltage': self.voltage.get()}),
+            ('updateCurrent', {'current': self.current.get()}),
+            ('updateFrequency', {'frequency': self.frequency.get()}),
+            ('updateFaultCurrent', {'faultCurrent': self.fault_current.get()}),
+            ('toggleFault', {'active': self.fault_active.get()}),
+        ])
         
     def reset_all(self):
         self.scenario_normal()
@@ -235,37 +300,60 @@ class SimulationControlPanel:
         self.fault_current.set(5000)
         self.current.set(5000)
         self.fault_active.set(True)
-        self.send_command('updateFaultCurrent', {'faultCurrent': 5000})
-        self.send_command('updateCurrent', {'current': 5000})
-        self.send_command('toggleFault', {'active': True})
+        self.commands.submit_many([
+            ('updateFaultCurrent', {'faultCurrent': 5000}),
+            ('updateCurrent', {'current': 5000}),
+            ('toggleFault', {'active': True}),
+        ])
         
     def send_command(self, command, data):
+        # Runs on the command sender thread; the result is shown by on_command_result
         try:
             payload = {'type': 'command', 'command': command, 'data': data}
-            response = requests.post('http://localhost:3000/api/command', 
+            response = ied_http.post(WEB_UI_URL + '/api/command',
                                    json=payload, timeout=2)
-            if response.status_code == 200:
-                self.status_indicator.config(text="● CONNECTED", fg='#4caf50')
-                return True
-        except Exception as e:
-            self.status_indicator.config(text="● DISCONNECTED", fg='#f44336')
+            return response.status_code == 200
+        except Exception:
             return False
             
+    def on_command_result(self, ok, stats):
+        if ok:
+            self.ui.configure(self.status_indicator, text="● CONNECTED", fg='#4caf50')
+        else:
+            self.ui.configure(self.status_indicator, text="● DISCONNECTED", fg='#f44336')
+        self.ui.configure(self.command_stats, text=(
+            f"sent {stats['requests']}  coalesced {stats['coalesced']}  dropped {stats['dropped']}"))
+            
+
     def start_monitoring(self):
-        def monitor():
-            while True:
-                try:
-                    response = requests.get('http://localhost:3000/api/simulation-data', timeout=2)
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.update_display(data)
-                        self.status_indicator.config(text="● CONNECTED", fg='#4caf50')
-                except:
-                    self.status_indicator.config(text="● DISCONNECTED", fg='#f44336')
-                time.sleep(1)
-                
-        thread = threading.Thread(target=monitor, daemon=True)
-        thread.start()
+        from ied_poller import get_poller
+        from ied_push import ensure_push
+        if not self.root.winfo_exists():
+            return  # closed before it was idle
+        self.ui.register('simulator', self.on_simulation_data)
+        self.subscriptions.append(get_poller().subscribe('simulator', lambda kind, data: self.ui.submit('simulator', kind, data)))
+        # Refresh on change from the web-interface push feed; polling resumes if it drops
+        ensure_push()
+
+    def close(self):
+        """Stop polling and any running scenario for this window."""
+        from ied_poller import get_poller
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for token in subscriptions:
+            get_poller().unsubscribe(token)
+        self.stop_scenario()
+
+    def on_destroy(self, event):
+        # <Destroy> on a toplevel also fires for each child widget
+        if event.widget is self.root:
+            self.close()
+        
+    def on_simulation_data(self, kind, data):
+        if kind == 'data':
+            self.update_display(data)
+            self.ui.configure(self.status_indicator, text="● CONNECTED", fg='#4caf50')
+        else:
+            self.ui.configure(self.status_indicator, text="● DISCONNECTED", fg='#f44336')
         
     def update_display(self, data):
         display_text = f"""Real-time IED Data:
@@ -287,8 +375,7 @@ System Status:
   GOOSE AppId: 4096 (Publishing)
   Last Update: {time.strftime('%H:%M:%S')}
 """
-        self.data_text.delete(1.0, tk.END)
-        self.data_text.insert(1.0, display_text)
+        self.ui.replace_text(self.data_text, display_text)
         
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Headless telemetry recorder for the IED endpoints the panels poll.
+
+Every snapshot from the shared poller is appended as one row to a
+columnar store: one directory per endpoint, one raw array file per
+field (<field>.bin) and a meta.json describing the columns. Files are
+append-only and fixed-width, so an hour of 1 Hz data from all four
+endpoints is well under a megabyte and load() can memory-map a column
+with NumPy (or read it into an array.array without NumPy). Breaker
+snapshots also feed GooseAnalytics, whose rate/jitter/gap counters are
+stored as a derived 'goose' stream.
+
+    python3 telemetry_recorder.py record --out telemetry [--duration 3600]
+    python3 telemetry_recorder.py info telemetry
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ied_poller import DEFAULT_ENDPOINTS, get_poller
+from goose_analytics import GooseAnalytics
+
+# field -> array typecode; only fields present in an endpoint's first
+# snapshot become columns of that endpoint
+FIELDS = {
+    'voltage': 'f',
+    'current': 'f',
+    'frequency': 'f',
+    'faultCurrent': 'f',
+    'stNum': 'I',
+    'sqNum': 'I',
+    'messageCount': 'I',
+    'txCount': 'I',
+    'rxCount': 'I',
+    'txOk': 'B',
+    'rxOk': 'B',
+    'tripCommand': 'B',
+    'tripReceived': 'B',
+    'faultDetected': 'B',
+    'breakerStatus': 'B',
+    'breakerOpen': 'B',
+}
+# GooseAnalytics output, recorded as the derived 'goose' stream next to 'breaker'
+GOOSE_COLUMNS = {
+    'rate': 'f',
+    'interval': 'f',
+    'jitter': 'f',
+    'sq_gaps': 'I',
+    'st_changes': 'I',
+    'ttl_violations': 'I',
+    'age': 'f',
+}
+NUMPY_TYPES = {'d': 'f8', 'f': 'f4', 'I': 'u4', 'B': 'u1'}
+
+FLUSH_ROWS = 64
+FLUSH_SECONDS = 5.0
+
+
+class ColumnStore:
+    """Append-only columnar file set for one endpoint."""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = {'t': 'd', **columns}
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['columns'] != self.columns or meta['byteorder'] != sys.byteorder:
+                raise ValueError(f"{path}: existing recording has a different layout")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({'columns': self.columns, 'byteorder': sys.byteorder,
+                           'created': time.time()}, f, indent=2)
+        self._buffers = {name: array(code) for name, code in self.columns.items()}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def append(self, t, data):
+        with self._lock:
+            for name, buf in self._buffers.items():
+                if name == 't':
+                    buf.append(t)
+                elif buf.typecode == 'f':
+                    value = data.get(name)
+                    buf.append(float(value) if value is not None else float('nan'))
+                elif buf.typecode == 'B':
+                    buf.append(1 if data.get(name) else 0)
+                else:
+                    buf.append(int(data.get(name) or 0) & 0xffffffff)
+            rows = len(self._buffers['t'])
+            due = time.monotonic() - self._last_flush >= FLUSH_SECONDS
+        if rows >= FLUSH_ROWS or due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            # Time column last, so a crash mid-flush never has t ahead of the data
+            for name in sorted(self._buffers, key=lambda n: n == 't'):
+                buf = self._buffers[name]
+                if buf:
+                    with open(os.path.join(self.path, f'{name}.bin'), 'ab') as f:
+                        buf.tofile(f)
+                    del buf[:]
+            self._last_flush = time.monotonic()
+
+
+class TelemetryRecorder:
+    def __init__(self, out_dir, endpoints=None, poller=None):
+        self.out_dir = out_dir
+        self.endpoints = list(endpoints or DEFAULT_ENDPOINTS)
+        self.poller = poller or get_poller()
+        self.stores = {}
+        self.rows = {name: 0 for name in self.endpoints}
+        self.errors = {name: 0 for name in self.endpoints}
+        self.goose = GooseAnalytics()
+        self._tokens = []
+
+    def start(self):
+        for name in self.endpoints:
+            callback = lambda kind, payload, name=name: self._on_snapshot(name, kind, payload)
+            self._tokens.append(self.poller.subscribe(name, callback))
+
+    def stop(self):
+        for token in self._tokens:
+            self.poller.unsubscribe(token)
+        self._tokens = []
+        for store in self.stores.values():
+            store.flush()
+
+    def _on_snapshot(self, name, kind, data):
+        if kind != 'data' or not isinstance(data, dict):
+            self.errors[name] += 1
+            return
+        store = self.stores.get(name)
+        if store is None:
+            columns = {field: code for field, code in FIELDS.items() if field in data}
+            store = self.stores[name] = ColumnStore(os.path.join(self.out_dir, name), columns)
+        t = time.time()
+        store.append(t, data)
+        self.rows[name] += 1
+        if name == 'breaker':
+            goose = self.stores.get('goose')
+            if goose is None:
+                goose = self.stores['goose'] = ColumnStore(os.path.join(self.out_dir, 'goose'), GOOSE_COLUMNS)
+            goose.append(t, self.goose.update(data, t))
+
+
+def load(path, mmap=True):
+    """Columns of one endpoint recording as {name: numpy array or array.array}."""
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    columns = meta['columns']
+    order = '<' if meta['byteorder'] == 'little' else '>'
+    sizes = {}
+    for name, code in columns.items():
+        file_path = os.path.join(path, f'{name}.bin')
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        sizes[name] = size // array(code).itemsize
+    rows = min(sizes.values())   # drop a partially flushed tail
+
+    result = {}
+    for name, code in columns.items():
+        file_path = os.path.join(path, f'{name}.bin')
+        if np is not None:
+            dtype = np.dtype(order + NUMPY_TYPES[code])
+            if rows == 0:
+                result[name] = np.zeros(0, dtype)
+            elif mmap:
+                result[name] = np.memmap(file_path, dtype=dtype, mode='r', shape=(rows,))
+            else:
+                result[name] = np.fromfile(file_path, dtype=dtype, count=rows)
+        else:
+            values = array(code)
+            if rows:
+                with open(file_path, 'rb') as f:
+                    values.fromfile(f, rows)
+            if meta['byteorder'] != sys.byteorder:
+                values.byteswap()
+            result[name] = values
+    return result
+
+
+def record(args):
+    endpoints = args.endpoints.split(',') if args.endpoints else None
+    recorder = TelemetryRecorder(args.out, endpoints)
+    recorder.start()
+    print(f"Recording {', '.join(recorder.endpoints)} to {args.out} (Ctrl+C to stop)")
+    started = time.time()
+    try:
+        while not args.duration or time.time() - started < args.duration:
+            time.sleep(min(args.status, args.duration or args.status))
+            counts = ' '.join(f"{n}={recorder.rows[n]}/{recorder.errors[n]}err" for n in recorder.endpoints)
+            print(f"[{time.strftime('%H:%M:%S')}] rows {counts}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.stop()
+
+
+def info(args):
+    for name in sorted(os.listdir(args.out)):
+        path = os.path.join(args.out, name)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            continue
+        columns = load(path, mmap=False)
+        t = columns['t']
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        span = f"{t[-1] - t[0]:.0f} s" if len(t) > 1 else "-"
+        print(f"{name:<10} {len(t):>8} rows  {span:>8}  {size / 1024:8.1f} KiB  "
+              f"{', '.join(c for c in columns if c != 't')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record IED telemetry to columnar files")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record')
+    rec.add_argument('--out', default='telemetry')
+    rec.add_argument('--endpoints', help=f"comma separated, default {','.join(DEFAULT_ENDPOINTS)}")
+    rec.add_argument('--duration', type=float, default=0, help="seconds, 0 = until Ctrl+C")
+    rec.add_argument('--status', type=float, default=10.0, help="status line interval")
+    rec.set_defaults(func=record)
+    inf = sub.add_parser('info')
+    inf.add_argument('out', nargs='?', default='telemetry')
+    inf.set_defaults(func=info)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
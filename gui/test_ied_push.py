@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Push feed client: reconnects, and end to end against web-interface/server.js.
+
+    cd gui && python3 -m unittest test_ied_push
+"""
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import time
+import unittest
+import urllib.request
+
+import ied_push
+
+
+class FakePoller:
+    def __init__(self):
+        self.published = []
+        self.pushed = []
+
+    def set_pushed(self, name, pushed):
+        self.pushed.append((name, pushed))
+
+    def publish(self, name, kind, data):
+        self.published.append((name, kind, data))
+
+
+class SSEReconnectTest(unittest.TestCase):
+    def test_reconnects_after_server_closes_stream(self):
+        async def scenario():
+            connections = []
+
+            async def handle(reader, writer):
+                await reader.readuntil(b'\r\n\r\n')
+                connections.append(writer)
+                # One event, then close like a restarting server
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n\r\n'
+                             b'event: simulationData\r\n'
+                             b'data: {"type":"simulationData","data":{"voltage":132.0}}\r\n\r\n')
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(handle, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            poller = FakePoller()
+            client = ied_push.PushClient(poller, transport='sse', base_url=f'http://127.0.0.1:{port}')
+            task = asyncio.ensure_future(client._run())
+            try:
+                for _ in range(50):
+                    if len(connections) >= 2:
+                        break
+                    await asyncio.sleep(0.1)
+                self.assertFalse(task.done(), task.exception() if task.done() else None)
+            finally:
+                task.cancel()
+                server.close()
+            return connections, poller
+
+        connections, poller = asyncio.run(scenario())
+        self.assertGreaterEqual(len(connections), 2)
+        self.assertIn(('simulator', 'data', {'voltage': 132.0}), poller.published)
+        # Polling resumed between connections
+        self.assertIn(('simulator', False), poller.pushed)
+
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web-interface')
+
+
+@unittest.skipUnless(shutil.which('node') and os.path.isdir(os.path.join(SERVER_DIR, 'node_modules')),
+                     "needs node and web-interface/node_modules")
+class TripResetPushTest(unittest.TestCase):
+    """sendTrip clears itself after 3 s; push clients must be told."""
+
+    def setUp(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            self.port = s.getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.server = subprocess.Popen(['node', 'server.js'], cwd=SERVER_DIR,
+                                       env=dict(os.environ, PORT=str(self.port)),
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(self.server.wait)
+        self.addCleanup(self.server.terminate)
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', self.port), 0.1).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        self.fail("server.js did not start")
+
+    def watch_trip(self, transport, send_trip):
+        async def scenario():
+            poller = FakePoller()
+            client = ied_push.PushClient(poller, transport=transport, base_url=self.base_url)
+            task = asyncio.ensure_future(client._run())
+            try:
+                for _ in range(50):
+                    if client.connected:
+                        break
+                    await asyncio.sleep(0.1)
+                await send_trip()
+                for _ in range(60):
+                    states = [d.get('tripCommand') for name, kind, d in poller.published
+                              if name == 'simulator' and kind == 'data']
+                    if True in states and states[-1] is False:
+                        break
+                    await asyncio.sleep(0.1)
+            finally:
+                task.cancel()
+            return poller.published
+
+        published = asyncio.run(scenario())
+        states = [(d['tripCommand'], d['breakerStatus']) for name, kind, d in published
+                  if name == 'simulator' and kind == 'data']
+        self.assertIn((True, True), states)
+        self.assertEqual(states[-1], (False, False))
+        return published
+
+    def test_rest_trip_reset_reaches_sse_client(self):
+        async def send_trip():
+            body = json.dumps({'type': 'command', 'command': 'sendTrip', 'data': {}}).encode()
+            request = urllib.request.Request(self.base_url + '/api/command', data=body,
+                                             headers={'Content-Type': 'application/json'})
+            await asyncio.get_running_loop().run_in_executor(None, lambda: urllib.request.urlopen(request).read())
+
+        self.watch_trip('sse', send_trip)
+
+    def test_websocket_trip_reset_reaches_ws_client(self):
+        async def send_trip():
+            ws = ied_push.WebSocketClient(self.base_url.replace('http://', 'ws://') + '/')
+            await ws.connect()
+            await ws.send(0x1, json.dumps({'type': 'command', 'command': 'sendTrip', 'data': {}}).encode())
+            await asyncio.sleep(0.2)
+            ws.close()
+
+        self.watch_trip('ws', send_trip)
+        with urllib.request.urlopen(self.base_url + '/api/ied-status') as response:
+            relay = json.load(response)['protectionRelay']
+        self.assertFalse(relay['tripCommand'])
+        self.assertFalse(relay['breakerStatus'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Scrolling trend chart for the panels.
+
+Samples go into one decimated ring buffer per time window (1 min, 10 min,
+1 h), each holding one averaged point per pixel column. The canvas is
+only ever extended by the newest segment: existing items are shifted
+left with a single canvas.move() and items that scroll out are deleted,
+so drawing cost does not depend on the poll rate or the window length.
+The buffers are preallocated NumPy arrays when NumPy is available and
+array.array rows otherwise.
+"""
+import math
+import time
+import tkinter as tk
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WINDOWS = {'1 min': 60, '10 min': 600, '1 h': 3600}
+POINTS = 180        # decimated points per window (one per column)
+STEP = 2            # pixels per point
+STRIP_HEIGHT = 28
+LABEL_WIDTH = 80
+NAN = float('nan')
+
+
+class RingBuffer:
+    """Preallocated capacity x width ring of float rows."""
+
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self.width = width
+        if np is not None:
+            self._data = np.full((capacity, width), np.nan)
+        else:
+            self._data = [array('d', [NAN] * width) for _ in range(capacity)]
+        self.head = 0
+        self.count = 0
+
+    def append(self, row):
+        if np is not None:
+            self._data[self.head] = row
+        else:
+            self._data[self.head] = array('d', row)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rows(self):
+        """Rows from oldest to newest."""
+        start = (self.head - self.count) % self.capacity
+        for i in range(self.count):
+            yield self._data[(start + i) % self.capacity]
+
+
+class Decimator:
+    """Averages samples into fixed time buckets and stores one row per bucket."""
+
+    def __init__(self, seconds, width, points=POINTS):
+        self.bucket = seconds / points
+        self.points = points
+        self.width = width
+        self.ring = RingBuffer(points, width)
+        self._index = None
+        self._sum = [0.0] * width
+        self._n = 0
+        self._hold = [NAN] * width
+
+    def advance(self, t):
+        """Close every bucket before t; returns the rows appended."""
+        index = int(t // self.bucket)
+        if self._index is None:
+            self._index = index
+            return []
+        closed = []
+        while self._index < index and len(closed) < self.points:
+            if self._n:
+                row = [s / self._n for s in self._sum]
+                self._hold = row
+                self._sum = [0.0] * self.width
+                self._n = 0
+            else:
+                row = self._hold   # no new sample: hold the last value
+            self.ring.append(row)
+            closed.append(row)
+            self._index += 1
+        self._index = index
+        return closed
+
+    def add(self, t, values):
+        closed = self.advance(t)
+        for i, value in enumerate(values):
+            self._sum[i] += value
+        self._n += 1
+        return closed
+
+    def gap(self, t):
+        """Break the line (e.g. connection lost) until the next sample."""
+        closed = self.advance(t)
+        self._sum = [0.0] * self.width
+        self._n = 0
+        self._hold = [NAN] * self.width
+        return closed
+
+
+class TrendChart:
+    """Stacked strip chart, one strip per series.
+
+    series: list of (label, value format, color, low, high).
+    """
+
+    def __init__(self, parent, series, bg='#1a1a1a', fg='#b0bec5', window='1 min'):
+        self.series = series
+        self.frame = tk.Frame(parent, bg=parent['bg'])
+        self.window = tk.StringVar(self.frame, value=window)
+        bar = tk.Frame(self.frame, bg=parent['bg'])
+        bar.pack(fill='x')
+        for name in WINDOWS:
+            tk.Radiobutton(bar, text=name, value=name, variable=self.window,
+                           command=self.redraw, indicatoron=False, bg='#37474f', fg='white',
+                           selectcolor='#0d47a1', font=('Arial', 9), width=6).pack(side='left', padx=2)
+        self.plot_width = POINTS * STEP
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0,
+                                width=LABEL_WIDTH + self.plot_width,
+                                height=STRIP_HEIGHT * len(series))
+        self.canvas.pack(pady=4)
+        self.value_items = []
+        for i, (label, spec, color, low, high) in enumerate(series):
+            top = i * STRIP_HEIGHT
+            self.canvas.create_line(LABEL_WIDTH, top + STRIP_HEIGHT - 1,
+                                    LABEL_WIDTH + self.plot_width, top + STRIP_HEIGHT - 1, fill='#263238')
+            self.canvas.create_text(4, top + 7, text=label, anchor='w', fill=fg, font=('Arial', 8))
+            self.value_items.append(self.canvas.create_text(
+                4, top + 20, text='--', anchor='w', fill=color, font=('Arial', 9, 'bold')))
+        self.decimators = {name: Decimator(seconds, len(series)) for name, seconds in WINDOWS.items()}
+        self._segments = deque()
+        self._last = None
+        self.frame.after(1000, self._scroll)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def add(self, values):
+        now = time.time()
+        for name, decimator in self.decimators.items():
+            closed = decimator.add(now, values)
+            if name == self.window.get():
+                self._append(closed)
+        for item, (label, spec, *_), value in zip(self.value_items, self.series, values):
+            self.canvas.itemconfigure(item, text=spec.format(value))
+
+    def gap(self):
+        now = time.time()
+        for name, decimator in self.decimators.items():
+            closed = decimator.gap(now)
+            if name == self.window.get():
+                self._append(closed)
+        for item in self.value_items:
+            self.canvas.itemconfigure(item, text='--')
+
+    def _scroll(self):
+        # Keep scrolling in real time while no samples arrive
+        if not self.frame.winfo_exists():
+            return
+        now = time.time()
+        for name, decimator in self.decimators.items():
+            closed = decimator.advance(now)
+            if name == self.window.get():
+                self._append(closed)
+        self.frame.after(1000, self._scroll)
+
+    def _y(self, strip, value):
+        label, spec, color, low, high = self.series[strip]
+        frac = (value - low) / (high - low)
+        frac = min(1.0, max(0.0, frac))
+        return strip * STRIP_HEIGHT + 2 + (1.0 - frac) * (STRIP_HEIGHT - 5)
+
+    def _append(self, rows):
+        if not rows:
+            return
+        right = LABEL_WIDTH + self.plot_width
+        self.canvas.move('trend', -STEP * len(rows), 0)
+        for n, row in enumerate(rows):
+            x = right - STEP * (len(rows) - 1 - n)
+            items = []
+            if self._last is not None:
+                for i, (prev, value) in enumerate(zip(self._last, row)):
+                    if math.isnan(prev) or math.isnan(value):
+                        continue
+                    items.append(self.canvas.create_line(
+                        x - STEP, self._y(i, prev), x, self._y(i, value),
+                        fill=self.series[i][2], tags='trend'))
+            self._segments.append(items)
+            self._last = list(row)
+        while len(self._segments) > POINTS:
+            for item in self._segments.popleft():
+                self.canvas.delete(item)
+
+    def redraw(self):
+        """Full redraw, only needed when the window is switched."""
+        self.canvas.delete('trend')
+        self._segments.clear()
+        self._last = None
+        decimator = self.decimators[self.window.get()]
+        rows = list(decimator.ring.rows())
+        # Lay the stored points out as if they had just been appended
+        self._append(rows)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Thread-safe, frame-batched Tk updates.
+
+Worker threads (the shared poller, command senders) submit snapshots by
+key; the Tk thread drains them once per frame, keeping only the latest
+snapshot per key. configure() skips Tk calls whose options have not
+changed since the last frame.
+"""
+import threading
+from collections import deque
+
+
+class UIDispatcher:
+    def __init__(self, root, interval_ms=100):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._handlers = {}
+        self._pending = {}
+        self._calls = deque()
+        self._options = {}
+        self._texts = {}
+        self.root.after(self.interval_ms, self._drain)
+
+    def register(self, key, handler):
+        self._handlers[key] = handler
+
+    def submit(self, key, *payload):
+        """Queue a snapshot for key from any thread; latest wins per frame."""
+        with self._lock:
+            self._pending[key] = payload
+
+    def call_soon(self, func, *args):
+        """Run func(*args) on the Tk thread at the next frame, in order."""
+        self._calls.append((func, args))
+
+    def configure(self, widget, **options):
+        last = self._options.setdefault(widget, {})
+        changed = {k: v for k, v in options.items() if last.get(k) != v}
+        if changed:
+            widget.config(**changed)
+            last.update(changed)
+
+    def replace_text(self, widget, text):
+        """Replace the contents of a Text widget only when they differ."""
+        if self._texts.get(widget) == text:
+            return
+        self._texts[widget] = text
+        widget.delete(1.0, 'end')
+        widget.insert(1.0, text)
+
+    def forget_text(self, widget):
+        self._texts.pop(widget, None)
+
+    def _drain(self):
+        if not self.root.winfo_exists():
+            return  # window closed; stop the frame loop
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for key, payload in pending.items():
+            handler = self._handlers.get(key)
+            if handler is None:
+                continue
+            try:
+                handler(*payload)
+            except Exception as e:
+                print(f"UI: {key} handler failed: {e}")
+        while self._calls:
+            func, args = self._calls.popleft()
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"UI: deferred call failed: {e}")
+        self.root.after(self.interval_ms, self._drain)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Per-panel view model: last rendered snapshot and cached field formatting.
+
+Panels call changed() first and return early when a poll delivers the same
+snapshot as last time; format() and derive() only recompute a field when
+its inputs differ, so a steady-state panel does almost no work per tick.
+Tk calls themselves are de-duplicated by UIDispatcher.configure().
+"""
+
+
+class ViewModel:
+    def __init__(self):
+        self._snapshot = None
+        self._formatted = {}
+        self._derived = {}
+
+    def changed(self, snapshot):
+        """True if snapshot differs from the last one rendered."""
+        if snapshot == self._snapshot:
+            return False
+        self._snapshot = snapshot
+        return True
+
+    def format(self, field, value, spec):
+        cached = self._formatted.get(field)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        text = spec.format(value)
+        self._formatted[field] = (value, text)
+        return text
+
+    def derive(self, name, func, *inputs):
+        """func(*inputs), recomputed only when the inputs change."""
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        result = func(*inputs)
+        self._derived[name] = (inputs, result)
+        return result
+
+    def reset(self):
+        """Force the next snapshot to render, e.g. after reconnecting."""
+        self._snapshot = None
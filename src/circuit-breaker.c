@@ -6,6 +6,7 @@
 #include "hal_thread.h"
 #include "iec61850_server.h"
 #include "static_model.h"
+#include "http_lite.h"
 #include <stdlib.h>
 #include <stdio.h>
 #include <signal.h>
@@ -23,7 +24,7 @@
 
 void publishBreakerStatus(bool is_state_change);
 
-static int running = 1;
+static volatile int running = 1;
 static bool breaker_open = false;
 static bool trip_received = false;
 static int server_fd = -1;
@@ -45,83 +46,118 @@ static struct {
     uint32_t sqNum;     // Sequence number - increments on retransmission
 } breaker_goose_state = {false, 1, 0};
 
-// Lightweight HTTP status server (port 8081)
-static void* http_status_thread(void* arg) {
-    int server_fd = socket(AF_INET, SOCK_STREAM, 0);
-    if (server_fd < 0) return NULL;
+// TX supervision, updated by publishBreakerStatus
+static uint32_t br_tx_count = 0;
+static uint64_t br_last_tx_ms = 0;
 
-    int opt = 1;
-    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
+// Ring of recent GOOSE events served by GET /events?since=N, so clients see
+// every burst and heartbeat instead of sampling the latest state.
+// Guarded by breaker_mutex.
+#define GOOSE_EVENT_RING 1024
+typedef struct {
+    uint64_t seq;
+    uint64_t ms;        // Hal_getTimeInMs() at receive/publish
+    uint32_t stNum;
+    uint32_t sqNum;
+    uint32_t ttl;
+    bool rx;            // received from the relay, else published by us
+    bool value;         // trip signal (rx) or breaker open (tx)
+} GooseEvent;
+static GooseEvent goose_events[GOOSE_EVENT_RING];
+static uint64_t goose_event_seq = 0;    // seq of the newest event, 0 = none
 
-    struct sockaddr_in address;
-    address.sin_family = AF_INET;
-    address.sin_addr.s_addr = INADDR_ANY;
-    address.sin_port = htons(8081);
+static void record_goose_event(bool rx, uint32_t stNum, uint32_t sqNum, uint32_t ttl, bool value) {
+    goose_event_seq++;
+    GooseEvent* e = &goose_events[goose_event_seq % GOOSE_EVENT_RING];
+    e->seq = goose_event_seq;
+    e->ms = Hal_getTimeInMs();
+    e->stNum = stNum;
+    e->sqNum = sqNum;
+    e->ttl = ttl;
+    e->rx = rx;
+    e->value = value;
+}
 
-    if (bind(server_fd, (struct sockaddr*)&address, sizeof(address)) < 0) {
-        close(server_fd);
-        return NULL;
+// {"next":N,"dropped":D,"more":bool,"events":[...]} for events after since.
+// Returns as many events as fit in body; clients repeat with since=next
+// while more is true. dropped counts events already overwritten in the ring.
+static void format_goose_events(uint64_t since, char* body, size_t len) {
+    pthread_mutex_lock(&breaker_mutex);
+    uint64_t oldest = goose_event_seq >= GOOSE_EVENT_RING ? goose_event_seq - GOOSE_EVENT_RING + 1 : 1;
+    uint64_t start = since + 1 < oldest ? oldest : since + 1;
+    uint64_t dropped = start - (since + 1);
+    if (since > goose_event_seq) {
+        // Cursor from before a restart: start over
+        start = oldest;
+        dropped = 0;
     }
-    listen(server_fd, 5);
-
-    while (running) {
-        struct sockaddr_in client;
-        socklen_t clen = sizeof(client);
-        int sock = accept(server_fd, (struct sockaddr*)&client, &clen);
-        if (sock < 0) continue;
-
-        char buffer[512] = {0};
-        recv(sock, buffer, sizeof(buffer) - 1, 0);
+    size_t pos = (size_t) snprintf(body, len, "{\"events\":[");
+    uint64_t next = start - 1;
+    for (uint64_t seq = start; seq <= goose_event_seq; seq++) {
+        const GooseEvent* e = &goose_events[seq % GOOSE_EVENT_RING];
+        char item[160];
+        int n = snprintf(item, sizeof(item),
+            "%s{\"seq\":%llu,\"ms\":%llu,\"dir\":\"%s\",\"stNum\":%u,\"sqNum\":%u,\"ttl\":%u,\"value\":%s}",
+            seq == start ? "" : ",", (unsigned long long) e->seq, (unsigned long long) e->ms,
+            e->rx ? "rx" : "tx", e->stNum, e->sqNum, e->ttl, e->value ? "true" : "false");
+        if (pos + (size_t) n + 96 >= len) break;  // keep room for the trailer
+        memcpy(body + pos, item, (size_t) n);
+        pos += (size_t) n;
+        next = seq;
+    }
+    snprintf(body + pos, len - pos, "],\"next\":%llu,\"dropped\":%llu,\"more\":%s}",
+             (unsigned long long) next, (unsigned long long) dropped,
+             next < goose_event_seq ? "true" : "false");
+    pthread_mutex_unlock(&breaker_mutex);
+}
 
-        char response[1024];
-        // Basic route handling
-        if (strstr(buffer, "POST /trip")) {
-            pthread_mutex_lock(&breaker_mutex);
-            breaker_open = true; trip_received = true;
-            pthread_mutex_unlock(&breaker_mutex);
-            publishBreakerStatus(true);
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n{\"status\":\"trip\"}");
-            send(sock, response, strlen(response), 0);
-        } else if (strstr(buffer, "POST /close")) {
-            pthread_mutex_lock(&breaker_mutex);
-            breaker_open = false; trip_received = false;
-            pthread_mutex_unlock(&breaker_mutex);
-            publishBreakerStatus(true);
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n{\"status\":\"close\"}");
-            send(sock, response, strlen(response), 0);
-        } else {
-            // Status JSON
-            pthread_mutex_lock(&breaker_mutex);
-            uint64_t now = Hal_getTimeInMs();
-            bool rx_ok = (last_goose_ms != 0) && ((now - last_goose_ms) < 5000);
-            static uint32_t br_tx_count = 0; // total publishes
-            static uint64_t br_last_tx_ms = 0;
-            // Note: updated in publishBreakerStatus via externs below
-            const char* json_fmt =
-                "{\"stNum\":%u,\"sqNum\":%u,\"messageCount\":%u,\"lastTime\":\"%s\",\"breakerOpen\":%s,\"position\":\"%s\",\"tripReceived\":%s,\"rxOk\":%s,\"lastRxMs\":%llu,\"txCount\":%u,\"lastTxMs\":%llu,\"txOk\":%s}";
-            char body[512];
-            snprintf(body, sizeof(body), json_fmt,
-                     last_stnum, last_sqnum, goose_msg_count, last_goose_time,
-                     breaker_open ? "true" : "false",
-                     breaker_open ? "OPEN" : "CLOSED",
-                     trip_received ? "true" : "false",
-                     rx_ok ? "true" : "false",
-                     (unsigned long long) last_goose_ms,
-                     br_tx_count,
-                     (unsigned long long) br_last_tx_ms,
-                     ((br_last_tx_ms != 0) && ((now - br_last_tx_ms) < 5000)) ? "true" : "false");
-            pthread_mutex_unlock(&breaker_mutex);
-            snprintf(response, sizeof(response),
-                     "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n%s",
-                     body);
-            send(sock, response, strlen(response), 0);
-        }
-        close(sock);
+// Request handler for the breaker HTTP status server (port 8081)
+static int breaker_http_handler(const HttpLiteRequest* req, char* body, size_t len) {
+    bool is_post = (strcmp(req->method, "POST") == 0);
+    // Basic route handling
+    if (is_post && strcmp(req->path, "/trip") == 0) {
+        pthread_mutex_lock(&breaker_mutex);
+        breaker_open = true; trip_received = true;
+        pthread_mutex_unlock(&breaker_mutex);
+        publishBreakerStatus(true);
+        snprintf(body, len, "{\"status\":\"trip\"}");
+    } else if (is_post && strcmp(req->path, "/close") == 0) {
+        pthread_mutex_lock(&breaker_mutex);
+        breaker_open = false; trip_received = false;
+        pthread_mutex_unlock(&breaker_mutex);
+        publishBreakerStatus(true);
+        snprintf(body, len, "{\"status\":\"close\"}");
+    } else if (strcmp(req->path, "/events") == 0) {
+        const char* since = strstr(req->query, "since=");
+        format_goose_events(since ? strtoull(since + 6, NULL, 10) : 0, body, len);
+    } else {
+        // Status JSON
+        pthread_mutex_lock(&breaker_mutex);
+        uint64_t now = Hal_getTimeInMs();
+        bool rx_ok = (last_goose_ms != 0) && ((now - last_goose_ms) < 5000);
+        const char* json_fmt =
+            "{\"stNum\":%u,\"sqNum\":%u,\"messageCount\":%u,\"lastTime\":\"%s\",\"breakerOpen\":%s,\"position\":\"%s\",\"tripReceived\":%s,\"rxOk\":%s,\"lastRxMs\":%llu,\"txCount\":%u,\"lastTxMs\":%llu,\"txOk\":%s,\"eventSeq\":%llu}";
+        snprintf(body, len, json_fmt,
+                 last_stnum, last_sqnum, goose_msg_count, last_goose_time,
+                 breaker_open ? "true" : "false",
+                 breaker_open ? "OPEN" : "CLOSED",
+                 trip_received ? "true" : "false",
+                 rx_ok ? "true" : "false",
+                 (unsigned long long) last_goose_ms,
+                 br_tx_count,
+                 (unsigned long long) br_last_tx_ms,
+                 ((br_last_tx_ms != 0) && ((now - br_last_tx_ms) < 5000)) ? "true" : "false",
+                 (unsigned long long) goose_event_seq);
+        pthread_mutex_unlock(&breaker_mutex);
     }
+    return 200;
+}
 
-    close(server_fd);
+// Lightweight keep-alive HTTP status server (port 8081)
+static void* http_status_thread(void* arg) {
+    if (http_lite_serve(8081, 16, breaker_http_handler, &running) < 0) {
+        printf("❌ Breaker HTTP status server failed to bind port 8081\n");
+    }
     return NULL;
 }
 
@@ -171,6 +207,8 @@ void publishBreakerStatus(bool is_state_change) {
         uint64_t newStNum = GoosePublisher_increaseStNum(statusPublisher);
         printf(">>> BREAKER STATE CHANGE: stNum incremented to %lu\n", newStNum);
         fflush(stdout);
+        breaker_goose_state.stNum = (uint32_t) newStNum;
+        breaker_goose_state.sqNum = 0;
     } else {
         printf(">>> BREAKER HEARTBEAT: sqNum auto-incremented\n");
         fflush(stdout);
@@ -184,11 +222,13 @@ void publishBreakerStatus(bool is_state_change) {
         // IEC 61850-8-1: GOOSE burst - multiple rapid publishes
         for (int i = 0; i < 4; i++) {
             GoosePublisher_publish(statusPublisher, dataSetValues);
+            record_goose_event(false, breaker_goose_state.stNum, breaker_goose_state.sqNum++, 5000, breaker_open);
             printf(">>> GOOSE BURST %d/4: %s\n", i+1, breaker_open ? "OPEN" : "CLOSED");
             if (i < 3) Thread_sleep(4); // 4ms delay
         }
     } else {
         GoosePublisher_publish(statusPublisher, dataSetValues);
+        record_goose_event(false, breaker_goose_state.stNum, breaker_goose_state.sqNum++, 5000, breaker_open);
         printf(">>> GOOSE HEARTBEAT: %s\n", breaker_open ? "OPEN" : "CLOSED");
     }
     
@@ -205,18 +245,9 @@ void publishBreakerStatus(bool is_state_change) {
         IedServer_updateUTCTimeAttributeValue(iedServer, IEDMODEL_GenericIO_XCBR1_Pos_t, Hal_getTimeInMs());
         IedServer_unlockDataModel(iedServer);
     }
-    // Update local TX supervision counters
-    static uint32_t* p_tx_count = NULL;
-    static uint64_t* p_last_tx_ms = NULL;
-    // initialize static pointers to ensure single storage
-    if (p_tx_count == NULL) {
-        static uint32_t tx_count_storage = 0; p_tx_count = &tx_count_storage;
-    }
-    if (p_last_tx_ms == NULL) {
-        static uint64_t last_tx_ms_storage = 0; p_last_tx_ms = &last_tx_ms_storage;
-    }
-    (*p_tx_count)++;
-    (*p_last_tx_ms) = Hal_getTimeInMs();
+    // Update local TX supervision counters (served as txCount/lastTxMs)
+    br_tx_count++;
+    br_last_tx_ms = Hal_getTimeInMs();
     pthread_mutex_unlock(&breaker_mutex);
 }
 
@@ -246,6 +277,10 @@ static void gooseListener(GooseSubscriber subscriber, void* parameter) {
         printf("*** SEQUENCE CHANGE *** (SqNum: %u -> %u)\n", lastSqNum, sqNum);
     }
     
+    MmsValue* values = GooseSubscriber_getDataSetValues(subscriber);
+    MmsValue* first = (values && MmsValue_getArraySize(values) >= 1) ? MmsValue_getElement(values, 0) : NULL;
+    bool trip_value = first && MmsValue_getType(first) == MMS_BOOLEAN && MmsValue_getBoolean(first);
+    
     // Update global tracking variables
     pthread_mutex_lock(&breaker_mutex);
     last_stnum = stNum;
@@ -253,6 +288,7 @@ static void gooseListener(GooseSubscriber subscriber, void* parameter) {
     goose_msg_count++;
     // Update RX supervision timestamp on every message
     last_goose_ms = Hal_getTimeInMs();
+    record_goose_event(true, stNum, sqNum, GooseSubscriber_getTimeAllowedToLive(subscriber), trip_value);
     
     // Update timestamp
     time_t now = time(NULL);
@@ -263,8 +299,6 @@ static void gooseListener(GooseSubscriber subscriber, void* parameter) {
     lastStNum = stNum;
     lastSqNum = sqNum;
     
-    MmsValue* values = GooseSubscriber_getDataSetValues(subscriber);
-    
     if (values && MmsValue_getArraySize(values) >= 4) {
         // Parse GOOSE dataset
         MmsValue* tripSignal = MmsValue_getElement(values, 0);      // SPCSO1 - Trip Command
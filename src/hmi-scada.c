@@ -11,7 +11,13 @@
 #include <arpa/inet.h>
 #include <pthread.h>
 
-static int running = 1;
+// Every panel, the fleet view and server.js hold a keep-alive connection here
+#define HTTP_LITE_MAX_CLIENTS 128
+#include "http_lite.h"
+
+#define HMI_HTTP_WORKERS 4
+
+static volatile int running = 1;
 
 void sigint_handler(int signalId) {
     running = 0;
@@ -27,243 +33,347 @@ typedef struct {
     bool faultDetected;
     bool overcurrentPickup;
     char lastAlarm[128];
-    bool gooseRxOk; // from breaker supervision
 } HMIData;
 
 static HMIData hmiData = {0};
+// Guards hmiData, the SOE ring and the hop timings, shared with the HTTP workers
+static pthread_mutex_t hmi_mutex = PTHREAD_MUTEX_INITIALIZER;
 
 // Global connection for HTTP commands
 static IedConnection global_con = NULL;
 static bool reportingEnabled = false; // URCB state
 
+#define MMS_REQUEST_TIMEOUT_MS 2000
+#define BREAKER_RECONNECT_MS   2000
+
+// Persistent breaker connection, shared by the polling loop and HTTP workers
+static IedConnection breaker_con = NULL;
+static pthread_mutex_t breaker_mutex = PTHREAD_MUTEX_INITIALIZER;
+static double breaker_last_attempt = 0;
+static uint32_t breaker_connects = 0;
+
+// Per-hop MMS timing reported on /diagnostics. Guarded by hmi_mutex.
+typedef struct {
+    double last_ms;
+    double avg_ms;      // exponentially weighted
+    double max_ms;
+    uint32_t count;
+    uint32_t errors;
+} HopTiming;
+
+static HopTiming hop_relay_read;    // batched relay measurement/status read
+static HopTiming hop_breaker_read;  // breaker position read
+static HopTiming hop_cycle;         // whole polling cycle
+
+static double mono_ms(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000.0 + ts.tv_nsec / 1e6;
+}
+
+static void hop_record(HopTiming* hop, double ms, bool ok) {
+    pthread_mutex_lock(&hmi_mutex);
+    hop->last_ms = ms;
+    hop->avg_ms = hop->count ? hop->avg_ms + 0.2 * (ms - hop->avg_ms) : ms;
+    if (ms > hop->max_ms) hop->max_ms = ms;
+    hop->count++;
+    if (!ok) hop->errors++;
+    pthread_mutex_unlock(&hmi_mutex);
+}
+
 // Simple SOE ring buffer
 #define SOE_MAX 64
 static char soe[SOE_MAX][160];
 static int soe_head = 0;
 static void soe_add(const char* msg) {
     time_t now = time(NULL);
-    struct tm* tm_info = localtime(&now);
+    struct tm tm_info;
+    localtime_r(&now, &tm_info);
     char ts[16];
-    strftime(ts, sizeof(ts), "%H:%M:%S", tm_info);
+    strftime(ts, sizeof(ts), "%H:%M:%S", &tm_info);
+    pthread_mutex_lock(&hmi_mutex);
     snprintf(soe[soe_head], sizeof(soe[soe_head]), "%s %s", ts, msg);
     soe_head = (soe_head + 1) % SOE_MAX;
+    pthread_mutex_unlock(&hmi_mutex);
 }
 
-void* http_server_thread(void* arg) {
-    int server_fd, new_socket;
-    struct sockaddr_in address;
-    int opt = 1;
-    int addrlen = sizeof(address);
-    
-    if ((server_fd = socket(AF_INET, SOCK_STREAM, 0)) == 0) {
+static void set_breaker_status(bool open) {
+    pthread_mutex_lock(&hmi_mutex);
+    hmiData.breakerStatus = open;
+    pthread_mutex_unlock(&hmi_mutex);
+}
+
+static void set_last_alarm(const char* msg) {
+    pthread_mutex_lock(&hmi_mutex);
+    snprintf(hmiData.lastAlarm, sizeof(hmiData.lastAlarm), "%s", msg);
+    pthread_mutex_unlock(&hmi_mutex);
+}
+
+// Operates CSWI1 on the relay over the shared MMS connection.
+static void relay_operate(bool value, const char* alarm) {
+    if (!global_con) return;
+    ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", global_con);
+    if (control) {
+        MmsValue* ctlVal = MmsValue_newBoolean(value);
+        ControlObjectClient_operate(control, ctlVal, 0);
+        MmsValue_delete(ctlVal);
+        ControlObjectClient_destroy(control);
+        if (alarm) set_last_alarm(alarm);
+    }
+}
+
+static IedConnection connect_breaker(IedClientError* error) {
+    IedConnection breakerCon = IedConnection_create();
+    const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
+    int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
+    IedConnection_setRequestTimeout(breakerCon, MMS_REQUEST_TIMEOUT_MS);
+    IedConnection_connect(breakerCon, error, brHost, brPort);
+    return breakerCon;
+}
+
+// Returns the persistent breaker connection, reconnecting at most every
+// BREAKER_RECONNECT_MS, or NULL while the breaker is unreachable.
+// Call with breaker_mutex held.
+static IedConnection breaker_connection(void) {
+    if (breaker_con && IedConnection_getState(breaker_con) == IED_STATE_CONNECTED) return breaker_con;
+    if (breaker_con) {
+        IedConnection_destroy(breaker_con);
+        breaker_con = NULL;
+    }
+    double now = mono_ms();
+    if (breaker_last_attempt > 0 && now - breaker_last_attempt < BREAKER_RECONNECT_MS) return NULL;
+    breaker_last_attempt = now;
+    IedClientError error;
+    IedConnection con = connect_breaker(&error);
+    if (error != IED_ERROR_OK) {
+        IedConnection_destroy(con);
         return NULL;
     }
-    
-    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
-    
-    address.sin_family = AF_INET;
-    address.sin_addr.s_addr = INADDR_ANY;
-    address.sin_port = htons(8080);
-    
-    bind(server_fd, (struct sockaddr *)&address, sizeof(address));
-    listen(server_fd, 3);
-    
-    printf("✅ HMI HTTP API server listening on port 8080\n");
-    
-    while (running) {
-        if ((new_socket = accept(server_fd, (struct sockaddr *)&address, (socklen_t*)&addrlen)) < 0) {
-            continue;
-        }
-        
-        char buffer[1024] = {0};
-        recv(new_socket, buffer, 1023, 0);
-        
-        char response[1024];
-        
-        if (strstr(buffer, "GET /soe")) {
-            // Return SOE as JSON array
-            char body[4096];
-            int pos = 0;
-            pos += snprintf(body + pos, sizeof(body) - pos, "[");
-            for (int i = 0; i < SOE_MAX; i++) {
-                int idx = (soe_head + i) % SOE_MAX;
-                if (soe[idx][0] == '\0') continue;
-                if (pos < (int)sizeof(body) - 1 && body[0] != '[') {}
-                if (pos > 1) pos += snprintf(body + pos, sizeof(body) - pos, ",");
-                pos += snprintf(body + pos, sizeof(body) - pos, "\"%s\"", soe[idx]);
-            }
-            pos += snprintf(body + pos, sizeof(body) - pos, "]");
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "%s", body);
-        } else if (strstr(buffer, "POST /trip")) {
-            printf("\n>>> MMS CONTROL: Manual Trip Command <<<\n");
-            if (global_con) {
-                IedClientError error;
-                ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", global_con);
-                if (control) {
-                    MmsValue* ctlVal = MmsValue_newBoolean(true);
-                    ControlObjectClient_operate(control, ctlVal, 0);
-                    MmsValue_delete(ctlVal);
-                    ControlObjectClient_destroy(control);
-                    strcpy(hmiData.lastAlarm, "Manual Trip Issued via MMS");
-                }
-            }
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"status\":\"trip_sent\"}");
-        } else if (strstr(buffer, "POST /close")) {
-            printf("\n>>> MMS CONTROL: Breaker Close Command <<<\n");
-            IedConnection breakerCon = IedConnection_create();
-            IedClientError breakerError;
-            const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
-            int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
-            IedConnection_connect(breakerCon, &breakerError, brHost, brPort);
-            
-            if (breakerError == IED_ERROR_OK) {
-                ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", breakerCon);
-                if (control) {
-                    MmsValue* ctlVal = MmsValue_newBoolean(false);
-                    ControlObjectClient_operate(control, ctlVal, 0);
-                    MmsValue_delete(ctlVal);
-                    ControlObjectClient_destroy(control);
-                    strcpy(hmiData.lastAlarm, "Breaker Close via MMS");
-                }
-                IedConnection_close(breakerCon);
-            }
-            IedConnection_destroy(breakerCon);
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"status\":\"close_sent\"}");
-        } else if (strstr(buffer, "POST /open")) {
-            printf("\n>>> MMS CONTROL: Breaker Open Command <<<\n");
-            IedConnection breakerCon = IedConnection_create();
-            IedClientError breakerError;
-            const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
-            int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
-            IedConnection_connect(breakerCon, &breakerError, brHost, brPort);
-            
-            if (breakerError == IED_ERROR_OK) {
-                ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", breakerCon);
-                if (control) {
-                    MmsValue* ctlVal = MmsValue_newBoolean(true);
-                    ControlObjectClient_operate(control, ctlVal, 0);
-                    MmsValue_delete(ctlVal);
-                    ControlObjectClient_destroy(control);
-                    strcpy(hmiData.lastAlarm, "Breaker Open via MMS");
-                }
-                IedConnection_close(breakerCon);
-            }
-            IedConnection_destroy(breakerCon);
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"status\":\"open_sent\"}");
-        } else if (strstr(buffer, "POST /reset")) {
-            printf("\n>>> MMS CONTROL: Protection Reset Command <<<\n");
-            if (global_con) {
-                // Reset trip command
-                ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", global_con);
-                if (control) {
-                    MmsValue* ctlVal = MmsValue_newBoolean(false);
-                    ControlObjectClient_operate(control, ctlVal, 0);
-                    MmsValue_delete(ctlVal);
-                    ControlObjectClient_destroy(control);
-                }
-                strcpy(hmiData.lastAlarm, "Protection Reset via MMS");
-            }
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"status\":\"reset_sent\"}");
-        } else if (strstr(buffer, "GET /diagnostics")) {
-            printf("\n>>> MMS DIAGNOSTICS: System Status Check <<<\n");
-            
-            // Test protection relay connection
-            char protectionStatus[32] = "OFFLINE";
-            if (global_con) {
-                IedClientError testError;
-                MmsValue* testRead = IedConnection_readObject(global_con, &testError, REF_MMXU_VOLT, IEC61850_FC_MX);
-                if (testRead && testError == IED_ERROR_OK) {
-                    strcpy(protectionStatus, "ONLINE");
-                    MmsValue_delete(testRead);
-                }
-            }
-            
-            // Test circuit breaker connection
-            char breakerStatus[32] = "OFFLINE";
-            int gooseCount = 0;
-            IedConnection testBreaker = IedConnection_create();
-            IedClientError breakerError;
-            const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
-            int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
-            IedConnection_connect(testBreaker, &breakerError, brHost, brPort);
-            if (breakerError == IED_ERROR_OK) {
-                strcpy(breakerStatus, "ONLINE");
-                // Read breaker position via MMS
-                MmsValue* breakerPos = IedConnection_readObject(testBreaker, &breakerError, REF_XCBR_POS, IEC61850_FC_ST);
-                if (breakerPos) {
-                    bool open = false;
-                    if (MmsValue_getType(breakerPos) == MMS_INTEGER) {
-                        int32_t dp = MmsValue_toInt32(breakerPos);
-                        // Dbpos: DBPOS_OFF(1)=OPEN, DBPOS_ON(2)=CLOSED
-                        open = (dp == 1);
-                    } else if (MmsValue_getType(breakerPos) == MMS_BOOLEAN) {
-                        open = MmsValue_getBoolean(breakerPos);
-                    }
-                    hmiData.breakerStatus = open;
-                    MmsValue_delete(breakerPos);
-                }
-                // GOOSE supervision is now tracked internally by breaker and via HTTP; skip MMS read here.
-                IedConnection_close(testBreaker);
+    breaker_connects++;
+    breaker_con = con;
+    return con;
+}
+
+// Drops the breaker connection after a failed request so the next call
+// reconnects instead of waiting on a half-dead association.
+// Call with breaker_mutex held.
+static void breaker_check_error(IedClientError error) {
+    if (error == IED_ERROR_OK || !breaker_con) return;
+    IedConnection_close(breaker_con);
+    IedConnection_destroy(breaker_con);
+    breaker_con = NULL;
+}
+
+// Reads XCBR1.Pos over the persistent connection (true = open).
+static bool breaker_read_position(bool* open) {
+    double start = mono_ms();
+    bool ok = false;
+    pthread_mutex_lock(&breaker_mutex);
+    IedConnection con = breaker_connection();
+    if (con) {
+        IedClientError error;
+        MmsValue* breakerSt = IedConnection_readObject(con, &error, REF_XCBR_POS, IEC61850_FC_ST);
+        if (breakerSt && error == IED_ERROR_OK) {
+            if (MmsValue_getType(breakerSt) == MMS_INTEGER) {
+                // Dbpos: DBPOS_OFF(1)=OPEN, DBPOS_ON(2)=CLOSED
+                *open = (MmsValue_toInt32(breakerSt) == 1);
+                ok = true;
+            } else if (MmsValue_getType(breakerSt) == MMS_BOOLEAN) {
+                *open = MmsValue_getBoolean(breakerSt);
+                ok = true;
             }
-            IedConnection_destroy(testBreaker);
-            
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"protectionRelay\":\"%s\",\"circuitBreaker\":\"%s\",\"gooseCount\":%d,\"gooseRxOk\":%s,\"reportsEnabled\":%s}",
-                protectionStatus, breakerStatus, gooseCount,
-                hmiData.gooseRxOk ? "true" : "false",
-                reportingEnabled ? "true" : "false");
+        }
+        if (breakerSt) MmsValue_delete(breakerSt);
+        breaker_check_error(error);
+    }
+    pthread_mutex_unlock(&breaker_mutex);
+    hop_record(&hop_breaker_read, mono_ms() - start, ok);
+    return ok;
+}
+
+// Operates CSWI1 on the breaker over the persistent connection (true = open).
+static bool breaker_operate(bool open, const char* alarm) {
+    bool ok = false;
+    pthread_mutex_lock(&breaker_mutex);
+    IedConnection con = breaker_connection();
+    if (con) {
+        ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", con);
+        if (control) {
+            MmsValue* ctlVal = MmsValue_newBoolean(open);
+            ok = ControlObjectClient_operate(control, ctlVal, 0);
+            MmsValue_delete(ctlVal);
+            ControlObjectClient_destroy(control);
+            set_last_alarm(alarm);
         } else {
-            // GET request - return status data
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
-                "\r\n"
-                "{\"voltage\":%.1f,\"current\":%.0f,\"frequency\":%.3f,\"faultCurrent\":%.0f,"
-                "\"tripCommand\":%s,\"breakerStatus\":%s,\"faultDetected\":%s,\"overcurrentPickup\":%s,"
-                "\"lastAlarm\":\"%s\",\"gooseData\":{\"messageCount\":0}}",
-                hmiData.voltage, hmiData.current, hmiData.frequency, hmiData.faultCurrent,
-                hmiData.tripCommand ? "true" : "false",
-                hmiData.breakerStatus ? "true" : "false",
-                hmiData.faultDetected ? "true" : "false",
-                hmiData.overcurrentPickup ? "true" : "false",
-                hmiData.lastAlarm);
+            // Creating the control object reads its model; a failure usually means a dead link
+            breaker_check_error(IED_ERROR_CONNECTION_LOST);
         }
-        
-        send(new_socket, response, strlen(response), 0);
-        close(new_socket);
     }
-    
-    close(server_fd);
+    pthread_mutex_unlock(&breaker_mutex);
+    return ok;
+}
+
+// One batched MMS read of every relay value the cycle polls. Digital status
+// also arrives through the EventsRCB reports; reading it here keeps the
+// values fresh if reporting could not be enabled.
+static const char* relay_items[] = {MMS_MMXU_VOLT, MMS_MMXU_CURR, MMS_MMXU_FREQ, MMS_PTOC_OP, MMS_PTOC_STR};
+#define RELAY_ITEM_COUNT ((int) (sizeof(relay_items) / sizeof(relay_items[0])))
+
+static bool relay_read_values(IedConnection con) {
+    double start = mono_ms();
+    LinkedList items = LinkedList_create();
+    for (int i = 0; i < RELAY_ITEM_COUNT; i++) LinkedList_add(items, (void*) relay_items[i]);
+    MmsError mmsError = MMS_ERROR_NONE;
+    MmsValue* values = MmsConnection_readMultipleVariables(IedConnection_getMmsConnection(con),
+                                                            &mmsError, MMS_DOMAIN, items);
+    LinkedList_destroyStatic(items);
+    bool ok = values && mmsError == MMS_ERROR_NONE && MmsValue_getArraySize(values) == RELAY_ITEM_COUNT;
+    if (ok) {
+        MmsValue* v[RELAY_ITEM_COUNT];
+        for (int i = 0; i < RELAY_ITEM_COUNT; i++) v[i] = MmsValue_getElement(values, i);
+        pthread_mutex_lock(&hmi_mutex);
+        if (MmsValue_getType(v[0]) == MMS_FLOAT) hmiData.voltage = MmsValue_toFloat(v[0]);
+        if (MmsValue_getType(v[1]) == MMS_FLOAT) {
+            hmiData.current = MmsValue_toFloat(v[1]);
+            // The relay model has no separate fault current; it is the measured current
+            hmiData.faultCurrent = hmiData.current;
+        }
+        if (MmsValue_getType(v[2]) == MMS_FLOAT) hmiData.frequency = MmsValue_toFloat(v[2]);
+        if (MmsValue_getType(v[3]) == MMS_BOOLEAN) hmiData.faultDetected = MmsValue_getBoolean(v[3]);
+        if (MmsValue_getType(v[4]) == MMS_BOOLEAN) hmiData.overcurrentPickup = MmsValue_getBoolean(v[4]);
+        pthread_mutex_unlock(&hmi_mutex);
+    }
+    if (values) MmsValue_delete(values);
+    hop_record(&hop_relay_read, mono_ms() - start, ok);
+    return ok;
+}
+
+static void format_soe(char* body, size_t len) {
+    size_t pos = 0;
+    pos += snprintf(body + pos, len - pos, "[");
+    pthread_mutex_lock(&hmi_mutex);
+    for (int i = 0; i < SOE_MAX; i++) {
+        int idx = (soe_head + i) % SOE_MAX;
+        if (soe[idx][0] == '\0') continue;
+        // Keep room for the separator, quotes and closing bracket
+        if (pos + strlen(soe[idx]) + 4 >= len) break;
+        pos += snprintf(body + pos, len - pos, "%s\"%s\"", pos > 1 ? "," : "", soe[idx]);
+    }
+    pthread_mutex_unlock(&hmi_mutex);
+    snprintf(body + pos, len - pos, "]");
+}
+
+static int format_hop(char* out, size_t len, const char* name, const HopTiming* hop) {
+    return snprintf(out, len,
+        "\"%s\":{\"lastMs\":%.2f,\"avgMs\":%.2f,\"maxMs\":%.2f,\"count\":%u,\"errors\":%u}",
+        name, hop->last_ms, hop->avg_ms, hop->max_ms, hop->count, hop->errors);
+}
+
+static void format_diagnostics(char* body, size_t len) {
+    printf("\n>>> MMS DIAGNOSTICS: System Status Check <<<\n");
+
+    // Test protection relay connection
+    char protectionStatus[32] = "OFFLINE";
+    double start = mono_ms();
+    if (global_con) {
+        IedClientError testError;
+        MmsValue* testRead = IedConnection_readObject(global_con, &testError, REF_MMXU_VOLT, IEC61850_FC_MX);
+        if (testRead && testError == IED_ERROR_OK) {
+            strcpy(protectionStatus, "ONLINE");
+        }
+        if (testRead) MmsValue_delete(testRead);
+    }
+    double relayProbeMs = mono_ms() - start;
+
+    // Test circuit breaker connection, reading its position via MMS
+    char breakerStatus[32] = "OFFLINE";
+    int gooseCount = 0;
+    bool open = false;
+    start = mono_ms();
+    if (breaker_read_position(&open)) {
+        strcpy(breakerStatus, "ONLINE");
+        set_breaker_status(open);
+    }
+    // GOOSE supervision (rxOk) is reported by the breaker's own HTTP status, not here
+    double breakerProbeMs = mono_ms() - start;
+
+    int pos = snprintf(body, len,
+        "{\"protectionRelay\":\"%s\",\"circuitBreaker\":\"%s\",\"gooseCount\":%d,\"reportsEnabled\":%s,"
+        "\"relayProbeMs\":%.2f,\"breakerProbeMs\":%.2f,\"breakerConnects\":%u,\"hops\":{",
+        protectionStatus, breakerStatus, gooseCount,
+        reportingEnabled ? "true" : "false",
+        relayProbeMs, breakerProbeMs, breaker_connects);
+    pthread_mutex_lock(&hmi_mutex);
+    pos += format_hop(body + pos, len - pos, "relayRead", &hop_relay_read);
+    pos += snprintf(body + pos, len - pos, ",");
+    pos += format_hop(body + pos, len - pos, "breakerRead", &hop_breaker_read);
+    pos += snprintf(body + pos, len - pos, ",");
+    pos += format_hop(body + pos, len - pos, "cycle", &hop_cycle);
+    pthread_mutex_unlock(&hmi_mutex);
+    snprintf(body + pos, len - pos, "}}");
+}
+
+static void format_status(char* body, size_t len) {
+    pthread_mutex_lock(&hmi_mutex);
+    snprintf(body, len,
+        "{\"voltage\":%.1f,\"current\":%.0f,\"frequency\":%.3f,\"faultCurrent\":%.0f,"
+        "\"tripCommand\":%s,\"breakerStatus\":%s,\"faultDetected\":%s,\"overcurrentPickup\":%s,"
+        "\"lastAlarm\":\"%s\",\"gooseData\":{\"messageCount\":0}}",
+        hmiData.voltage, hmiData.current, hmiData.frequency, hmiData.faultCurrent,
+        hmiData.tripCommand ? "true" : "false",
+        hmiData.breakerStatus ? "true" : "false",
+        hmiData.faultDetected ? "true" : "false",
+        hmiData.overcurrentPickup ? "true" : "false",
+        hmiData.lastAlarm);
+    pthread_mutex_unlock(&hmi_mutex);
+}
+
+// Request handler for the HMI HTTP API (port 8080). Runs on the poll thread
+// for status/SOE reads and on a pool worker for MMS actions, see hmi_http_defer.
+static int hmi_http_handler(const HttpLiteRequest* req, char* body, size_t len) {
+    bool is_post = (strcmp(req->method, "POST") == 0);
+    if (is_post && strcmp(req->path, "/trip") == 0) {
+        printf("\n>>> MMS CONTROL: Manual Trip Command <<<\n");
+        relay_operate(true, "Manual Trip Issued via MMS");
+        snprintf(body, len, "{\"status\":\"trip_sent\"}");
+    } else if (is_post && strcmp(req->path, "/close") == 0) {
+        printf("\n>>> MMS CONTROL: Breaker Close Command <<<\n");
+        breaker_operate(false, "Breaker Close via MMS");
+        snprintf(body, len, "{\"status\":\"close_sent\"}");
+    } else if (is_post && strcmp(req->path, "/open") == 0) {
+        printf("\n>>> MMS CONTROL: Breaker Open Command <<<\n");
+        breaker_operate(true, "Breaker Open via MMS");
+        snprintf(body, len, "{\"status\":\"open_sent\"}");
+    } else if (is_post && strcmp(req->path, "/reset") == 0) {
+        printf("\n>>> MMS CONTROL: Protection Reset Command <<<\n");
+        // Reset trip command
+        relay_operate(false, NULL);
+        if (global_con) set_last_alarm("Protection Reset via MMS");
+        snprintf(body, len, "{\"status\":\"reset_sent\"}");
+    } else if (strcmp(req->path, "/soe") == 0) {
+        format_soe(body, len);
+    } else if (strcmp(req->path, "/diagnostics") == 0) {
+        format_diagnostics(body, len);
+    } else {
+        // Any other GET - return status data
+        format_status(body, len);
+    }
+    return 200;
+}
+
+// MMS round trips (controls, diagnostics) can take seconds when an IED is
+// slow or down; run them on the worker pool so status polls are not queued
+// behind them.
+static bool hmi_http_defer(const HttpLiteRequest* req) {
+    return strcmp(req->method, "POST") == 0 || strcmp(req->path, "/diagnostics") == 0;
+}
+
+// Keep-alive HTTP API server (port 8080) for the Tkinter panels and web UI
+void* http_server_thread(void* arg) {
+    printf("✅ HMI HTTP API server listening on port 8080\n");
+    if (http_lite_serve_pool(8080, 64, hmi_http_handler, hmi_http_defer, HMI_HTTP_WORKERS, &running) < 0) {
+        printf("❌ HMI HTTP API server failed to bind port 8080\n");
+    }
     return NULL;
 }
 
@@ -276,27 +386,19 @@ void reportCallbackFunction(void* parameter, ClientReport report) {
         int count = MmsValue_getArraySize(dataSetValues);
         printf("Real-time data updated via MMS reporting (items=%d)\n", count);
         // Expect DataSet LLN0$Events (4 booleans: SPCSO1..4 stVal)
-        if (count >= 1) {
-            MmsValue* v0 = MmsValue_getElement(dataSetValues, 0);
-            if (v0 && MmsValue_getType(v0) == MMS_BOOLEAN) hmiData.tripCommand = MmsValue_getBoolean(v0);
-        }
-        if (count >= 2) {
-            MmsValue* v1 = MmsValue_getElement(dataSetValues, 1);
-            if (v1 && MmsValue_getType(v1) == MMS_BOOLEAN) hmiData.breakerStatus = MmsValue_getBoolean(v1);
-        }
-        if (count >= 3) {
-            MmsValue* v2 = MmsValue_getElement(dataSetValues, 2);
-            if (v2 && MmsValue_getType(v2) == MMS_BOOLEAN) hmiData.faultDetected = MmsValue_getBoolean(v2);
-        }
-        if (count >= 4) {
-            MmsValue* v3 = MmsValue_getElement(dataSetValues, 3);
-            if (v3 && MmsValue_getType(v3) == MMS_BOOLEAN) hmiData.overcurrentPickup = MmsValue_getBoolean(v3);
+        bool* fields[] = {&hmiData.tripCommand, &hmiData.breakerStatus,
+                          &hmiData.faultDetected, &hmiData.overcurrentPickup};
+        pthread_mutex_lock(&hmi_mutex);
+        for (int i = 0; i < count && i < 4; i++) {
+            MmsValue* v = MmsValue_getElement(dataSetValues, i);
+            if (v && MmsValue_getType(v) == MMS_BOOLEAN) *fields[i] = MmsValue_getBoolean(v);
         }
+        pthread_mutex_unlock(&hmi_mutex);
     }
     printf("==========================\n");
 }
 
-void displayHMIScreen() {
+void displayHMIScreen(const HMIData* d) {
     printf("\033[2J\033[H"); // Clear screen
     printf("╔══════════════════════════════════════════════════════════════╗\n");
     printf("║                    HMI/SCADA SYSTEM                         ║\n");
@@ -305,40 +407,40 @@ void displayHMIScreen() {
     printf("║ Station: MAIN_SS_132kV | Bay: LINE_01 | MMS Port: 102       ║\n");
     printf("╠══════════════════════════════════════════════════════════════╣\n");
     printf("║ REAL-TIME MEASUREMENTS (via MMS)                            ║\n");
-    printf("║   Voltage L1    : %6.1f kV                                ║\n", hmiData.voltage);
-    printf("║   Current L1    : %6.0f A                                 ║\n", hmiData.current);
-    printf("║   Frequency     : %6.3f Hz                                ║\n", hmiData.frequency);
-    printf("║   Fault Current : %6.0f A                                 ║\n", hmiData.faultCurrent);
+    printf("║   Voltage L1    : %6.1f kV                                ║\n", d->voltage);
+    printf("║   Current L1    : %6.0f A                                 ║\n", d->current);
+    printf("║   Frequency     : %6.3f Hz                                ║\n", d->frequency);
+    printf("║   Fault Current : %6.0f A                                 ║\n", d->faultCurrent);
     printf("╠══════════════════════════════════════════════════════════════╣\n");
     printf("║ PROTECTION STATUS (via MMS Data Objects)                    ║\n");
-    printf("║   Trip Command  : %-8s                                   ║\n", hmiData.tripCommand ? "ACTIVE" : "Normal");
-    printf("║   Breaker       : %-8s                                   ║\n", hmiData.breakerStatus ? "OPEN" : "CLOSED");
-    printf("║   Fault Status  : %-8s                                   ║\n", hmiData.faultDetected ? "FAULT" : "Normal");
-    printf("║   O/C Pickup    : %-8s                                   ║\n", hmiData.overcurrentPickup ? "PICKUP" : "Normal");
+    printf("║   Trip Command  : %-8s                                   ║\n", d->tripCommand ? "ACTIVE" : "Normal");
+    printf("║   Breaker       : %-8s                                   ║\n", d->breakerStatus ? "OPEN" : "CLOSED");
+    printf("║   Fault Status  : %-8s                                   ║\n", d->faultDetected ? "FAULT" : "Normal");
+    printf("║   O/C Pickup    : %-8s                                   ║\n", d->overcurrentPickup ? "PICKUP" : "Normal");
     printf("╠══════════════════════════════════════════════════════════════╣\n");
     printf("║ SYSTEM ALARMS                                                ║\n");
     
-    if (hmiData.tripCommand) {
+    if (d->tripCommand) {
         printf("║   🚨 PROTECTION TRIP ACTIVE                                 ║\n");
     }
-    if (hmiData.faultDetected) {
+    if (d->faultDetected) {
         printf("║   ⚠️  SYSTEM FAULT DETECTED                                 ║\n");
     }
-    if (hmiData.overcurrentPickup) {
+    if (d->overcurrentPickup) {
         printf("║   ⚡ OVERCURRENT PROTECTION PICKUP                          ║\n");
     }
-    if (hmiData.current > 2000) {
-        printf("║   🔥 HIGH CURRENT ALARM: %.0f A                           ║\n", hmiData.current);
+    if (d->current > 2000) {
+        printf("║   🔥 HIGH CURRENT ALARM: %.0f A                           ║\n", d->current);
     }
-    if (hmiData.frequency < 49.5) {
-        printf("║   📉 LOW FREQUENCY ALARM: %.3f Hz                         ║\n", hmiData.frequency);
+    if (d->frequency < 49.5) {
+        printf("║   📉 LOW FREQUENCY ALARM: %.3f Hz                         ║\n", d->frequency);
     }
-    if (!hmiData.tripCommand && !hmiData.faultDetected && !hmiData.overcurrentPickup) {
+    if (!d->tripCommand && !d->faultDetected && !d->overcurrentPickup) {
         printf("║   ✅ ALL SYSTEMS NORMAL                                     ║\n");
     }
     
     printf("╠══════════════════════════════════════════════════════════════╣\n");
-    printf("║ Last Alarm: %-48s ║\n", hmiData.lastAlarm[0] ? hmiData.lastAlarm : "None");
+    printf("║ Last Alarm: %-48s ║\n", d->lastAlarm[0] ? d->lastAlarm : "None");
     printf("╠══════════════════════════════════════════════════════════════╣\n");
     printf("║ MMS Commands: 't'=Trip, 'c'=Close, 'r'=Read, 'q'=Quit       ║\n");
     printf("╚══════════════════════════════════════════════════════════════╝\n");
@@ -361,6 +463,7 @@ int main(int argc, char** argv) {
     
     IedConnection con = IedConnection_create();
     IedClientError error;
+    IedConnection_setRequestTimeout(con, MMS_REQUEST_TIMEOUT_MS);
     
     // Connect to Protection Relay MMS Server
     IedConnection_connect(con, &error, hostname, tcpPort);
@@ -406,88 +509,44 @@ int main(int argc, char** argv) {
         while (running) {
             cycle++;
             
-            // Read analog measurements via MMS
-            MmsValue* voltage = IedConnection_readObject(con, &error, REF_MMXU_VOLT, IEC61850_FC_MX);
-            if (voltage && error == IED_ERROR_OK) {
-                hmiData.voltage = MmsValue_toFloat(voltage);
-                MmsValue_delete(voltage);
-            }
-            
-            MmsValue* current = IedConnection_readObject(con, &error, REF_MMXU_CURR, IEC61850_FC_MX);
-            if (current && error == IED_ERROR_OK) {
-                hmiData.current = MmsValue_toFloat(current);
-                MmsValue_delete(current);
-            }
-            
-            MmsValue* frequency = IedConnection_readObject(con, &error, REF_MMXU_FREQ, IEC61850_FC_MX);
-            if (frequency && error == IED_ERROR_OK) {
-                hmiData.frequency = MmsValue_toFloat(frequency);
-                MmsValue_delete(frequency);
-            }
-            
-            MmsValue* faultCurrent = IedConnection_readObject(con, &error, REF_MMXU_CURR, IEC61850_FC_MX);
-            if (faultCurrent && error == IED_ERROR_OK) {
-                hmiData.faultCurrent = MmsValue_toFloat(faultCurrent);
-                MmsValue_delete(faultCurrent);
-            }
-            
-            // Digital status updated by reports; skip frequent reads for SPCSO1
-            
-            // Read breaker status from circuit breaker MMS server
-                IedConnection breakerCon = IedConnection_create();
-                IedClientError breakerError;
-                const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
-                int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
-                IedConnection_connect(breakerCon, &breakerError, brHost, brPort);
-            if (breakerError == IED_ERROR_OK) {
-                MmsValue* breakerSt = IedConnection_readObject(breakerCon, &breakerError, REF_XCBR_POS, IEC61850_FC_ST);
-                if (breakerSt && breakerError == IED_ERROR_OK) {
-                    bool open = false;
-                    if (MmsValue_getType(breakerSt) == MMS_INTEGER) {
-                        int32_t dp = MmsValue_toInt32(breakerSt);
-                        // Dbpos: 1=off (OPEN), 2=on (CLOSED)
-                        open = (dp == 1);
-                    } else if (MmsValue_getType(breakerSt) == MMS_BOOLEAN) {
-                        open = MmsValue_getBoolean(breakerSt);
-                    }
-                    hmiData.breakerStatus = open;
-                    MmsValue_delete(breakerSt);
-                }
-                IedConnection_close(breakerCon);
-            }
-            IedConnection_destroy(breakerCon);
-            
-            MmsValue* faultDet = IedConnection_readObject(con, &error, REF_PTOC_OP, IEC61850_FC_ST);
-            if (faultDet && error == IED_ERROR_OK) {
-                hmiData.faultDetected = MmsValue_getBoolean(faultDet);
-                MmsValue_delete(faultDet);
-            }
-            
-            MmsValue* ocPickup = IedConnection_readObject(con, &error, REF_PTOC_STR, IEC61850_FC_ST);
-            if (ocPickup && error == IED_ERROR_OK) {
-                hmiData.overcurrentPickup = MmsValue_getBoolean(ocPickup);
-                MmsValue_delete(ocPickup);
-            }
-            
+            double cycleStart = mono_ms();
+
+            // Measurements and protection status in one batched MMS read
+            relay_read_values(con);
+
+            // Breaker position over the persistent breaker connection
+            bool breakerOpen;
+            if (breaker_read_position(&breakerOpen)) set_breaker_status(breakerOpen);
+
+            hop_record(&hop_cycle, mono_ms() - cycleStart, true);
+
+            // Work from a consistent copy; reports and HTTP workers update hmiData concurrently
+            pthread_mutex_lock(&hmi_mutex);
+            HMIData snap = hmiData;
+            pthread_mutex_unlock(&hmi_mutex);
+
             // Update alarm status and build SOE on changes
             static bool lastTrip = false, lastFault = false, lastOc = false, lastBr = false;
-            if (hmiData.tripCommand) {
-                strcpy(hmiData.lastAlarm, "Protection Trip Active");
+            if (snap.tripCommand) {
+                set_last_alarm("Protection Trip Active");
                 if (!lastTrip) soe_add("TRIP COMMAND ACTIVE");
-            } else if (hmiData.faultDetected) {
-                strcpy(hmiData.lastAlarm, "System Fault Detected");
+            } else if (snap.faultDetected) {
+                set_last_alarm("System Fault Detected");
                 if (!lastFault) soe_add("FAULT DETECTED");
-            } else if (hmiData.overcurrentPickup) {
-                strcpy(hmiData.lastAlarm, "Overcurrent Pickup");
+            } else if (snap.overcurrentPickup) {
+                set_last_alarm("Overcurrent Pickup");
                 if (!lastOc) soe_add("OVERCURRENT PICKUP");
             } else {
-                strcpy(hmiData.lastAlarm, "All Systems Normal");
+                set_last_alarm("All Systems Normal");
             }
-            if (hmiData.breakerStatus != lastBr) soe_add(hmiData.breakerStatus ? "BREAKER OPEN" : "BREAKER CLOSED");
-            lastTrip = hmiData.tripCommand; lastFault = hmiData.faultDetected; lastOc = hmiData.overcurrentPickup; lastBr = hmiData.breakerStatus;
+            if (snap.breakerStatus != lastBr) soe_add(snap.breakerStatus ? "BREAKER OPEN" : "BREAKER CLOSED");
+            lastTrip = snap.tripCommand; lastFault = snap.faultDetected; lastOc = snap.overcurrentPickup; lastBr = snap.breakerStatus;
             
-            // Display HMI screen
-            displayHMIScreen();
+            // Display HMI screen with the alarm just set
+            pthread_mutex_lock(&hmi_mutex);
+            memcpy(snap.lastAlarm, hmiData.lastAlarm, sizeof(snap.lastAlarm));
+            pthread_mutex_unlock(&hmi_mutex);
+            displayHMIScreen(&snap);
             
             // Check for user commands
             fd_set readfds;
@@ -501,44 +560,19 @@ int main(int argc, char** argv) {
                 switch(cmd) {
                     case 't': {
                         printf("\n>>> MMS CONTROL: Manual Trip Command <<<\n");
-                        ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", con);
-                        if (control) {
-                            MmsValue* ctlVal = MmsValue_newBoolean(true);
-                            ControlObjectClient_operate(control, ctlVal, 0);
-                            MmsValue_delete(ctlVal);
-                            ControlObjectClient_destroy(control);
-                            strcpy(hmiData.lastAlarm, "Manual Trip Issued via MMS");
-                        }
+                        relay_operate(true, "Manual Trip Issued via MMS");
                         break;
                     }
                     case 'c': {
                         printf("\n>>> MMS CONTROL: Manual Close Command <<<\n");
-                        // Connect to circuit breaker MMS server for close command
-                        IedConnection breakerCon = IedConnection_create();
-                        IedClientError breakerError;
-                        const char* brHost = getenv("BREAKER_HOST"); if (!brHost) brHost = "circuit_breaker_ied";
-                        int brPort = 103; const char* brPortEnv = getenv("BREAKER_PORT"); if (brPortEnv) brPort = atoi(brPortEnv);
-                        IedConnection_connect(breakerCon, &breakerError, brHost, brPort);
-                        
-                        if (breakerError == IED_ERROR_OK) {
-                            ControlObjectClient control = ControlObjectClient_create("simpleIOGenericIO/CSWI1.Op", breakerCon);
-                            if (control) {
-                                MmsValue* ctlVal = MmsValue_newBoolean(false);
-                                ControlObjectClient_operate(control, ctlVal, 0);
-                                MmsValue_delete(ctlVal);
-                                ControlObjectClient_destroy(control);
-                                strcpy(hmiData.lastAlarm, "Manual Close Issued via MMS to Breaker");
-                            }
-                            IedConnection_close(breakerCon);
-                        } else {
-                            strcpy(hmiData.lastAlarm, "Failed to connect to breaker MMS");
+                        if (!breaker_operate(false, "Manual Close Issued via MMS to Breaker")) {
+                            set_last_alarm("Failed to connect to breaker MMS");
                         }
-                        IedConnection_destroy(breakerCon);
                         break;
                     }
                     case 'r':
                         printf("\n>>> MMS READ: Refreshing all data points <<<\n");
-                        strcpy(hmiData.lastAlarm, "Data Refresh via MMS");
+                        set_last_alarm("Data Refresh via MMS");
                         break;
                     case 'q':
                         running = 0;
@@ -549,6 +583,13 @@ int main(int argc, char** argv) {
         
         printf("\n🔌 Disconnecting from Protection Relay...\n");
         IedConnection_close(con);
+        pthread_mutex_lock(&breaker_mutex);
+        if (breaker_con) {
+            IedConnection_close(breaker_con);
+            IedConnection_destroy(breaker_con);
+            breaker_con = NULL;
+        }
+        pthread_mutex_unlock(&breaker_mutex);
         
     } else {
         printf("❌ Failed to connect to %s:%d\n", hostname, tcpPort);
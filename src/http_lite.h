@@ -0,0 +1,421 @@
+// Minimal HTTP/1.1 status server shared by the IED containers.
+// Client connections are kept alive and multiplexed with poll(), so a GUI
+// panel polling once per second reuses one socket instead of paying a
+// handshake plus a TIME_WAIT socket per request.
+//
+// Handlers run on the poll thread, so they must be quick. Requests that
+// block (MMS round trips) can be handed to a worker pool with
+// http_lite_serve_pool(): the connection is parked until its worker has sent
+// the response, while every other connection keeps being served.
+
+#ifndef HTTP_LITE_H
+#define HTTP_LITE_H
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <strings.h>
+#include <errno.h>
+#include <poll.h>
+#include <pthread.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <sys/uio.h>
+#include <netinet/in.h>
+
+// Includers may raise the connection limit before including this header
+#ifndef HTTP_LITE_MAX_CLIENTS
+#define HTTP_LITE_MAX_CLIENTS   32
+#endif
+#define HTTP_LITE_REQ_MAX       2048
+#define HTTP_LITE_BODY_MAX      8192
+#define HTTP_LITE_IDLE_MS       15000
+#define HTTP_LITE_MAX_REQUESTS  1000
+
+typedef struct {
+    char method[8];
+    char path[128];     // without query string
+    char query[128];
+    const char* body;
+    size_t body_len;
+    bool keep_alive;
+} HttpLiteRequest;
+
+// Fills body (NUL-terminated JSON) and returns the HTTP status code.
+typedef int (*HttpLiteHandler)(const HttpLiteRequest* req, char* body, size_t len);
+
+// Returns true for requests that should run on the worker pool.
+typedef bool (*HttpLiteDeferFn)(const HttpLiteRequest* req);
+
+typedef struct {
+    int fd;
+    char buf[HTTP_LITE_REQ_MAX];
+    size_t len;
+    int served;
+    uint64_t last_ms;
+    bool busy;              // req is on a worker; fd is not polled meanwhile
+    size_t pending;         // bytes of buf that req occupies
+    HttpLiteRequest req;
+} HttpLiteClient;
+
+typedef struct {
+    int slot;
+    bool keep;
+} HttpLiteDone;
+
+typedef struct {
+    HttpLiteHandler handler;
+    HttpLiteDeferFn defer;
+    HttpLiteClient* clients;
+    int queue[HTTP_LITE_MAX_CLIENTS];   // one job per client at most
+    int head;
+    int count;
+    bool stopping;
+    int done_fd[2];                     // workers -> poll loop
+    pthread_mutex_t lock;
+    pthread_cond_t ready;
+} HttpLitePool;
+
+static uint64_t http_lite_now_ms(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t) ts.tv_sec * 1000 + ts.tv_nsec / 1000000;
+}
+
+static const char* http_lite_reason(int status) {
+    switch (status) {
+        case 200: return "OK";
+        case 400: return "Bad Request";
+        case 404: return "Not Found";
+        case 503: return "Service Unavailable";
+        default:  return "Error";
+    }
+}
+
+static bool http_lite_send_all(int sock, const char* data, size_t len) {
+    while (len > 0) {
+        ssize_t n = send(sock, data, len, MSG_NOSIGNAL);
+        if (n < 0 && errno == EINTR) continue;
+        if (n <= 0) return false;
+        data += n; len -= (size_t) n;
+    }
+    return true;
+}
+
+static bool http_lite_respond(int sock, int status, const char* body, bool keep_alive) {
+    char head[256];
+    size_t body_len = strlen(body);
+    int n = snprintf(head, sizeof(head),
+        "HTTP/1.1 %d %s\r\n"
+        "Content-Type: application/json\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Content-Length: %zu\r\n"
+        "Connection: %s\r\n"
+        "\r\n",
+        status, http_lite_reason(status), body_len, keep_alive ? "keep-alive" : "close");
+    // Head and body go out in one segment; two sends would let Nagle hold the
+    // body back until the client's delayed ACK on a keep-alive connection.
+    struct iovec iov[2] = {{head, (size_t) n}, {(void*) body, body_len}};
+    struct msghdr msg;
+    memset(&msg, 0, sizeof(msg));
+    msg.msg_iov = iov;
+    msg.msg_iovlen = 2;
+    ssize_t sent;
+    do {
+        sent = sendmsg(sock, &msg, MSG_NOSIGNAL);
+    } while (sent < 0 && errno == EINTR);
+    if (sent < 0) return false;
+    size_t done = (size_t) sent;
+    if (done < (size_t) n) {
+        return http_lite_send_all(sock, head + done, (size_t) n - done) && http_lite_send_all(sock, body, body_len);
+    }
+    done -= (size_t) n;
+    return http_lite_send_all(sock, body + done, body_len - done);
+}
+
+// Parses one complete request from buf. Returns its total length, 0 if more
+// bytes are needed, or -1 if the request is malformed.
+static int http_lite_parse(const char* buf, size_t len, HttpLiteRequest* req) {
+    const char* end = NULL;
+    for (size_t i = 3; i < len; i++) {
+        if (buf[i-3] == '\r' && buf[i-2] == '\n' && buf[i-1] == '\r' && buf[i] == '\n') {
+            end = buf + i + 1;
+            break;
+        }
+    }
+    if (!end) return len >= HTTP_LITE_REQ_MAX - 1 ? -1 : 0;
+
+    memset(req, 0, sizeof(*req));
+    char request_line[300];
+    size_t line_len = strcspn(buf, "\r");
+    if (line_len >= sizeof(request_line)) return -1;
+    memcpy(request_line, buf, line_len);
+    request_line[line_len] = '\0';
+    char target[256] = {0};
+    char version[16] = {0};
+    if (sscanf(request_line, "%7s %255s %15s", req->method, target, version) != 3) return -1;
+
+    char* q = strchr(target, '?');
+    if (q) {
+        *q = '\0';
+        snprintf(req->query, sizeof(req->query), "%s", q + 1);
+    }
+    snprintf(req->path, sizeof(req->path), "%s", target);
+
+    req->keep_alive = (strcmp(version, "HTTP/1.1") == 0);
+    size_t content_length = 0;
+    const char* line = strstr(buf, "\r\n") + 2;
+    while (line < end - 2) {
+        const char* eol = strstr(line, "\r\n");
+        if (!eol) break;
+        if (strncasecmp(line, "Content-Length:", 15) == 0) {
+            content_length = strtoul(line + 15, NULL, 10);
+        } else if (strncasecmp(line, "Connection:", 11) == 0) {
+            const char* v = line + 11;
+            while (*v == ' ') v++;
+            if (strncasecmp(v, "close", 5) == 0) req->keep_alive = false;
+            else if (strncasecmp(v, "keep-alive", 10) == 0) req->keep_alive = true;
+        }
+        line = eol + 2;
+    }
+
+    size_t head_len = (size_t) (end - buf);
+    if (head_len + content_length > HTTP_LITE_REQ_MAX - 1) return -1;
+    if (len < head_len + content_length) return 0;
+    req->body = end;
+    req->body_len = content_length;
+    return (int) (head_len + content_length);
+}
+
+static void http_lite_drop(HttpLiteClient* c) {
+    close(c->fd);
+    c->fd = -1;
+    c->len = 0;
+}
+
+// Serves every complete request in the client's buffer, stopping at one that
+// is handed to the pool. Returns false when the connection should be closed.
+static bool http_lite_process(HttpLiteClient* c, int slot, HttpLiteHandler handler, HttpLitePool* pool) {
+    for (;;) {
+        HttpLiteRequest req;
+        int used = http_lite_parse(c->buf, c->len, &req);
+        if (used == 0) return true;
+        if (used < 0) {
+            http_lite_respond(c->fd, 400, "{\"error\":\"bad_request\"}", false);
+            return false;
+        }
+        if (pool && pool->defer(&req)) {
+            c->req = req;
+            c->pending = (size_t) used;
+            c->busy = true;
+            pthread_mutex_lock(&pool->lock);
+            pool->queue[(pool->head + pool->count) % HTTP_LITE_MAX_CLIENTS] = slot;
+            pool->count++;
+            pthread_cond_signal(&pool->ready);
+            pthread_mutex_unlock(&pool->lock);
+            return true;
+        }
+        static char body[HTTP_LITE_BODY_MAX];
+        body[0] = '\0';
+        int status = handler(&req, body, sizeof(body));
+        c->served++;
+        bool keep = req.keep_alive && c->served < HTTP_LITE_MAX_REQUESTS;
+        if (!http_lite_respond(c->fd, status, body, keep) || !keep) return false;
+        memmove(c->buf, c->buf + used, c->len - (size_t) used);
+        c->len -= (size_t) used;
+        c->buf[c->len] = '\0';
+    }
+}
+
+// Reads available bytes and serves every complete request. Returns false when
+// the connection should be closed.
+static bool http_lite_service(HttpLiteClient* c, int slot, HttpLiteHandler handler, HttpLitePool* pool) {
+    ssize_t n = recv(c->fd, c->buf + c->len, sizeof(c->buf) - 1 - c->len, 0);
+    if (n <= 0) return false;
+    c->len += (size_t) n;
+    c->buf[c->len] = '\0';
+    c->last_ms = http_lite_now_ms();
+    return http_lite_process(c, slot, handler, pool);
+}
+
+static void* http_lite_worker(void* arg) {
+    HttpLitePool* pool = (HttpLitePool*) arg;
+    char body[HTTP_LITE_BODY_MAX];
+    for (;;) {
+        pthread_mutex_lock(&pool->lock);
+        while (pool->count == 0 && !pool->stopping) pthread_cond_wait(&pool->ready, &pool->lock);
+        if (pool->count == 0) {
+            pthread_mutex_unlock(&pool->lock);
+            return NULL;
+        }
+        int slot = pool->queue[pool->head];
+        pool->head = (pool->head + 1) % HTTP_LITE_MAX_CLIENTS;
+        pool->count--;
+        pthread_mutex_unlock(&pool->lock);
+
+        HttpLiteClient* c = &pool->clients[slot];
+        body[0] = '\0';
+        int status = pool->handler(&c->req, body, sizeof(body));
+        HttpLiteDone done = {slot, c->req.keep_alive && c->served + 1 < HTTP_LITE_MAX_REQUESTS};
+        if (!http_lite_respond(c->fd, status, body, done.keep)) done.keep = false;
+        while (write(pool->done_fd[1], &done, sizeof(done)) < 0 && errno == EINTR) {}
+    }
+}
+
+// Takes a finished worker job back onto the poll thread and serves any
+// requests the client pipelined behind it.
+static void http_lite_complete(HttpLitePool* pool, HttpLiteDone* done) {
+    HttpLiteClient* c = &pool->clients[done->slot];
+    c->busy = false;
+    c->served++;
+    c->last_ms = http_lite_now_ms();
+    if (!done->keep) {
+        http_lite_drop(c);
+        return;
+    }
+    memmove(c->buf, c->buf + c->pending, c->len - c->pending);
+    c->len -= c->pending;
+    c->buf[c->len] = '\0';
+    if (!http_lite_process(c, done->slot, pool->handler, pool)) http_lite_drop(c);
+}
+
+// Serves HTTP on port until *running becomes 0. Blocks the calling thread.
+// Requests for which defer() returns true run on one of workers threads;
+// everything else, and all socket I/O besides their responses, stays on the
+// poll loop. The handler must be thread-safe when workers > 0.
+static int http_lite_serve_pool(int port, int backlog, HttpLiteHandler handler,
+                                HttpLiteDeferFn defer, int workers, volatile int* running) {
+    int server_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (server_fd < 0) return -1;
+    int opt = 1;
+    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
+    struct sockaddr_in address;
+    memset(&address, 0, sizeof(address));
+    address.sin_family = AF_INET;
+    address.sin_addr.s_addr = INADDR_ANY;
+    address.sin_port = htons(port);
+    if (bind(server_fd, (struct sockaddr*)&address, sizeof(address)) < 0) {
+        close(server_fd);
+        return -1;
+    }
+    listen(server_fd, backlog);
+
+    HttpLiteClient clients[HTTP_LITE_MAX_CLIENTS];
+    for (int i = 0; i < HTTP_LITE_MAX_CLIENTS; i++) {
+        clients[i].fd = -1;
+        clients[i].busy = false;
+    }
+
+    HttpLitePool pool_storage;
+    HttpLitePool* pool = NULL;
+    pthread_t threads[workers > 0 ? workers : 1];
+    int started = 0;
+    if (defer && workers > 0) {
+        pool = &pool_storage;
+        memset(pool, 0, sizeof(*pool));
+        pool->handler = handler;
+        pool->defer = defer;
+        pool->clients = clients;
+        pthread_mutex_init(&pool->lock, NULL);
+        pthread_cond_init(&pool->ready, NULL);
+        if (pipe(pool->done_fd) < 0) {
+            close(server_fd);
+            return -1;
+        }
+        for (; started < workers; started++) {
+            if (pthread_create(&threads[started], NULL, http_lite_worker, pool) != 0) break;
+        }
+        if (started == 0) pool = NULL;
+    }
+
+    while (*running) {
+        struct pollfd fds[HTTP_LITE_MAX_CLIENTS + 2];
+        int slot[HTTP_LITE_MAX_CLIENTS + 2];
+        int nfds = 0;
+        fds[nfds].fd = server_fd; fds[nfds].events = POLLIN; slot[nfds++] = -1;
+        if (pool) {
+            fds[nfds].fd = pool->done_fd[0]; fds[nfds].events = POLLIN; slot[nfds++] = -1;
+        }
+        int first_client = nfds;
+        for (int i = 0; i < HTTP_LITE_MAX_CLIENTS; i++) {
+            if (clients[i].fd < 0 || clients[i].busy) continue;
+            fds[nfds].fd = clients[i].fd; fds[nfds].events = POLLIN; slot[nfds++] = i;
+        }
+
+        int ready = poll(fds, nfds, 1000);
+        uint64_t now = http_lite_now_ms();
+
+        if (ready > 0) {
+            for (int k = first_client; k < nfds; k++) {
+                if (!fds[k].revents) continue;
+                HttpLiteClient* c = &clients[slot[k]];
+                if (!http_lite_service(c, slot[k], handler, pool)) http_lite_drop(c);
+            }
+            if (pool && (fds[1].revents & POLLIN)) {
+                HttpLiteDone done;
+                if (read(pool->done_fd[0], &done, sizeof(done)) == (ssize_t) sizeof(done)) {
+                    http_lite_complete(pool, &done);
+                }
+            }
+            if (fds[0].revents & POLLIN) {
+                int sock = accept(server_fd, NULL, NULL);
+                if (sock >= 0) {
+                    int free_slot = -1, oldest = -1;
+                    for (int i = 0; i < HTTP_LITE_MAX_CLIENTS; i++) {
+                        if (clients[i].fd < 0) { free_slot = i; break; }
+                        if (clients[i].busy) continue;
+                        if (oldest < 0 || clients[i].last_ms < clients[oldest].last_ms) oldest = i;
+                    }
+                    if (free_slot < 0 && oldest >= 0) {
+                        // Table full: evict the least recently active idle connection
+                        http_lite_drop(&clients[oldest]);
+                        free_slot = oldest;
+                    }
+                    if (free_slot < 0) {
+                        close(sock);
+                    } else {
+                        clients[free_slot].fd = sock;
+                        clients[free_slot].len = 0;
+                        clients[free_slot].served = 0;
+                        clients[free_slot].last_ms = now;
+                    }
+                }
+            }
+        }
+
+        for (int i = 0; i < HTTP_LITE_MAX_CLIENTS; i++) {
+            if (clients[i].fd >= 0 && !clients[i].busy && now - clients[i].last_ms > HTTP_LITE_IDLE_MS) {
+                http_lite_drop(&clients[i]);
+            }
+        }
+    }
+
+    if (pool) {
+        pthread_mutex_lock(&pool->lock);
+        pool->stopping = true;
+        pthread_cond_broadcast(&pool->ready);
+        pthread_mutex_unlock(&pool->lock);
+        // At most one completion per client is outstanding, which always fits in the pipe
+        for (int i = 0; i < started; i++) pthread_join(threads[i], NULL);
+        close(pool->done_fd[0]);
+        close(pool->done_fd[1]);
+        pthread_mutex_destroy(&pool->lock);
+        pthread_cond_destroy(&pool->ready);
+    }
+    for (int i = 0; i < HTTP_LITE_MAX_CLIENTS; i++) {
+        if (clients[i].fd >= 0) http_lite_drop(&clients[i]);
+    }
+    close(server_fd);
+    return 0;
+}
+
+// Serves HTTP on port until *running becomes 0, every request on the poll
+// thread. Blocks the calling thread.
+static int http_lite_serve(int port, int backlog, HttpLiteHandler handler, volatile int* running) {
+    return http_lite_serve_pool(port, backlog, handler, NULL, 0, running);
+}
+
+#endif // HTTP_LITE_H
@@ -39,4 +39,13 @@
 #define REF_PTRC_TR        "simpleIOGenericIO/PTRC1.Tr.stVal"
 #define REF_XCBR_POS       "simpleIOGenericIO/XCBR1.Pos.stVal"
 
+// MMS domain and variable names of the same objects, for batched reads with
+// MmsConnection_readMultipleVariables
+#define MMS_DOMAIN         "simpleIOGenericIO"
+#define MMS_MMXU_VOLT      "MMXU1$MX$PhV$mag$f"
+#define MMS_MMXU_CURR      "MMXU1$MX$Amp$mag$f"
+#define MMS_MMXU_FREQ      "MMXU1$MX$Hz$mag$f"
+#define MMS_PTOC_STR       "PTOC1$ST$Str$stVal"
+#define MMS_PTOC_OP        "PTOC1$ST$Op$stVal"
+
 #endif // MODEL_ALIAS_H
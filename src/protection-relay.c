@@ -17,8 +17,9 @@
 #include <netdb.h>
 #include "static_model.h"
 #include "model_alias.h"
+#include "http_lite.h"
 
-static int running = 0;
+static volatile int running = 0;
 static IedServer iedServer = NULL;
 static GoosePublisher goosePublisher = NULL;
 static GooseReceiver gooseReceiver = NULL;
@@ -36,54 +37,34 @@ void sigint_handler(int signalId) {
 // Prototypes for helper/server
 static void* http_status_thread(void* arg);
 static void build_status_json(char* body, size_t len);
+static int format_sim_feed(char* out, size_t len);
 static void relay_latch_trip(const char* reason);
 static void relay_reset_trip(void);
 
-// Lightweight HTTP status server (port 8082) for GUI
-static void* http_status_thread(void* arg) {
-    int server_fd = socket(AF_INET, SOCK_STREAM, 0);
-    if (server_fd < 0) return NULL;
-    int opt = 1;
-    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
-    struct sockaddr_in address;
-    address.sin_family = AF_INET;
-    address.sin_addr.s_addr = INADDR_ANY;
-    address.sin_port = htons(8082);
-    if (bind(server_fd, (struct sockaddr*)&address, sizeof(address)) < 0) {
-        close(server_fd);
-        return NULL;
+// Request handler for the relay HTTP status server (port 8082)
+static int relay_http_handler(const HttpLiteRequest* req, char* body, size_t len) {
+    // Minimal routing for local GUI: POST /trip, POST /reset, GET /
+    if (strcmp(req->method, "POST") == 0 && strcmp(req->path, "/trip") == 0) {
+        // Latch trip and publish GOOSE
+        relay_latch_trip("Manual Trip (GUI)");
+        snprintf(body, len, "{\"status\":\"trip_latched\"}");
+    } else if (strcmp(req->method, "POST") == 0 && strcmp(req->path, "/reset") == 0) {
+        // Clear trip and all pickups and publish GOOSE
+        relay_reset_trip();
+        snprintf(body, len, "{\"status\":\"reset_done\"}");
+    } else {
+        // Respond with JSON of current measured and status values
+        build_status_json(body, len);
     }
-    listen(server_fd, 5);
+    return 200;
+}
+
+// Lightweight keep-alive HTTP status server (port 8082) for GUI
+static void* http_status_thread(void* arg) {
     printf("✅ Relay HTTP status server listening on port 8082\n");
-    while (running) {
-        struct sockaddr_in client; socklen_t clen = sizeof(client);
-        int sock = accept(server_fd, (struct sockaddr*)&client, &clen);
-        if (sock < 0) continue;
-        char buffer[512] = {0};
-        recv(sock, buffer, sizeof(buffer)-1, 0);
-        // Minimal routing for local GUI: POST /trip, POST /reset, GET /
-        if (strstr(buffer, "POST /trip")) {
-            // Latch trip and publish GOOSE
-            relay_latch_trip("Manual Trip (GUI)");
-            const char* resp = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n{\"status\":\"trip_latched\"}";
-            send(sock, resp, strlen(resp), 0);
-        } else if (strstr(buffer, "POST /reset")) {
-            // Clear trip and all pickups and publish GOOSE
-            relay_reset_trip();
-            const char* resp = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n{\"status\":\"reset_done\"}";
-            send(sock, resp, strlen(resp), 0);
-        } else {
-            // Respond with JSON of current measured and status values
-            char body[512];
-            build_status_json(body, sizeof(body));
-            char response[1024];
-            snprintf(response, sizeof(response),
-                "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nAccess-Control-Allow-Origin: *\r\n\r\n%s", body);
-            send(sock, response, strlen(response), 0);
-        }
-        close(sock);
+    if (http_lite_serve(8082, 16, relay_http_handler, &running) < 0) {
+        printf("❌ Relay HTTP status server failed to bind port 8082\n");
     }
-    close(server_fd);
     return NULL;
 }
 
@@ -127,8 +108,8 @@ static void build_status_json(char* body, size_t len) {
     uint64_t now = Hal_getTimeInMs();
     bool rx_ok = (br_last_rx_ms != 0) && ((now - br_last_rx_ms) < 5000);
     bool tx_ok = (rl_last_tx_ms != 0) && ((now - rl_last_tx_ms) < 5000);
-    snprintf(body, len,
-        "{\"voltage\":%.1f,\"current\":%.0f,\"frequency\":%.3f,\"faultCurrent\":%.0f,\"faultDetected\":%s,\"tripCommand\":%s,\"breakerStatus\":%s,\"rxCount\":%u,\"lastRxMs\":%llu,\"rxOk\":%s,\"txCount\":%u,\"lastTxMs\":%llu,\"txOk\":%s}",
+    int n = snprintf(body, len,
+        "{\"voltage\":%.1f,\"current\":%.0f,\"frequency\":%.3f,\"faultCurrent\":%.0f,\"faultDetected\":%s,\"tripCommand\":%s,\"breakerStatus\":%s,\"rxCount\":%u,\"lastRxMs\":%llu,\"rxOk\":%s,\"txCount\":%u,\"lastTxMs\":%llu,\"txOk\":%s,\"simFeed\":",
         simData.voltage, simData.current, simData.frequency, simData.faultCurrent,
         (prot_state.overcurrent_pickup || prot_state.ground_fault_pickup) ? "true" : "false",
         prot_state.trip_active ? "true" : "false",
@@ -139,6 +120,9 @@ static void build_status_json(char* body, size_t len) {
         rl_tx_count,
         (unsigned long long) rl_last_tx_ms,
         tx_ok ? "true" : "false");
+    if (n < 0 || (size_t) n >= len) return;
+    n += format_sim_feed(body + n, len - n);
+    if ((size_t) n < len) snprintf(body + n, len - n, "}");
 }
 
 // GOOSE state tracking for proper stNum/sqNum management
@@ -167,53 +151,246 @@ static void breakerStatusListener(GooseSubscriber subscriber, void* parameter) {
     }
 }
 
+// Simulator feed: server.js pushes one binary frame per change and every
+// SIM_FEED_MS (web-interface/server.js) to UDP port SIM_FEED_PORT. Frames are
+// little-endian:
+//
+//   0  char[4]  "SIMF"
+//   4  uint16   version (1)
+//   6  uint16   frame length (36)
+//   8  float64  sender wall clock, ms since epoch
+//  16  uint32   sequence number
+//  20  float32  voltage (kV)
+//  24  float32  current (A)
+//  28  float32  frequency (Hz)
+//  32  float32  fault current (A)
+//
+// The main loop wakes on every frame. While no frame has arrived for
+// SIM_FEED_STALE_MS it falls back to polling GET /api/simulation-data.
+#define SIM_FEED_DEFAULT_PORT 5020
+#define SIM_FRAME_LEN         36
+#define SIM_FEED_STALE_MS     2000
+#define SIM_RESOLVE_MS        30000
+#define PROTECTION_CYCLE_MS   500
+#define GOOSE_HEARTBEAT_MS    1000
+
+static pthread_mutex_t sim_mutex = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t sim_cond;
+// Guarded by sim_mutex
+static SimulationData sim_latest = {132.0, 450.0, 50.0, 0.0};
+static uint64_t sim_frame_count = 0;     // frames received, for the main loop to spot new data
+static uint64_t sim_last_frame_ms = 0;   // receive time (Hal_getTimeInMs) of the newest frame
+static uint32_t sim_last_seq = 0;
+static uint32_t sim_seq_gaps = 0;        // frames lost or reordered in transit
+static uint32_t sim_bad_frames = 0;
+static double sim_latency_ms = 0;        // sender stamp to receive, exponentially weighted
+static uint32_t sim_http_polls = 0;      // fallback fetches
+
+static uint32_t sim_u32(const uint8_t* p) {
+    return (uint32_t) p[0] | ((uint32_t) p[1] << 8) | ((uint32_t) p[2] << 16) | ((uint32_t) p[3] << 24);
+}
+
+static float sim_f32(const uint8_t* p) {
+    uint32_t bits = sim_u32(p);
+    float value;
+    memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+static double sim_f64(const uint8_t* p) {
+    uint64_t bits = (uint64_t) sim_u32(p) | ((uint64_t) sim_u32(p + 4) << 32);
+    double value;
+    memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+static bool sim_parse_frame(const uint8_t* buf, ssize_t len, SimulationData* data, uint32_t* seq, double* sent_ms) {
+    if (len < SIM_FRAME_LEN || memcmp(buf, "SIMF", 4) != 0) return false;
+    if ((buf[4] | (buf[5] << 8)) != 1) return false;
+    *sent_ms = sim_f64(buf + 8);
+    *seq = sim_u32(buf + 16);
+    data->voltage = sim_f32(buf + 20);
+    data->current = sim_f32(buf + 24);
+    data->frequency = sim_f32(buf + 28);
+    data->faultCurrent = sim_f32(buf + 32);
+    return true;
+}
+
+static void* sim_feed_thread(void* arg) {
+    const char* portEnv = getenv("SIM_FEED_PORT");
+    int port = (portEnv && strlen(portEnv) > 0) ? atoi(portEnv) : SIM_FEED_DEFAULT_PORT;
+    int sock = socket(AF_INET, SOCK_DGRAM, 0);
+    if (sock < 0) return NULL;
+    // Room for bursts of frames while the main loop is busy publishing
+    int rcvbuf = 256 * 1024;
+    setsockopt(sock, SOL_SOCKET, SO_RCVBUF, &rcvbuf, sizeof(rcvbuf));
+    struct sockaddr_in addr;
+    memset(&addr, 0, sizeof(addr));
+    addr.sin_family = AF_INET;
+    addr.sin_addr.s_addr = INADDR_ANY;
+    addr.sin_port = htons(port);
+    if (bind(sock, (struct sockaddr*)&addr, sizeof(addr)) < 0) {
+        printf("❌ Simulator feed failed to bind UDP port %d\n", port);
+        close(sock);
+        return NULL;
+    }
+    printf("✅ Simulator feed listening on UDP port %d\n", port);
+
+    uint8_t buf[512];
+    while (running) {
+        struct pollfd pfd = {sock, POLLIN, 0};
+        if (poll(&pfd, 1, 1000) <= 0) continue;
+        // Drain every queued frame; only the newest values matter to protection
+        for (;;) {
+            ssize_t n = recv(sock, buf, sizeof(buf), MSG_DONTWAIT);
+            if (n < 0) break;
+            SimulationData data;
+            uint32_t seq;
+            double sent_ms;
+            pthread_mutex_lock(&sim_mutex);
+            if (!sim_parse_frame(buf, n, &data, &seq, &sent_ms)) {
+                sim_bad_frames++;
+                pthread_mutex_unlock(&sim_mutex);
+                continue;
+            }
+            uint64_t now = Hal_getTimeInMs();
+            // A lower sequence number after a quiet spell means the simulator restarted
+            bool restarted = sim_frame_count == 0 || seq < sim_last_seq ||
+                             now - sim_last_frame_ms > SIM_FEED_STALE_MS;
+            if (!restarted && seq > sim_last_seq + 1) sim_seq_gaps += seq - sim_last_seq - 1;
+            double latency = (double) now - sent_ms;
+            if (latency >= 0 && latency < 60000) {
+                sim_latency_ms = sim_frame_count ? sim_latency_ms + 0.1 * (latency - sim_latency_ms) : latency;
+            }
+            sim_latest = data;
+            sim_last_seq = seq;
+            sim_last_frame_ms = now;
+            sim_frame_count++;
+            pthread_cond_signal(&sim_cond);
+            pthread_mutex_unlock(&sim_mutex);
+        }
+    }
+    close(sock);
+    return NULL;
+}
+
+// Waits up to timeout_ms for a feed frame newer than *seen. Returns true and
+// copies the values into data when one arrived.
+static bool sim_wait_frame(SimulationData* data, uint64_t* seen, int timeout_ms) {
+    struct timespec deadline;
+    clock_gettime(CLOCK_MONOTONIC, &deadline);
+    deadline.tv_sec += timeout_ms / 1000;
+    deadline.tv_nsec += (long) (timeout_ms % 1000) * 1000000L;
+    if (deadline.tv_nsec >= 1000000000L) {
+        deadline.tv_sec++;
+        deadline.tv_nsec -= 1000000000L;
+    }
+    pthread_mutex_lock(&sim_mutex);
+    while (sim_frame_count == *seen && running) {
+        if (pthread_cond_timedwait(&sim_cond, &sim_mutex, &deadline) != 0) break;
+    }
+    bool fresh = sim_frame_count != *seen;
+    if (fresh) {
+        *data = sim_latest;
+        *seen = sim_frame_count;
+    }
+    pthread_mutex_unlock(&sim_mutex);
+    return fresh;
+}
+
+static bool sim_feed_live(void) {
+    pthread_mutex_lock(&sim_mutex);
+    bool live = sim_last_frame_ms != 0 && Hal_getTimeInMs() - sim_last_frame_ms < SIM_FEED_STALE_MS;
+    pthread_mutex_unlock(&sim_mutex);
+    return live;
+}
+
+// Feed statistics for the status JSON, read by gui/bench_sim_feed.py
+static int format_sim_feed(char* out, size_t len) {
+    pthread_mutex_lock(&sim_mutex);
+    uint64_t now = Hal_getTimeInMs();
+    bool live = sim_last_frame_ms != 0 && now - sim_last_frame_ms < SIM_FEED_STALE_MS;
+    int n = snprintf(out, len,
+        "{\"mode\":\"%s\",\"frames\":%llu,\"seq\":%u,\"seqGaps\":%u,\"badFrames\":%u,"
+        "\"latencyMs\":%.2f,\"ageMs\":%lld,\"httpPolls\":%u}",
+        live ? "udp" : "http",
+        (unsigned long long) sim_frame_count, sim_last_seq, sim_seq_gaps, sim_bad_frames,
+        sim_latency_ms, sim_last_frame_ms ? (long long) (now - sim_last_frame_ms) : -1LL,
+        sim_http_polls);
+    pthread_mutex_unlock(&sim_mutex);
+    return n < 0 ? 0 : (n >= (int) len ? (int) len - 1 : n);
+}
+
+// Reads "key":number out of a flat JSON object, in any order.
+static bool json_number(const char* json, const char* key, float* out) {
+    char pattern[48];
+    snprintf(pattern, sizeof(pattern), "\"%s\":", key);
+    const char* p = strstr(json, pattern);
+    if (!p) return false;
+    char* end;
+    float value = strtof(p + strlen(pattern), &end);
+    if (end == p + strlen(pattern)) return false;
+    *out = value;
+    return true;
+}
+
+// Fallback for simulators without the UDP feed. The resolved address is
+// cached and only looked up again after SIM_RESOLVE_MS or a failed connect.
 int fetchSimulationData(SimulationData* data) {
+    static struct sockaddr_in server_addr;
+    static uint64_t resolved_ms = 0;
+
+    uint64_t now = Hal_getTimeInMs();
+    if (resolved_ms == 0 || now - resolved_ms > SIM_RESOLVE_MS) {
+        const char* simulator_host = getenv("SIMULATOR_HOST");
+        if (!simulator_host) simulator_host = "localhost";
+        struct addrinfo hints, *result = NULL;
+        memset(&hints, 0, sizeof(hints));
+        hints.ai_family = AF_INET;
+        hints.ai_socktype = SOCK_STREAM;
+        if (getaddrinfo(simulator_host, "3000", &hints, &result) != 0 || !result) return -1;
+        memcpy(&server_addr, result->ai_addr, sizeof(server_addr));
+        freeaddrinfo(result);
+        resolved_ms = now;
+    }
+
     int sock = socket(AF_INET, SOCK_STREAM, 0);
     if (sock < 0) return -1;
-    
     struct timeval timeout = {1, 0};
     setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
-    
-    const char* simulator_host = getenv("SIMULATOR_HOST");
-    if (!simulator_host) simulator_host = "localhost";
-    
-    struct sockaddr_in server_addr;
-    server_addr.sin_family = AF_INET;
-    server_addr.sin_port = htons(3000);
-    
-    struct hostent* host_entry = gethostbyname(simulator_host);
-    if (host_entry == NULL) {
-        close(sock);
-        return -1;
-    }
-    server_addr.sin_addr = *((struct in_addr*)host_entry->h_addr_list[0]);
-    
     if (connect(sock, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
         close(sock);
+        resolved_ms = 0;
         return -1;
     }
-    
+
     const char* request = "GET /api/simulation-data HTTP/1.1\r\nHost: localhost:3000\r\nConnection: close\r\n\r\n";
-    send(sock, request, strlen(request), 0);
-    
-    char buffer[1024];
-    int bytes = recv(sock, buffer, sizeof(buffer)-1, 0);
+    send(sock, request, strlen(request), MSG_NOSIGNAL);
+
+    // Read until the server closes: headers and body may arrive in separate segments
+    char buffer[2048];
+    size_t total = 0;
+    ssize_t bytes;
+    while (total < sizeof(buffer) - 1 && (bytes = recv(sock, buffer + total, sizeof(buffer) - 1 - total, 0)) > 0) {
+        total += (size_t) bytes;
+    }
     close(sock);
-    
-    if (bytes > 0) {
-        buffer[bytes] = '\0';
-        char* json_start = strstr(buffer, "{");
-        if (json_start) {
-            sscanf(json_start, "{\"voltage\":%f,\"current\":%f,\"frequency\":%f,\"faultCurrent\":%f", 
-                   &data->voltage, &data->current, &data->frequency, &data->faultCurrent);
-            return 0;
-        }
+    buffer[total] = '\0';
+    sim_http_polls++;
+
+    char* json_start = strstr(buffer, "\r\n\r\n");
+    if (!json_start) return -1;
+    SimulationData parsed = *data;
+    if (!json_number(json_start, "voltage", &parsed.voltage) ||
+        !json_number(json_start, "current", &parsed.current) ||
+        !json_number(json_start, "frequency", &parsed.frequency) ||
+        !json_number(json_start, "faultCurrent", &parsed.faultCurrent)) {
+        return -1;
     }
-    return -1;
+    *data = parsed;
+    return 0;
 }
 
-
-
 void publishGooseMessage(bool is_state_change) {
     if (!goosePublisher) return;
     
@@ -345,16 +522,35 @@ int main(int argc, char** argv) {
     // Start HTTP status server for GUI
     pthread_t http_thread;
     pthread_create(&http_thread, NULL, http_status_thread, NULL);
-    
 
+    // Start the simulator feed receiver
+    pthread_condattr_t cond_attr;
+    pthread_condattr_init(&cond_attr);
+    pthread_condattr_setclock(&cond_attr, CLOCK_MONOTONIC);
+    pthread_cond_init(&sim_cond, &cond_attr);
+    pthread_condattr_destroy(&cond_attr);
+    pthread_t feed_thread;
+    pthread_create(&feed_thread, NULL, sim_feed_thread, NULL);
     
     int cycle = 0;
+    uint64_t sim_seen = 0;
+    uint64_t last_http_poll_ms = 0;
+    uint64_t last_print_ms = 0;
+    uint64_t last_heartbeat_ms = 0;
     
     while (running) {
+        // Evaluate protection as soon as a feed frame arrives, at least every
+        // PROTECTION_CYCLE_MS so pickup timers keep running
+        bool fresh = sim_wait_frame(&simData, &sim_seen, PROTECTION_CYCLE_MS);
         cycle++;
         uint64_t timestamp = Hal_getTimeInMs();
         
-        if (fetchSimulationData(&simData) == 0) {
+        if (!fresh && !sim_feed_live() && timestamp - last_http_poll_ms >= PROTECTION_CYCLE_MS) {
+            last_http_poll_ms = timestamp;
+            fresh = (fetchSimulationData(&simData) == 0);
+        }
+        if (fresh && timestamp - last_print_ms >= 1000) {
+            last_print_ms = timestamp;
             printf("[%d] Simulation Input: V=%.1fkV I=%.0fA F=%.3fHz FC=%.0fA\n", 
                    cycle, simData.voltage, simData.current, simData.frequency, simData.faultCurrent);
         }
@@ -491,22 +687,21 @@ int main(int argc, char** argv) {
             printf(">>> GOOSE PUBLISHED: %s\n", prot_state.trip_reason);
         }
         
-        // Always publish GOOSE for heartbeat (libiec61850 manages stNum/sqNum)
-        static int heartbeat_counter = 0;
-        heartbeat_counter++;
-        if (heartbeat_counter >= 2) {  // Every ~1 second
+        // Always publish GOOSE for heartbeat (libiec61850 manages stNum/sqNum).
+        // Timed by the clock, since feed frames set the loop rate.
+        if (timestamp - last_heartbeat_ms >= GOOSE_HEARTBEAT_MS) {
             publishGooseMessage(false);  // Retransmission/heartbeat
             printf(">>> GOOSE HEARTBEAT\n");
-            heartbeat_counter = 0;
+            last_heartbeat_ms = timestamp;
         }
         
         if (trip_issued) {
             printf(">>> PROTECTION TRIP: %s\n", prot_state.trip_reason);
         }
-        
-        Thread_sleep(500);
     }
     
+    pthread_join(feed_thread, NULL);
+    
     if (goosePublisher) {
         GoosePublisher_destroy(goosePublisher);
     }
@@ -1,13 +1,17 @@
 const express = require('express');
 const path = require('path');
 const http = require('http');
+const dgram = require('dgram');
+const dns = require('dns');
 const WebSocket = require('ws');
 // Using built-in fetch API available in Node.js 18+
 
 const app = express();
 const server = http.createServer(app);
 const wss = new WebSocket.Server({ server });
-const PORT = 3000;
+const PORT = parseInt(process.env.PORT || '3000', 10);
+// Per-command logging is off by default; slider drags send many commands per second
+const LOG_COMMANDS = process.env.LOG_COMMANDS === '1';
 
 app.use(express.json());
 app.use(express.static('public'));
@@ -170,10 +174,16 @@ app.get('/api/ied-status', (req, res) => {
     res.json(iedStatus);
 });
 
-app.post('/api/command', (req, res) => {
-    const { command, data } = req.body;
-    
+// Apply a simulator command (REST and WebSocket). A batch,
+// {command:'batch', data:{commands:[{command, data}, ...]}}, is applied in one
+// synchronous step, so readers never see a half-applied set of changes.
+// mirror: also show the changes in iedStatus (WebSocket commands)
+function applyCommand(command, data, mirror) {
+    data = data || {};
     switch(command) {
+        case 'batch':
+            (Array.isArray(data.commands) ? data.commands : []).forEach(c => applyCommand(c.command, c.data, mirror));
+            break;
         case 'updateVoltage':
             simulationData.voltage = data.voltage;
             break;
@@ -196,8 +206,11 @@ app.post('/api/command', (req, res) => {
             simulationData.tripCommand = true;
             simulationData.breakerStatus = true;  // Manual trip opens breaker
             setTimeout(() => {
+                const before = { ...simulationData };
                 simulationData.tripCommand = false;
                 simulationData.breakerStatus = false;  // Reset after trip
+                // Push clients stop polling the simulator, so they only see the reset if it is sent
+                publishSimulation(mirror ? before : null);
             }, 3000);
             break;
         case 'resetTrip':
@@ -210,9 +223,36 @@ app.post('/api/command', (req, res) => {
             simulationData.tripCommand = data.active;
             break;
     }
+}
+
+// Relay fields a WebSocket command shows in iedStatus until the next IED poll
+const MIRRORED_FIELDS = ['voltage', 'current', 'frequency', 'faultDetected', 'breakerStatus', 'tripCommand'];
+
+// Send simulationData to the relay feed and push clients; with `before` (the
+// data prior to a WebSocket command) the changed relay fields go to iedStatus too
+function publishSimulation(before) {
+    if (before) {
+        MIRRORED_FIELDS.forEach(field => {
+            if (simulationData[field] !== before[field]) {
+                iedStatus.protectionRelay[field] = simulationData[field];
+            }
+        });
+        broadcastUpdate();
+    }
+    pushSimFeed();
+    broadcast('simulationData', simulationData);
+}
+
+app.post('/api/command', (req, res) => {
+    const { command, data } = req.body;
+    
+    applyCommand(command, data);
     
-    console.log(`Command received: ${command}`, data);
-    console.log('Updated simulation data:', simulationData);
+    if (LOG_COMMANDS) {
+        console.log(`Command received: ${command}`, data);
+        console.log('Updated simulation data:', simulationData);
+    }
+    publishSimulation();
     
     res.json({ success: true, data: simulationData });
 });
@@ -223,6 +263,10 @@ wss.on('connection', (ws) => {
     
     // Send initial data
     ws.send(JSON.stringify({ type: 'iedUpdate', data: iedStatus }));
+    ws.send(JSON.stringify({ type: 'simulationData', data: simulationData }));
+    const hmiMessage = lastHmiMessage();
+    if (hmiMessage) ws.send(JSON.stringify(hmiMessage));
+    startHmiWatch();
     
     ws.on('message', (message) => {
         try {
@@ -244,72 +288,172 @@ wss.on('connection', (ws) => {
     });
 });
 
-console.log('WebSocket server listening on port 3000');
+console.log(`WebSocket server listening on port ${PORT}`);
 
 // Function to handle commands
 function handleCommand(command, data) {
-    switch(command) {
-        case 'updateVoltage':
-            simulationData.voltage = data.voltage;
-            iedStatus.protectionRelay.voltage = data.voltage;
-            break;
-        case 'updateCurrent':
-            simulationData.current = data.current;
-            iedStatus.protectionRelay.current = data.current;
-            break;
-        case 'updateFrequency':
-            simulationData.frequency = data.frequency;
-            iedStatus.protectionRelay.frequency = data.frequency;
-            break;
-        case 'updateFaultCurrent':
-            simulationData.faultCurrent = data.faultCurrent;
-            break;
-        case 'toggleFault':
-            simulationData.faultDetected = data.active;
-            iedStatus.protectionRelay.faultDetected = data.active;
-            break;
-        case 'toggleBreaker':
-            simulationData.breakerStatus = data.open;
-            iedStatus.protectionRelay.breakerStatus = data.open;
-            break;
-        case 'sendTrip':
-            simulationData.tripCommand = true;
-            iedStatus.protectionRelay.tripCommand = true;
-            iedStatus.protectionRelay.breakerStatus = true;
-            setTimeout(() => {
-                simulationData.tripCommand = false;
-                iedStatus.protectionRelay.tripCommand = false;
-            }, 3000);
-            break;
-        case 'resetTrip':
-            simulationData.tripCommand = false;
-            simulationData.faultDetected = false;
-            simulationData.current = 450.0;
-            simulationData.faultCurrent = 0.0;
-            iedStatus.protectionRelay.tripCommand = false;
-            iedStatus.protectionRelay.faultDetected = false;
-            iedStatus.protectionRelay.current = 450.0;
-            break;
-        case 'toggleManualTrip':
-            simulationData.tripCommand = data.active;
-            iedStatus.protectionRelay.tripCommand = data.active;
-            break;
-    }
-    
+    const before = { ...simulationData };
+    applyCommand(command, data, true);
     // Broadcast update to all clients
-    broadcastUpdate();
+    publishSimulation(before);
 }
 
-// Function to broadcast updates to all WebSocket clients
-function broadcastUpdate() {
-    const message = JSON.stringify({ type: 'iedUpdate', data: iedStatus });
+// Server-Sent Events clients (same messages as the WebSocket feed)
+const sseClients = new Set();
+
+// Send one message to every WebSocket and SSE client
+function broadcast(type, data, error) {
+    const payload = error ? { type, error } : { type, data };
+    const message = JSON.stringify(payload);
     wss.clients.forEach((client) => {
         if (client.readyState === WebSocket.OPEN) {
             client.send(message);
         }
     });
+    sseClients.forEach((res) => {
+        res.write(`event: ${type}\ndata: ${message}\n\n`);
+    });
+}
+
+// Function to broadcast updates to all WebSocket clients
+function broadcastUpdate() {
+    broadcast('iedUpdate', iedStatus);
+}
+
+function pushClientCount() {
+    return wss.clients.size + sseClients.size;
+}
+
+// Watch HMI data while push clients are connected; broadcast only on change
+const HMI_WATCH_MS = parseInt(process.env.HMI_WATCH_MS || '100', 10);
+let lastHmiData = null;
+let lastHmiJson = '';
+let hmiWatchTimer = null;
+
+async function watchHmiData() {
+    hmiWatchTimer = null;
+    if (pushClientCount() === 0) return;
+    try {
+        const response = await fetch('http://hmi-scada:8080/data');
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const text = await response.text();
+        if (text !== lastHmiJson) {
+            lastHmiJson = text;
+            lastHmiData = JSON.parse(text);
+            broadcast('hmiData', lastHmiData);
+        }
+    } catch (e) {
+        if (lastHmiJson !== 'error') {
+            lastHmiJson = 'error';
+            lastHmiData = null;
+            broadcast('hmiData', null, 'NO CONNECTION');
+        }
+    }
+    startHmiWatch();
+}
+
+// Latest HMI state for newly connected push clients
+function lastHmiMessage() {
+    if (lastHmiJson === 'error') return { type: 'hmiData', error: 'NO CONNECTION' };
+    return lastHmiData ? { type: 'hmiData', data: lastHmiData } : null;
+}
+
+function startHmiWatch() {
+    if (hmiWatchTimer === null && pushClientCount() > 0) {
+        hmiWatchTimer = setTimeout(watchHmiData, HMI_WATCH_MS);
+    }
+}
+
+// Server-Sent Events feed for clients that cannot use WebSocket
+app.get('/api/events', (req, res) => {
+    res.set({
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive'
+    });
+    res.flushHeaders();
+    sseClients.add(res);
+    res.write(`event: iedUpdate\ndata: ${JSON.stringify({ type: 'iedUpdate', data: iedStatus })}\n\n`);
+    res.write(`event: simulationData\ndata: ${JSON.stringify({ type: 'simulationData', data: simulationData })}\n\n`);
+    const hmiMessage = lastHmiMessage();
+    if (hmiMessage) {
+        res.write(`event: hmiData\ndata: ${JSON.stringify(hmiMessage)}\n\n`);
+    }
+    startHmiWatch();
+    req.on('close', () => {
+        sseClients.delete(res);
+    });
+});
+
+// Keep idle SSE connections open through proxies
+setInterval(() => {
+    sseClients.forEach((res) => res.write(': keep-alive\n\n'));
+}, 15000);
+
+// Simulator feed: push measurements to the protection relay as compact UDP
+// frames, on every change and every SIM_FEED_MS, instead of the relay opening
+// an HTTP connection per sample. Frame layout (little-endian) is documented
+// next to sim_parse_frame in src/protection-relay.c.
+const SIM_FEED_TARGETS = (process.env.SIM_FEED_TARGETS || 'protection_relay_ied:5020')
+    .split(',').map(t => t.trim()).filter(Boolean);
+const SIM_FEED_MS = parseInt(process.env.SIM_FEED_MS || '100', 10);
+const SIM_FRAME_LEN = 36;
+const SIM_RESOLVE_MS = 30000;
+
+const simFeedSocket = dgram.createSocket('udp4');
+simFeedSocket.on('error', (e) => console.error('Simulator feed socket error:', e.message));
+const simFeedTargets = SIM_FEED_TARGETS.map(target => {
+    const [host, port] = target.split(':');
+    return { host, port: parseInt(port || '5020', 10), address: null, resolvedAt: 0, resolving: false };
+});
+let simFeedSeq = 0;
+let simFeedTimer = null;
+
+// Resolve each target once and cache it; container addresses only change on restart
+function resolveSimTarget(target) {
+    if (target.resolving) return;
+    target.resolving = true;
+    dns.lookup(target.host, { family: 4 }, (err, address) => {
+        target.resolving = false;
+        target.resolvedAt = Date.now();
+        // Keep the last good address through a transient lookup failure
+        if (!err) target.address = address;
+    });
 }
 
+function encodeSimFrame() {
+    const frame = Buffer.alloc(SIM_FRAME_LEN);
+    frame.write('SIMF', 0, 'ascii');
+    frame.writeUInt16LE(1, 4);
+    frame.writeUInt16LE(SIM_FRAME_LEN, 6);
+    frame.writeDoubleLE(Date.now(), 8);
+    simFeedSeq = (simFeedSeq + 1) >>> 0;
+    frame.writeUInt32LE(simFeedSeq, 16);
+    frame.writeFloatLE(Number(simulationData.voltage) || 0, 20);
+    frame.writeFloatLE(Number(simulationData.current) || 0, 24);
+    frame.writeFloatLE(Number(simulationData.frequency) || 0, 28);
+    frame.writeFloatLE(Number(simulationData.faultCurrent) || 0, 32);
+    return frame;
+}
+
+// Send the current values now and restart the heartbeat timer
+function pushSimFeed() {
+    clearTimeout(simFeedTimer);
+    const frame = encodeSimFrame();
+    const now = Date.now();
+    simFeedTargets.forEach(target => {
+        if (now - target.resolvedAt > SIM_RESOLVE_MS) resolveSimTarget(target);
+        if (!target.address) return;
+        simFeedSocket.send(frame, target.port, target.address, (err) => {
+            // Look the name up again on the next frame, the relay may have moved
+            if (err) target.resolvedAt = 0;
+        });
+    });
+    simFeedTimer = setTimeout(pushSimFeed, SIM_FEED_MS);
+}
+
+pushSimFeed();
+
 // Function to check IED status via HMI server
 async function checkIEDStatus() {
     try {
@@ -319,7 +463,6 @@ async function checkIEDStatus() {
             console.log('IED Diagnostics:', diagnostics);
             iedStatus.protectionRelay.status = diagnostics.protectionRelay === 'ONLINE' ? 'online' : 'offline';
             iedStatus.circuitBreaker.status = diagnostics.circuitBreaker === 'ONLINE' ? 'online' : 'offline';
-            iedStatus.gooseRxOk = !!diagnostics.gooseRxOk;
             iedStatus.reportsEnabled = !!diagnostics.reportsEnabled;
             
             // Get real-time data from HMI server
@@ -345,9 +488,13 @@ async function checkIEDStatus() {
                     iedStatus.circuitBreaker.sequenceNumber = br.sqNum || 0;
                     iedStatus.circuitBreaker.messageCount = br.messageCount || 0;
                     iedStatus.circuitBreaker.lastGooseTime = br.lastTime || '--:--:--';
+                    // Breaker's GOOSE subscription supervision
+                    iedStatus.gooseRxOk = !!br.rxOk;
+                } else {
+                    iedStatus.gooseRxOk = false;
                 }
             } catch (e) {
-                // ignore
+                iedStatus.gooseRxOk = false;
             }
         } else {
             console.log('HMI server not responding, setting IEDs offline');